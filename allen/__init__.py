@@ -1,7 +1,82 @@
-from allen.allenclient import *
-from allen.exceptions import *
-from allen.video import *
-from allen.test_record import *
-from allen.solution import *
-from allen.exam import *
-from allen.addon_classes import *
+"""
+The public API of the library.
+
+The submodules are imported on first access of one of their names, so that importing ``allen`` or running the
+``allen`` command does not pay for importing ``requests`` and every model until they are used.
+"""
+import importlib
+from typing import TYPE_CHECKING
+
+_EXPORTS = {
+    'allen.allenclient': ['AllenClient'],
+    'allen.exceptions': ['AllenInvalidUsernamePassword', 'AllenInvalidResponse', 'AllenResponseUnavailable',
+                         'AllenConnectionError', 'AllenClientNotBound'],
+    'allen.video': ['RecordedVideo', 'LiveClassDay', 'LiveClass'],
+    'allen.test_record': ['TestRecord'],
+    'allen.solution': ['Solution', 'SubjectSolution'],
+    'allen.exam': ['Examination'],
+    'allen.addon_classes': ['AddonVideo', 'AddonClass', 'AddonChapter'],
+    'allen.bulk': ['LinkResult', 'SolutionResult'],
+    'allen.asyncclient': ['AsyncAllenClient'],
+    'allen.cache': ['ResponseCache', 'DEFAULT_TTLS'],
+    'allen.disk_cache': ['DiskCache', 'default_cache_dir'],
+    'allen.token_store': ['StoredToken', 'TokenStore', 'jwt_expiry', 'hash_password'],
+    'allen.transport': ['TransportPolicy', 'TokenBucket', 'Transport'],
+    'allen.analytics': ['SUBJECTS', 'TestRecordTable', 'SolutionTable'],
+    'allen.sync': ['SyncStore', 'SyncResult', 'SyncEngine'],
+    'allen.downloader': ['DownloadResult', 'SolutionDownloader'],
+    'allen.singleflight': ['SingleFlight', 'AsyncSingleFlight'],
+    'allen.instrumentation': ['RequestTrace', 'Instrumentation', 'Histogram', 'Metrics', 'PrometheusInstrumentation',
+                              'OpenTelemetryInstrumentation', 'DEFAULT_BUCKETS', 'PHASES'],
+    'allen.batch': ['Account', 'AccountResult', 'BatchRunner', 'DEFAULT_TASKS'],
+    'allen.pipeline': ['ProcessPipeline', 'VIDEO_ROW', 'TEST_RECORD_ROW'],
+    'allen.decoder': ['get_decoder', 'set_decoder'],
+}
+
+_MODULES = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = list(_MODULES)
+
+
+def __getattr__(name: str):
+    module = _MODULES.get(name)
+    if module is None:
+        # Submodules were loaded by ``import allen`` before the names were resolved lazily, such as ``allen.video``.
+        try:
+            return importlib.import_module(f'{__name__}.{name}')
+        except ModuleNotFoundError as e:
+            if e.name != f'{__name__}.{name}':
+                raise
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from allen.allenclient import *
+    from allen.exceptions import *
+    from allen.video import *
+    from allen.test_record import *
+    from allen.solution import *
+    from allen.exam import *
+    from allen.addon_classes import *
+    from allen.bulk import *
+    from allen.asyncclient import *
+    from allen.cache import *
+    from allen.disk_cache import *
+    from allen.token_store import *
+    from allen.transport import *
+    from allen.analytics import *
+    from allen.sync import *
+    from allen.downloader import *
+    from allen.singleflight import *
+    from allen.instrumentation import *
+    from allen.batch import *
+    from allen.pipeline import *
+    from allen.decoder import get_decoder, set_decoder
@@ -1,11 +1,14 @@
 from dataclasses import dataclass
+from allen.model import ClientBoundModel, SlotsModel
 from typing import List
 
 __all__ = ['AddonVideo', 'AddonClass', 'AddonChapter']
 
 
 @dataclass(frozen=True, order=True)
-class AddonVideo:
+class AddonVideo(ClientBoundModel):
+    __slots__ = ('unique_code', 'module_no')
+
     unique_code: str
     '''The unique code for the addon video'''
 
@@ -23,9 +26,19 @@ class AddonVideo:
         """
         unique_code = json_obj.get('UniqueCode')
         module_no = json_obj.get('ModuleNo')
-        cls.client = client
 
-        return AddonVideo(unique_code, module_no)
+        return AddonVideo(unique_code, module_no)._bind(client)
+
+    @classmethod
+    def from_json_many(cls, json_list: List[dict], client) -> List['AddonVideo']:
+        """
+        Deserialize a list of video json dicts with :meth:`from_json`.
+
+        :param json_list: The json dictionaries to deserialize.
+        :param client: The allen client.
+        :meta private:
+        """
+        return [AddonVideo.from_json(json_obj, client) for json_obj in json_list]
 
     def get_link(self) -> str:
         """
@@ -33,12 +46,15 @@ class AddonVideo:
 
         :return: The link of the video.
         """
-        json = self.client.fetch_json('discussion/student/player', post_data={'UniqueCode': self.unique_code})
+        client = self._require_client('get_link')
+        json = client.fetch_json('discussion/student/player', post_data={'UniqueCode': self.unique_code}, persist=True)
         return json['ClassURL']
 
 
 @dataclass(frozen=True, order=True)
-class AddonChapter:
+class AddonChapter(SlotsModel):
+    __slots__ = ('chapter_name', 'videos')
+
     chapter_name: str
     '''The name of the chapter of the addon chapter'''
 
@@ -59,9 +75,22 @@ class AddonChapter:
 
         return AddonChapter(chapter_name, videos)
 
+    @classmethod
+    def from_json_many(cls, json_list: List[dict], client) -> List['AddonChapter']:
+        """
+        Deserialize a list of addon chapter json dicts with :meth:`from_json`.
+
+        :param json_list: The json dictionaries to deserialize.
+        :param client: The allen client.
+        :meta private:
+        """
+        return [AddonChapter.from_json(json_obj, client) for json_obj in json_list]
+
 
 @dataclass(frozen=True, order=True)
-class AddonClass:
+class AddonClass(SlotsModel):
+    __slots__ = ('subject_name', 'chapters')
+
     subject_name: str
     '''The name of the subject of the addon class'''
 
@@ -81,3 +110,14 @@ class AddonClass:
         chapters = [AddonChapter.from_json(chapter, client) for chapter in json_obj['listChapter']]
 
         return AddonClass(subject_name, chapters)
+
+    @classmethod
+    def from_json_many(cls, json_list: List[dict], client) -> List['AddonClass']:
+        """
+        Deserialize a list of addon class json dicts with :meth:`from_json`.
+
+        :param json_list: The json dictionaries to deserialize.
+        :param client: The allen client.
+        :meta private:
+        """
+        return [AddonClass.from_json(json_obj, client) for json_obj in json_list]
@@ -1,13 +1,28 @@
+import hashlib
 import random
+import sys
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Union
-from allen.utils import fetch_jwt_from_otp, require_otp, validate_response
+from allen.utils import DEFAULT_BASE_URL, fetch_jwt_from_otp, require_otp, validate_response
 from allen.video import RecordedVideo, LiveClassDay
 from allen.exceptions import AllenInvalidUsernamePassword, AllenResponseUnavailable, AllenInvalidResponse
 from allen.exam import Examination
-from allen.addon_classes import AddonClass
+from allen.addon_classes import AddonClass, AddonVideo
 from allen.test_record import TestRecord
-from typing import List
+from allen.bulk import LinkResult, SolutionResult, map_ordered
+from allen.cache import ResponseCache
+from allen.disk_cache import DiskCache
+from allen.token_store import TokenStore
+from allen.streaming import iter_json_items, JSONPathNotFound
+from allen.transport import TokenBucket, Transport, TransportPolicy
+from allen.decoder import loads
+from allen.analytics import TestRecordTable
+from allen.singleflight import SingleFlight
+from allen.instrumentation import Instrumentation, RequestTrace
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 __all__ = ['AllenClient']
 
@@ -22,14 +37,58 @@ class AllenClient:
         Either authenticate using username and password, or using JWT.
     """
 
-    def __init__(self, username: Union[str, int] = None, password: str = None, jwt: str = None):
+    def __init__(self, username: Union[str, int] = None, password: str = None, jwt: str = None,
+                 session: requests.Session = None, pool_connections: int = 10, pool_maxsize: int = 10,
+                 keep_alive: bool = True, cache: ResponseCache = None, disk_cache: DiskCache = None,
+                 token_store: TokenStore = None, transport: TransportPolicy = None, rate_limiter: TokenBucket = None,
+                 base_url: str = DEFAULT_BASE_URL, single_flight: SingleFlight = None,
+                 instrumentation: Instrumentation = None):
         """
         Initialize connection to Allen's API.
 
         :param username: The form number used to log into Allen's website.
         :param password: The password used to log into Allen's website.
         :param jwt: The JWT Token
+        :param session: An existing session to send the requests through. The session is not closed by the client.
+        :param pool_connections: The number of host connection pools to cache.
+        :param pool_maxsize: The maximum number of connections to keep open per host.
+        :param keep_alive: Specify whether connections should be reused between requests.
+        :param cache: The cache to store the responses of slowly changing endpoints in, nothing is cached if not
+            specified.
+        :param disk_cache: The cache to persist video links and test solutions in between runs.
+        :param token_store: The store to reuse the JWT token and device id of the account from between runs. A stored
+            token is only reused if ``password`` is the one it was generated with.
+        :param transport: The timeouts, retries and rate limit applied to every request.
+        :param rate_limiter: A rate limiter to share with other clients, overrides the rate limit of ``transport``.
+        :param base_url: The url Allen's API is served from, for example the url of a
+            :class:`mock_server.MockAllenServer`.
+        :param single_flight: The coalescer sharing identical requests in flight between threads, pass the same one
+            to several clients to share requests between them as well.
+        :param instrumentation: The hooks notified of every request, retry and cache lookup, for example a
+            :class:`instrumentation.Metrics`. Nothing is timed or recorded if not specified.
         """
+        if single_flight is None:
+            single_flight = SingleFlight()
+
+        self.base_url = base_url.rstrip('/')
+        scheme, _, host = self.base_url.partition('://')
+        self._secure = scheme == 'https'
+        self.api_url = host + '/api'
+
+        self._token_store = token_store
+        self._login_lock = threading.Lock()
+        self._cache = cache
+        self._disk_cache = disk_cache
+        self._single_flight = single_flight
+        self._instrumentation = instrumentation
+        self._pool_maxsize = pool_maxsize
+        if session is None:
+            self._session = self.__create_session(pool_connections, pool_maxsize, keep_alive)
+            self._owns_session = True
+        else:
+            self._session = session
+            self._owns_session = False
+        self._transport = Transport(self._session, transport, rate_limiter, instrumentation=instrumentation)
 
         # Checks to ensure code consistency.
         if username is None:
@@ -38,18 +97,88 @@ class AllenClient:
             password = ""
         if username is int:
             username = str(username)
+        self._username = username
+        self._password = password
 
         if jwt is None:
             if username == "" or password == "":
                 raise AllenInvalidUsernamePassword()
 
-            self._username = username
-            self._password = password
-            self.__setup()
+            # A stored token is only reused for the password it was generated with.
+            stored = token_store.load(username) if token_store is not None else None
+            if stored is not None and stored.is_valid() and stored.matches(password):
+                self._jwt = stored.jwt
+            else:
+                self.__setup()
         else:
             self._jwt = jwt
 
-        self.api_url = 'ddcapi.allenbpms.in/api'
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        The session used to send every request to Allen's API.
+        """
+        return self._session
+
+    @property
+    def transport(self) -> Transport:
+        """
+        The transport applying the timeouts, retries and rate limit to every request.
+        """
+        return self._transport
+
+    @property
+    def pool_maxsize(self) -> int:
+        """
+        The maximum number of connections kept open per host, also the number of requests the bulk operations of
+        the client send at once unless specified.
+        """
+        return self._pool_maxsize
+
+    @property
+    def instrumentation(self) -> Optional[Instrumentation]:
+        """
+        The hooks notified of every request, None if the client is not instrumented.
+        """
+        return self._instrumentation
+
+    @property
+    def cache(self) -> ResponseCache:
+        """
+        The cache the responses are stored in, None if caching is disabled.
+        """
+        return self._cache
+
+    @property
+    def identity(self) -> str:
+        """
+        A string identifying the account of the client, used to keep cached responses of accounts apart.
+        """
+        source = self._username if self._username != "" else self._jwt
+        return hashlib.sha256(str(source).encode('utf-8')).hexdigest()
+
+    def invalidate_cache(self, url_path: str = None):
+        """
+        Remove the cached responses of this account.
+
+        :param url_path: Only remove the responses of this endpoint.
+        """
+        if self._cache is not None:
+            self._cache.invalidate(url_path, self.identity)
+
+    def close(self):
+        """
+        Close the connections held by the client.
+        Sessions passed to the client are left open and must be closed by the caller.
+        """
+        if self._owns_session:
+            self._session.close()
 
     def get_recorded_videos(self) -> List[RecordedVideo]:
         """
@@ -62,12 +191,20 @@ class AllenClient:
 
         for video_day in video_list_json:
             date = video_day['ClassDate']
-            video_json_list = video_day['listClass']
-            for video_json in video_json_list:
-                video_list.append(RecordedVideo.from_json(video_json, date, self))
+            video_list.extend(RecordedVideo.from_json_many(video_day['listClass'], date, self))
 
         return video_list
 
+    def iter_recorded_videos(self) -> Iterator[RecordedVideo]:
+        """
+        Stream the recorded videos available to view, yielding each day's videos as soon as they are received.
+
+        :return: An iterator over the class:`video.RecordedVideo` class
+        """
+        for video_day in self.iter_json('dc/student/recordinglist', ()):
+            date = video_day['ClassDate']
+            yield from RecordedVideo.from_json_many(video_day['listClass'], date, self)
+
     def get_live_classes(self) -> List[LiveClassDay]:
         """
         Fetch the list of upcoming live classes.
@@ -75,7 +212,7 @@ class AllenClient:
         :return: A list of the class:`video.LiveClassDay` class
         """
         live_class_day_list_json = self.fetch_json('dc/student/livelist')
-        return [LiveClassDay.from_json(live_class_day) for live_class_day in live_class_day_list_json]
+        return LiveClassDay.from_json_many(live_class_day_list_json)
 
     def get_test_records(self) -> List[TestRecord]:
         """
@@ -84,7 +221,25 @@ class AllenClient:
         :return: A list of the class:`test_record.TestRecord` class
         """
         test_list = self.fetch_json('studenttestrecord').get('testList')
-        return [TestRecord.from_json(test, self) for test in test_list]
+        return TestRecord.from_json_many(test_list, self)
+
+    def get_test_record_table(self) -> TestRecordTable:
+        """
+        Fetch the list of tests you've attempted into typed columns for analytics.
+
+        :return: A class:`analytics.TestRecordTable` of the tests.
+        """
+        test_list = self.fetch_json('studenttestrecord').get('testList')
+        return TestRecordTable.from_json(test_list)
+
+    def iter_test_records(self) -> Iterator[TestRecord]:
+        """
+        Stream the tests you've attempted, yielding each test as soon as it is received.
+
+        :return: An iterator over the class:`test_record.TestRecord` class
+        """
+        for test in self.iter_json('studenttestrecord', ('testList',)):
+            yield TestRecord.from_json(test, self)
 
     def get_exam_calendar(self) -> List[Examination]:
         """
@@ -93,7 +248,7 @@ class AllenClient:
         :return: A list of the class:`exam.Examination` class
         """
         json = self.fetch_json('studentexamcalendar')
-        return [Examination.from_json(exam) for exam in json]
+        return Examination.from_json_many(json)
 
     def get_addon_classes(self) -> List[AddonClass]:
         """
@@ -102,77 +257,380 @@ class AllenClient:
         :return: A list of the class:`addon_classes.AddonClass` class
         """
         json = self.fetch_json('discussion/student/list')
-        return [AddonClass.from_json(addon_class, self) for addon_class in json]
+        return AddonClass.from_json_many(json, self)
+
+    def resolve_links(self, videos: Iterable[Union[RecordedVideo, AddonVideo]],
+                      max_workers: int = None) -> List[LinkResult]:
+        """
+        Resolve the links of many recorded or addon videos concurrently.
+        Videos sharing a unique code are only resolved once.
+
+        :param videos: The videos to resolve the links of.
+        :param max_workers: The maximum number of links resolved at once, defaults to the connection pool size.
+        :return: A list of the class:`bulk.LinkResult` class in the same order as the videos.
+        """
+        videos = list(videos)
+        if max_workers is None:
+            max_workers = self._pool_maxsize
+
+        unique = {}
+        for video in videos:
+            unique.setdefault((type(video), video.unique_code), video)
 
-    def fetch_json(self, url_path: str, http_method: str = 'POST', secure: bool = True, headers: dict = None,
-                   query_params: dict = None, post_data: dict = None) -> dict:
+        keys = list(unique)
+        results = map_ordered(lambda key: unique[key].get_link(), keys, max_workers)
+        resolved = dict(zip(keys, results))
+
+        link_results = []
+        for video in videos:
+            link, error = resolved[(type(video), video.unique_code)]
+            link_results.append(LinkResult(video, link, error))
+
+        return link_results
+
+    def get_solutions_for(self, records: Iterable[TestRecord], papers: Iterable[int] = (1,),
+                          max_workers: int = None) -> Dict[str, Dict[int, SolutionResult]]:
+        """
+        Fetch the solutions of many tests concurrently.
+        Tests sharing a test ID are only fetched once per paper.
+
+        :param records: The tests to fetch the solutions of.
+        :param papers: The numbers of the papers to fetch for every test.
+        :param max_workers: The maximum number of solutions fetched at once, defaults to the connection pool size.
+        :return: A dict mapping the ID of every test to a dict of the class:`bulk.SolutionResult` class keyed by
+            the number of the paper.
+        """
+        papers = list(papers)
+        if max_workers is None:
+            max_workers = self._pool_maxsize
+
+        unique = {}
+        for record in records:
+            for paper_no in papers:
+                unique.setdefault((record._test_id, paper_no), record)
+
+        keys = list(unique)
+        results = map_ordered(lambda key: unique[key].get_subject_solutions(key[1]), keys, max_workers)
+
+        solutions = {}
+        for (test_id, paper_no), (result, error) in zip(keys, results):
+            solutions.setdefault(test_id, {})[paper_no] = SolutionResult(unique[(test_id, paper_no)], paper_no,
+                                                                         result, error)
+
+        return solutions
+
+    def fetch_json(self, url_path: str, http_method: str = 'POST', secure: bool = None, headers: dict = None,
+                   query_params: dict = None, post_data: dict = None, use_cache: bool = True,
+                   persist: bool = False) -> dict:
         """
         Fetch some JSON from Allen's API.
 
         :param url_path: The url to fetch the JSON from.
         :param http_method: The http method that will be used with the request.
-        :param secure: Specify whether to use HTTPS (True) or HTTP (False).
+        :param secure: Specify whether to use HTTPS (True) or HTTP (False), defaults to the scheme of the base url.
         :param headers: The headers to pass through the request.
         :param query_params: The url parameters to include with the request.
         :param post_data: The post data to send with the request.
+        :param use_cache: Specify whether the response may be read from and stored in the cache.
+        :param persist: Specify whether the response may be read from and stored in the disk cache.
 
-        :return: A dict containing the parsed JSON response
+        :return: A dict containing the parsed JSON response. The dict is shared with the callers of the same request
+            in flight and with the cache, so it must not be modified.
         :meta private:
         """
         # Specify values of method parameters explicitly
+        if query_params is None:
+            query_params = {}
+        if post_data is None:
+            post_data = {}
+
+        # Removes a leading slash if included in the url_path.
+        if url_path[0] == '/':
+            url_path = url_path[1:]
+
+        api_root = self.__api_root(secure)
+        cache_key = None
+        if use_cache and self._cache is not None and self._cache.ttl_for(url_path) > 0:
+            cache_key = ResponseCache.make_key(url_path, http_method, query_params, post_data, self.identity, api_root)
+            cached = self._cache.get(cache_key)
+            if self._instrumentation is not None:
+                self._instrumentation.cache_lookup(url_path, 'memory', cached is not None)
+            if cached is not None:
+                return cached
+
+        if headers:
+            return self.__fetch(url_path, http_method, secure, headers, query_params, post_data, cache_key,
+                                use_cache and persist)
+
+        # Identical requests in flight at once share a single response, the key holds the url of the server as the
+        # coalescer may be shared by clients of other servers.
+        request_key = cache_key or ResponseCache.make_key(url_path, http_method, query_params, post_data,
+                                                          self.identity, api_root)
+        return self._single_flight.do(request_key, lambda: self.__fetch(
+            url_path, http_method, secure, headers, query_params, post_data, cache_key, use_cache and persist))
+
+    def __fetch(self, url_path: str, http_method: str, secure: Optional[bool], headers: Optional[dict],
+                query_params: dict, post_data: dict, cache_key: Optional[tuple], persist: bool) -> dict:
+        """
+        Fetch some JSON from the disk cache or from Allen's API, and store it in the caches.
+
+        :meta private:
+        """
+        disk_key = None
+        if persist and self._disk_cache is not None:
+            disk_key = cache_key or ResponseCache.make_key(url_path, http_method, query_params, post_data,
+                                                           self.identity, self.__api_root(secure))
+            cached = self._disk_cache.get(disk_key)
+            if self._instrumentation is not None:
+                self._instrumentation.cache_lookup(url_path, 'disk', cached is not None)
+            if cached is not None:
+                return cached
+
+        trace = self.__start_trace(url_path, http_method)
+        try:
+            response = self._send(url_path, http_method, secure, headers, query_params, post_data, trace=trace)
+
+            decode_start = time.perf_counter() if trace is not None else 0.0
+            try:
+                json = loads(response.content)
+            except ValueError:
+                raise AllenInvalidResponse(response)
+            if trace is not None:
+                trace.decode = time.perf_counter() - decode_start
+
+            if 'data' not in json or json['data'] is None:
+                raise AllenInvalidResponse(response)
+        except Exception as e:
+            if trace is not None:
+                self.__finish_trace(trace, e)
+            raise
+
+        if trace is not None:
+            self.__finish_trace(trace)
+
+        if cache_key is not None:
+            self._cache.set(cache_key, json['data'], self._cache.ttl_for(url_path))
+        if disk_key is not None:
+            self._disk_cache.set(disk_key, json['data'])
+
+        return json['data']
+
+    def __api_root(self, secure: Optional[bool]) -> str:
+        """
+        :param secure: Specify whether to use HTTPS (True) or HTTP (False), defaults to the scheme of the base url.
+        :return: The url of the API the requests are sent to, including the scheme.
+        :meta private:
+        """
+        if secure is None:
+            secure = self._secure
+
+        return ('https://' if secure else 'http://') + self.api_url
+
+    def iter_json(self, url_path: str, item_path: Tuple[str, ...], http_method: str = 'POST', secure: bool = None,
+                  headers: dict = None, query_params: dict = None, post_data: dict = None) -> Iterator:
+        """
+        Stream some JSON from Allen's API, yielding the items of an array as soon as each is received.
+        Streamed responses are never cached.
+
+        :param url_path: The url to fetch the JSON from.
+        :param item_path: The keys leading to the array inside the ``data`` of the response.
+        :param http_method: The http method that will be used with the request.
+        :param secure: Specify whether to use HTTPS (True) or HTTP (False), defaults to the scheme of the base url.
+        :param headers: The headers to pass through the request.
+        :param query_params: The url parameters to include with the request.
+        :param post_data: The post data to send with the request.
+
+        :return: An iterator over the items of the array
+        :meta private:
+        """
+        trace = self.__start_trace(url_path, http_method)
+        try:
+            response = self._send(url_path, http_method, secure, headers, query_params, post_data, stream=True,
+                                  trace=trace)
+        except Exception as e:
+            if trace is not None:
+                self.__finish_trace(trace, e)
+            raise
+
+        chunks = response.iter_content(chunk_size=65536)
+        if trace is not None:
+            chunks = self.__timed_chunks(chunks, trace)
+
+        try:
+            yield from iter_json_items(chunks, ('data',) + tuple(item_path))
+        except (JSONPathNotFound, ValueError):
+            raise AllenInvalidResponse(response)
+        finally:
+            response.close()
+            if trace is not None:
+                error = sys.exc_info()[1]
+                self.__finish_trace(trace, error if isinstance(error, Exception) else None)
+
+    def _send(self, url_path: str, http_method: str = 'POST', secure: bool = None, headers: dict = None,
+              query_params: dict = None, post_data: dict = None, stream: bool = False,
+              trace: RequestTrace = None) -> requests.Response:
+        """
+        Send an authorized request to Allen's API, logging in again if the token was rejected.
+
+        :return: The response, if it was successful.
+        :meta private:
+        """
         if headers is None:
             headers = {}
         if query_params is None:
             query_params = {}
         if post_data is None:
             post_data = {}
-        if secure is None:
-            secure = False
 
         headers['Content-Type'] = 'application/json; charset=utf-8'
         headers['Accept'] = 'application/json'
-        headers['Authorization'] = f'Bearer {self._jwt}'
 
         # Removes a leading slash if included in the url_path.
         if url_path[0] == '/':
             url_path = url_path[1:]
-        url = ('https://' if secure else 'http://') + self.api_url + '/' + url_path
+        url = self.__api_root(secure) + '/' + url_path
 
         # Perform the HTTP request using the provided parameters.
-        response = requests.request(http_method, url, params=query_params, headers=headers, json=post_data)
+        jwt = self._jwt
+        headers['Authorization'] = f'Bearer {jwt}'
+        response = self._transport.request(http_method, url, params=query_params, headers=headers, json=post_data,
+                                           stream=stream, trace=trace)
+
+        # Log in again if the token has expired and the credentials are known.
+        if response.status_code == 401 and self._password != "":
+            response.close()
+            self.__reauthenticate(jwt)
+            headers['Authorization'] = f'Bearer {self._jwt}'
+            response = self._transport.request(http_method, url, params=query_params, headers=headers,
+                                               json=post_data, stream=stream, trace=trace)
 
         if response.status_code != 200:
+            response.close()
             raise AllenResponseUnavailable(url, response)
 
-        json = response.json()
-        if 'data' not in json or json['data'] is None:
-            raise AllenInvalidResponse(response)
+        return response
 
-        return json['data']
+    def __reauthenticate(self, stale_jwt: str):
+        """
+        Replace a rejected JWT token, unless another thread has already replaced it.
+
+        :param stale_jwt: The token which was rejected by the server.
+        :meta private:
+        """
+        with self._login_lock:
+            if self._jwt == stale_jwt:
+                self.__setup()
 
     def __setup(self):
         """
         Generate a JWT token from the provided username and password.
+        The device id of the previous login is reused if a token store is available.
 
         :meta private:
         """
         username = self._username
         password = self._password
-        device_id = random.randint(100000000000, 999999999999)
 
-        response = requests.post('https://ddcapi.allenbpms.in/oauth2/astoken', json={
-            'DeviceType': 'Web',
-            'Devicetoken': device_id,
-            'Password': password,
-            'UserName': username
-        })
-
-        validate_response(response)
-        otp = require_otp(response)
-        json = response.json()
+        stored = self._token_store.load(username) if self._token_store is not None else None
+        if stored is not None:
+            device_id = stored.device_id
+        else:
+            device_id = random.randint(100000000000, 999999999999)
+
+        trace = self.__start_trace('oauth2/astoken', 'POST')
+        try:
+            response = self._transport.post(self.base_url + '/oauth2/astoken', json={
+                'DeviceType': 'Web',
+                'Devicetoken': device_id,
+                'Password': password,
+                'UserName': username
+            }, trace=trace)
+
+            validate_response(response)
+            otp = require_otp(response)
+            json = loads(response.content)
+        except Exception as e:
+            if trace is not None:
+                self.__finish_trace(trace, e)
+            raise
+
+        if trace is not None:
+            self.__finish_trace(trace)
 
         if not otp:
             self._jwt = json['data']['jwt']
         else:
             student_id = json['data']['StudentID']
-            self._jwt = fetch_jwt_from_otp(username, password, device_id, student_id)
+            trace = self.__start_trace('oauth2/verifyotp', 'POST')
+            try:
+                self._jwt = fetch_jwt_from_otp(username, password, device_id, student_id, session=self._transport,
+                                               auth_url=self.base_url + '/oauth2', trace=trace)
+            except Exception as e:
+                if trace is not None:
+                    self.__finish_trace(trace, e)
+                raise
+
+            if trace is not None:
+                self.__finish_trace(trace)
+
+        if self._token_store is not None:
+            self._token_store.save(username, self._jwt, device_id, password)
+
+    def __start_trace(self, endpoint: str, http_method: str) -> Optional[RequestTrace]:
+        """
+        Start the trace of a request if the client is instrumented.
+
+        :return: The trace, None if the client is not instrumented.
+        :meta private:
+        """
+        if self._instrumentation is None:
+            return None
+
+        trace = RequestTrace(endpoint, http_method)
+        self._instrumentation.request_started(trace)
+        return trace
+
+    def __finish_trace(self, trace: RequestTrace, error: Exception = None):
+        """
+        :meta private:
+        """
+        trace.finish(error)
+        self._instrumentation.request_finished(trace)
+
+    @staticmethod
+    def __timed_chunks(chunks: Iterator[bytes], trace: RequestTrace) -> Iterator[bytes]:
+        """
+        Record the time spent waiting for the chunks of a streamed response and their size.
+
+        :meta private:
+        """
+        trace.download = 0.0
+        while True:
+            start = time.perf_counter()
+            chunk = next(chunks, None)
+            trace.download += time.perf_counter() - start
+            if chunk is None:
+                return
+            trace.bytes += len(chunk)
+            yield chunk
+
+    @staticmethod
+    def __create_session(pool_connections: int, pool_maxsize: int, keep_alive: bool) -> requests.Session:
+        """
+        Create a session with a connection pool mounted for both HTTP and HTTPS.
+
+        :param pool_connections: The number of host connection pools to cache.
+        :param pool_maxsize: The maximum number of connections to keep open per host.
+        :param keep_alive: Specify whether connections should be reused between requests.
+        :return: The configured session.
+        :meta private:
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+
+        if not keep_alive:
+            session.headers['Connection'] = 'close'
+
+        return session
@@ -0,0 +1,464 @@
+from typing import Dict, Iterable, List, Mapping, Sequence, Tuple, Union
+from allen.solution import SubjectSolution
+from allen.test_record import TestRecord
+
+__all__ = ['SUBJECTS', 'TestRecordTable', 'SolutionTable']
+
+SUBJECTS = ('biology', 'physics', 'chemistry', 'maths')
+'''The subjects of a test, in the order of the columns of a :class:`TestRecordTable`'''
+
+_SUBJECT_KEYS = {'biology': 'Bio', 'physics': 'Phy', 'chemistry': 'Chem', 'maths': 'Math'}
+_INT_KEYS = {'total': 'Total', 'rank': 'Rank'}
+_OPTIONAL_SUBJECTS = ('biology', 'maths')
+
+
+def _numpy():
+    """
+    Import numpy, which is only needed once analytics are used.
+
+    :meta private:
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError('Analytics require numpy, install it using '
+                          'pip install allen-py-client[analytics]') from None
+    return numpy
+
+
+def _int_column(values: list, masked: bool):
+    """
+    Convert the raw values of a column to an int array.
+
+    :param values: The values, either numbers or strings of digits.
+    :param masked: Specify whether values which are not integers, such as the ``-`` of a subject which was not part
+        of the test, are masked instead of raising a ValueError.
+    :return: An int64 array, masked if ``masked`` is True.
+    """
+    np = _numpy()
+    try:
+        column = np.fromiter(map(int, values), dtype=np.int64, count=len(values))
+    except ValueError:
+        if not masked:
+            raise
+    else:
+        return np.ma.masked_array(column, mask=np.zeros(len(column), dtype=bool)) if masked else column
+
+    strings = np.array(values, dtype=str)
+    valid = np.char.isdecimal(np.char.lstrip(strings, '-'))
+    return np.ma.masked_array(np.where(valid, strings, '0').astype(np.int64), mask=~valid)
+
+
+def _date_column(values: list):
+    """
+    Convert the raw dates of a column to a datetime64 array, with NaT for dates which cannot be parsed.
+
+    :meta private:
+    """
+    np = _numpy()
+    try:
+        return np.array(values, dtype='datetime64[s]')
+    except (TypeError, ValueError):
+        pass
+
+    dates = []
+    for value in values:
+        try:
+            dates.append(np.datetime64(value, 's'))
+        except (TypeError, ValueError):
+            dates.append(np.datetime64('NaT', 's'))
+    return np.array(dates, dtype='datetime64[s]')
+
+
+class TestRecordTable:
+    """
+    The tests you've attempted, stored as one typed column per attribute so aggregations run vectorized.
+
+    The marks of the subjects are masked arrays, where a subject which was not part of a test is masked instead of
+    holding the ``-1`` used by :class:`test_record.TestRecord`. Every column is available as an attribute of the
+    table, for example ``table.physics``.
+
+    .. note::
+
+        Requires the ``numpy`` package, install it using ``pip install allen-py-client[analytics]``.
+    """
+
+    COLUMNS = SUBJECTS + ('total', 'percentage', 'rank', 'test_name', 'test_date', 'test_id')
+    '''The names of the columns of the table'''
+
+    def __init__(self, columns: Dict[str, object]):
+        """
+        :param columns: The arrays of every column in :attr:`COLUMNS`, all of the same length.
+        """
+        missing = [name for name in self.COLUMNS if name not in columns]
+        if missing:
+            raise ValueError(f'Missing columns {", ".join(missing)}')
+
+        lengths = {len(columns[name]) for name in self.COLUMNS}
+        if len(lengths) > 1:
+            raise ValueError('The columns must all have the same length')
+
+        self._columns = {name: columns[name] for name in self.COLUMNS}
+
+    @classmethod
+    def from_json(cls, json_list: List[dict]) -> 'TestRecordTable':
+        """
+        Load the test json dicts of the ``studenttestrecord`` response straight into columns,
+        without creating a :class:`test_record.TestRecord` for every test.
+
+        :param json_list: The json dictionaries of the tests.
+        :return: The table of the tests.
+        :raises ValueError: If the marks, rank or percentage of a test are not numbers.
+        """
+        np = _numpy()
+        columns = {}
+        for name, key in _SUBJECT_KEYS.items():
+            columns[name] = _int_column([test.get(key) for test in json_list], name in _OPTIONAL_SUBJECTS)
+        for name, key in _INT_KEYS.items():
+            columns[name] = _int_column([test.get(key) for test in json_list], False)
+
+        percentages = [test.get('Per') for test in json_list]
+        columns['percentage'] = np.fromiter(map(float, percentages), dtype=np.float64, count=len(percentages))
+        columns['test_name'] = np.array([test.get('TestName') for test in json_list], dtype=object)
+        columns['test_date'] = _date_column([test.get('TestDate') for test in json_list])
+        columns['test_id'] = np.array([test.get('TestID') for test in json_list], dtype=object)
+
+        return cls(columns)
+
+    @classmethod
+    def from_records(cls, records: Iterable[TestRecord]) -> 'TestRecordTable':
+        """
+        Build the table from existing :class:`test_record.TestRecord` objects.
+
+        :param records: The tests to put in the table.
+        :return: The table of the tests.
+        """
+        np = _numpy()
+        records = list(records)
+
+        columns = {}
+        for name in SUBJECTS:
+            marks = np.array([getattr(record, name) for record in records], dtype=np.int64)
+            mask = marks == -1 if name in _OPTIONAL_SUBJECTS else np.zeros(len(marks), dtype=bool)
+            columns[name] = np.ma.masked_array(marks, mask=mask)
+
+        columns['total'] = np.array([record.total for record in records], dtype=np.int64)
+        columns['rank'] = np.array([record.rank for record in records], dtype=np.int64)
+        columns['percentage'] = np.array([record.percentage for record in records], dtype=np.float64)
+        columns['test_name'] = np.array([record.test_name for record in records], dtype=object)
+        columns['test_date'] = _date_column([record._test_date for record in records])
+        columns['test_id'] = np.array([record._test_id for record in records], dtype=object)
+
+        return cls(columns)
+
+    def __len__(self) -> int:
+        return len(self._columns['total'])
+
+    def __getattr__(self, name: str):
+        columns = self.__dict__.get('_columns')
+        if columns is not None and name in columns:
+            return columns[name]
+        raise AttributeError(f'{type(self).__name__!r} object has no attribute {name!r}')
+
+    def __getitem__(self, index) -> 'TestRecordTable':
+        """
+        Select some tests of the table.
+
+        :param index: A slice, an array of indices or a boolean array.
+        :return: A table of the selected tests.
+        """
+        return TestRecordTable({name: column[index] for name, column in self._columns.items()})
+
+    def to_arrays(self) -> Dict[str, object]:
+        """
+        :return: A dict mapping the name of every column to its array.
+        """
+        return dict(self._columns)
+
+    def to_dataframe(self):
+        """
+        Convert the table to a ``pandas.DataFrame``, with NaN for the subjects which were not part of a test.
+
+        :return: The data frame.
+        """
+        try:
+            import pandas
+        except ImportError:
+            raise ImportError('to_dataframe requires pandas, install it using pip install pandas') from None
+
+        return pandas.DataFrame({name: pandas.Series(column) for name, column in self._columns.items()})
+
+    def sort_by_date(self) -> 'TestRecordTable':
+        """
+        :return: A table of the tests sorted from the oldest to the newest, tests without a date come last.
+        """
+        return self[_numpy().argsort(self._columns['test_date'], kind='stable')]
+
+    def subject_averages(self) -> Dict[str, float]:
+        """
+        Compute the average marks of every subject over the tests the subject was part of.
+
+        :return: A dict mapping every subject to its average marks, NaN if no test contained the subject.
+        """
+        np = _numpy()
+        averages = {}
+        for name in SUBJECTS:
+            average = self._columns[name].mean()
+            averages[name] = float(average) if average is not np.ma.masked else float('nan')
+        return averages
+
+    def rank_percentiles(self, percentiles: Union[float, Sequence[float]] = (25, 50, 75)):
+        """
+        Compute percentiles of the ranks received.
+
+        :param percentiles: The percentiles to compute, between 0 and 100.
+        :return: The rank at every percentile.
+        """
+        return _numpy().percentile(self._columns['rank'], percentiles)
+
+    def moving_average(self, column: str = 'percentage', window: int = 3):
+        """
+        Compute the moving average of a column over consecutive tests, in the order of the table.
+        Masked values are left out of the averages of the windows containing them.
+        Use :meth:`sort_by_date` first to average the tests in the order they were conducted.
+
+        :param column: The name of a numeric column.
+        :param window: The number of consecutive tests averaged.
+        :return: A float array with one average per window, NaN for windows with no values.
+        """
+        np = _numpy()
+        if window < 1:
+            raise ValueError('The window must contain at least one test')
+
+        values = np.ma.asarray(self._columns[column], dtype=np.float64)
+        present = ~np.ma.getmaskarray(values)
+
+        sums = np.concatenate(([0.0], np.cumsum(values.filled(0.0))))
+        counts = np.concatenate(([0], np.cumsum(present)))
+        window_sums = sums[window:] - sums[:-window]
+        window_counts = counts[window:] - counts[:-window]
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(window_counts > 0, window_sums / window_counts, np.nan)
+
+
+class SolutionTable:
+    """
+    The answers marked in many tests, packed into one row per question so they can be queried vectorized.
+
+    The subjects, tests and responses are stored as small integer codes indexing :attr:`subjects`, :attr:`test_ids`
+    and :attr:`responses`, so the table holds a few bytes per question instead of a :class:`solution.Solution`.
+    An unattempted question has the empty response ``''``.
+
+    .. note::
+
+        Requires the ``numpy`` package, install it using ``pip install allen-py-client[analytics]``.
+    """
+
+    def __init__(self, test_ids: Sequence[str], subjects: Sequence[str], responses: Sequence[str], test, subject,
+                 question_no, response):
+        """
+        :param test_ids: The IDs of the tests, indexed by the ``test`` column.
+        :param subjects: The names of the subjects, indexed by the ``subject`` column.
+        :param responses: The distinct responses, indexed by the ``response`` column.
+        :param test: The code of the test of every question.
+        :param subject: The code of the subject of every question.
+        :param question_no: The number of every question.
+        :param response: The code of the response to every question.
+        """
+        if not len(test) == len(subject) == len(question_no) == len(response):
+            raise ValueError('The columns must all have the same length')
+
+        self.test_ids = tuple(test_ids)
+        '''The IDs of the tests in the table'''
+
+        self.subjects = tuple(subjects)
+        '''The names of the subjects in the table'''
+
+        self.responses = tuple(responses)
+        '''The distinct responses marked, sorted'''
+
+        self.test = test
+        '''The index in :attr:`test_ids` of the test of every question'''
+
+        self.subject = subject
+        '''The index in :attr:`subjects` of the subject of every question'''
+
+        self.question_no = question_no
+        '''The number of every question'''
+
+        self.response = response
+        '''The index in :attr:`responses` of the response to every question'''
+
+    @classmethod
+    def from_json(cls, subjects_by_test: Mapping[str, List[dict]]) -> 'SolutionTable':
+        """
+        Pack the ``listSubject`` json of the ``GetTestSolution`` responses of many tests, without creating a
+        :class:`solution.Solution` for every question.
+
+        :param subjects_by_test: The subject json dicts of every test, keyed by the ID of the test.
+        :return: The table of the questions of every test.
+        """
+        def read(subject: dict):
+            questions = subject.get('listQuestion')
+            return (str(subject.get('SubjectName')).title(), [question.get('QuestionNo') for question in questions],
+                    [question.get('Response') for question in questions])
+
+        return cls._pack(subjects_by_test, read)
+
+    @classmethod
+    def from_solutions(cls, solutions_by_test: Mapping[str, List[SubjectSolution]]) -> 'SolutionTable':
+        """
+        Pack the results of :meth:`test_record.TestRecord.get_subject_solutions` for many tests.
+
+        :param solutions_by_test: The subject solutions of every test, keyed by the ID of the test.
+        :return: The table of the questions of every test.
+        """
+        def read(subject: SubjectSolution):
+            return (subject.subject_name, [solution.question_no for solution in subject.solutions],
+                    [solution.response for solution in subject.solutions])
+
+        return cls._pack(solutions_by_test, read)
+
+    @classmethod
+    def _pack(cls, subjects_by_test: Mapping[str, list], read) -> 'SolutionTable':
+        """
+        Pack the subjects of many tests into columns.
+
+        :param subjects_by_test: The subjects of every test, keyed by the ID of the test.
+        :param read: The function returning the name, question numbers and responses of a subject.
+        :meta private:
+        """
+        np = _numpy()
+        subject_codes = {}
+        group_tests, group_subjects, lengths = [], [], []
+        question_nos, responses = [], []
+
+        for test_index, subjects in enumerate(subjects_by_test.values()):
+            for subject in subjects:
+                name, numbers, marked = read(subject)
+                group_tests.append(test_index)
+                group_subjects.append(subject_codes.setdefault(name, len(subject_codes)))
+                lengths.append(len(numbers))
+                question_nos.extend(numbers)
+                responses.extend(marked)
+
+        categories, response = np.unique(np.array([marked or '' for marked in responses], dtype=str),
+                                         return_inverse=True)
+
+        return cls(
+            subjects_by_test.keys(), subject_codes, categories.tolist(),
+            np.repeat(np.array(group_tests, dtype=np.int32), lengths),
+            np.repeat(np.array(group_subjects, dtype=np.int8), lengths),
+            np.array(question_nos, dtype=np.int16),
+            response.astype(np.int16).reshape(-1)
+        )
+
+    @classmethod
+    def concat(cls, tables: Iterable['SolutionTable']) -> 'SolutionTable':
+        """
+        Join the tables of different tests into one, for example the tables packed by several processes.
+
+        :param tables: The tables to join, which must not share a test.
+        :return: The table of the questions of every table, in order.
+        """
+        np = _numpy()
+        tables = list(tables)
+        if not tables:
+            return cls.from_json({})
+
+        responses = sorted(set().union(*(table.responses for table in tables)))
+        response_codes = {marked: code for code, marked in enumerate(responses)}
+        test_ids, subject_codes = [], {}
+        tests, subjects, question_nos, response = [], [], [], []
+
+        for table in tables:
+            subject_map = np.array([subject_codes.setdefault(name, len(subject_codes)) for name in table.subjects],
+                                   dtype=np.int8)
+            response_map = np.array([response_codes[marked] for marked in table.responses], dtype=np.int16)
+
+            tests.append(table.test + np.int32(len(test_ids)))
+            subjects.append(subject_map[table.subject])
+            question_nos.append(table.question_no)
+            response.append(response_map[table.response])
+            test_ids.extend(table.test_ids)
+
+        return cls(test_ids, subject_codes, responses, np.concatenate(tests), np.concatenate(subjects),
+                   np.concatenate(question_nos), np.concatenate(response))
+
+    def __len__(self) -> int:
+        return len(self.question_no)
+
+    @property
+    def attempted(self):
+        """
+        A boolean array which is True for every question which was attempted.
+        """
+        np = _numpy()
+        if '' not in self.responses:
+            return np.ones(len(self), dtype=bool)
+        return self.response != self.responses.index('')
+
+    def attempts_by_test(self):
+        """
+        Count the questions attempted in every subject of every test.
+
+        :return: An int array with a row per test in :attr:`test_ids` and a column per subject in :attr:`subjects`.
+        """
+        np = _numpy()
+        shape = (len(self.test_ids), len(self.subjects))
+        cells = self.test.astype(np.int64) * shape[1] + self.subject
+        counts = np.bincount(cells, weights=self.attempted, minlength=shape[0] * shape[1])
+        return counts.astype(np.int64).reshape(shape)
+
+    def attempt_rates(self) -> Dict[str, float]:
+        """
+        Compute the fraction of the questions of every subject which were attempted, over all the tests.
+
+        :return: A dict mapping every subject to its attempt rate.
+        """
+        np = _numpy()
+        totals = np.bincount(self.subject, minlength=len(self.subjects))
+        attempted = np.bincount(self.subject, weights=self.attempted, minlength=len(self.subjects))
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rates = attempted / totals
+        return {name: float(rates[code]) for code, name in enumerate(self.subjects)}
+
+    def unattempted_counts(self) -> Dict[str, int]:
+        """
+        Count the questions of every subject which were not attempted, over all the tests.
+
+        :return: A dict mapping every subject to its number of unattempted questions.
+        """
+        np = _numpy()
+        counts = np.bincount(self.subject[~self.attempted], minlength=len(self.subjects))
+        return {name: int(counts[code]) for code, name in enumerate(self.subjects)}
+
+    def response_histogram(self, subject: str = None) -> Dict[str, int]:
+        """
+        Count how many times every response was marked.
+
+        :param subject: The subject to count the responses of, every subject if not specified.
+        :return: A dict mapping every response to the number of times it was marked, ``''`` for unattempted.
+        """
+        np = _numpy()
+        codes = self.response if subject is None else self.response[self.subject == self.subjects.index(subject)]
+        counts = np.bincount(codes, minlength=len(self.responses))
+        return {marked: int(counts[code]) for code, marked in enumerate(self.responses)}
+
+    def question_attempt_rates(self, subject: str) -> Tuple[object, object]:
+        """
+        Compute the fraction of the tests in which every question of a subject was attempted.
+
+        :param subject: The subject of the questions.
+        :return: The question numbers and the attempt rate of every question, as two arrays.
+        """
+        np = _numpy()
+        rows = self.subject == self.subjects.index(subject)
+        numbers = self.question_no[rows].astype(np.int64)
+        totals = np.bincount(numbers)
+        attempted = np.bincount(numbers, weights=self.attempted[rows], minlength=len(totals))
+
+        asked = np.nonzero(totals)[0]
+        return asked, attempted[asked] / totals[asked]
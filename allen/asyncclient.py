@@ -0,0 +1,462 @@
+import asyncio
+import random
+import requests
+from typing import Dict, Iterable, List, Union
+from allen.utils import DEFAULT_BASE_URL, require_otp, validate_response
+from allen.video import RecordedVideo, LiveClassDay
+from allen.exceptions import AllenInvalidUsernamePassword, AllenResponseUnavailable, AllenInvalidResponse, \
+    AllenConnectionError
+from allen.exam import Examination
+from allen.addon_classes import AddonClass, AddonVideo
+from allen.test_record import TestRecord
+from allen.solution import SubjectSolution
+from allen.bulk import LinkResult, SolutionResult
+from allen.decoder import loads
+from allen.cache import ResponseCache
+from allen.singleflight import AsyncSingleFlight
+from allen.transport import Transport, TransportPolicy
+
+__all__ = ['AsyncAllenClient']
+
+
+class AsyncAllenClient:
+    """
+    Asynchronous access to Allen's API built on ``aiohttp``.
+
+    The client logs in on the first request, logs in again if the token is rejected, and applies the timeouts and
+    retries of a :class:`transport.TransportPolicy` like :class:`allenclient.AllenClient` does. The rate limit of
+    the policy is not applied, ``max_concurrency`` bounds the requests in flight instead.
+
+    The client returns the same objects as :class:`allenclient.AllenClient`, but without a client bound to them.
+    Their links and solutions must be fetched through the client, for example with :meth:`get_link` instead of
+    ``video.get_link()``, which raises :class:`exceptions.AllenClientNotBound`.
+
+    .. note::
+
+        Requires the ``aiohttp`` package, install it using ``pip install allen-py-client[async]``.
+    """
+
+    _player_paths = {
+        RecordedVideo: 'dc/student/recordingplayer',
+        AddonVideo: 'discussion/student/player'
+    }
+
+    def __init__(self, username: Union[str, int] = None, password: str = None, jwt: str = None,
+                 session=None, pool_maxsize: int = 10, max_concurrency: int = 10, base_url: str = DEFAULT_BASE_URL,
+                 single_flight: AsyncSingleFlight = None, transport: TransportPolicy = None):
+        """
+        Initialize connection to Allen's API.
+
+        :param username: The form number used to log into Allen's website.
+        :param password: The password used to log into Allen's website.
+        :param jwt: The JWT Token
+        :param session: An existing ``aiohttp.ClientSession``. The session is not closed by the client.
+        :param pool_maxsize: The maximum number of connections to keep open per host.
+        :param max_concurrency: The maximum number of requests in flight at once.
+        :param base_url: The url Allen's API is served from.
+        :param single_flight: The coalescer sharing identical requests in flight between tasks, pass the same one to
+            several clients to share requests between them as well.
+        :param transport: The timeouts and retries applied to every request. The timeouts only apply to the session
+            created by the client, sessions passed to the client keep their own.
+        """
+        if username is None:
+            username = ""
+        if password is None:
+            password = ""
+
+        if jwt is None and (username == "" or password == ""):
+            raise AllenInvalidUsernamePassword()
+
+        self._username = str(username)
+        self._password = password
+        self._jwt = jwt
+        self._session = session
+        self._owns_session = session is None
+        self._pool_maxsize = pool_maxsize
+        self._max_concurrency = max_concurrency
+        self._policy = transport if transport is not None else TransportPolicy()
+        # The semaphore and lock are created inside the running loop, as they bind to the loop before Python 3.10.
+        self._loop = None
+        self._semaphore = None
+        self._login_lock = None
+        self._single_flight = single_flight if single_flight is not None else AsyncSingleFlight()
+
+        self.base_url = base_url.rstrip('/')
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        """
+        Close the connections held by the client.
+        Sessions passed to the client are left open and must be closed by the caller.
+        """
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def get_recorded_videos(self) -> List[RecordedVideo]:
+        """
+        Fetch the list of recorded videos available to view.
+
+        :return: A list of the class:`video.RecordedVideo` class
+        """
+        video_list_json = await self.fetch_json('dc/student/recordinglist')
+        video_list = list()
+
+        for video_day in video_list_json:
+            date = video_day['ClassDate']
+            video_list.extend(RecordedVideo.from_json_many(video_day['listClass'], date, None))
+
+        return video_list
+
+    async def get_live_classes(self) -> List[LiveClassDay]:
+        """
+        Fetch the list of upcoming live classes.
+
+        :return: A list of the class:`video.LiveClassDay` class
+        """
+        live_class_day_list_json = await self.fetch_json('dc/student/livelist')
+        return LiveClassDay.from_json_many(live_class_day_list_json)
+
+    async def get_test_records(self) -> List[TestRecord]:
+        """
+        Fetch the list of tests you've attempted.
+
+        :return: A list of the class:`test_record.TestRecord` class
+        """
+        test_list = (await self.fetch_json('studenttestrecord')).get('testList')
+        return TestRecord.from_json_many(test_list, None)
+
+    async def get_exam_calendar(self) -> List[Examination]:
+        """
+        Fetch the list of exams on the exam calendar.
+
+        :return: A list of the class:`exam.Examination` class
+        """
+        json = await self.fetch_json('studentexamcalendar')
+        return Examination.from_json_many(json)
+
+    async def get_addon_classes(self) -> List[AddonClass]:
+        """
+        Fetch the list of addon classes available.
+
+        :return: A list of the class:`addon_classes.AddonClass` class
+        """
+        json = await self.fetch_json('discussion/student/list')
+        return AddonClass.from_json_many(json, None)
+
+    async def get_link(self, video: Union[RecordedVideo, AddonVideo]) -> str:
+        """
+        Retrieve the link of a recorded or addon video.
+
+        :param video: The video to retrieve the link of.
+        :return: The link of the video.
+        """
+        json = await self.fetch_json(self._player_paths[type(video)], post_data={'UniqueCode': video.unique_code})
+        return json['ClassURL']
+
+    async def resolve_links(self, videos: Iterable[Union[RecordedVideo, AddonVideo]]) -> List[LinkResult]:
+        """
+        Resolve the links of many recorded or addon videos concurrently.
+        Videos sharing a unique code are only resolved once.
+
+        :param videos: The videos to resolve the links of.
+        :return: A list of the class:`bulk.LinkResult` class in the same order as the videos.
+        """
+        videos = list(videos)
+
+        unique = {}
+        for video in videos:
+            unique.setdefault((type(video), video.unique_code), video)
+
+        keys = list(unique)
+        links = await asyncio.gather(*[self.get_link(unique[key]) for key in keys], return_exceptions=True)
+        resolved = dict(zip(keys, links))
+
+        link_results = []
+        for video in videos:
+            link = resolved[(type(video), video.unique_code)]
+            if isinstance(link, Exception):
+                link_results.append(LinkResult(video, None, link))
+            else:
+                link_results.append(LinkResult(video, link, None))
+
+        return link_results
+
+    async def get_subject_solutions(self, test_record: TestRecord, paper_no: int = 1) -> List[SubjectSolution]:
+        """
+        Get the solutions of a test.
+
+        :param test_record: The test to get the solutions of.
+        :param paper_no: The number of the paper of the test to get the solutions of.
+        :return: A list of SubjectSolution objects.
+        """
+        solution = await self.fetch_json('GetTestSolution', post_data={
+            'PaperNo': paper_no,
+            'TestID': test_record._test_id
+        })
+
+        subjects = solution['listPaper'][0]['listSubject']
+        return SubjectSolution.from_json_many(subjects)
+
+    async def get_solutions_for(self, records: Iterable[TestRecord],
+                                papers: Iterable[int] = (1,)) -> Dict[str, Dict[int, SolutionResult]]:
+        """
+        Fetch the solutions of many tests concurrently.
+        Tests sharing a test ID are only fetched once per paper.
+
+        :param records: The tests to fetch the solutions of.
+        :param papers: The numbers of the papers to fetch for every test.
+        :return: A dict mapping the ID of every test to a dict of the class:`bulk.SolutionResult` class keyed by
+            the number of the paper.
+        """
+        papers = list(papers)
+
+        unique = {}
+        for record in records:
+            for paper_no in papers:
+                unique.setdefault((record._test_id, paper_no), record)
+
+        keys = list(unique)
+        results = await asyncio.gather(*[self.get_subject_solutions(unique[key], key[1]) for key in keys],
+                                       return_exceptions=True)
+
+        solutions = {}
+        for (test_id, paper_no), result in zip(keys, results):
+            record = unique[(test_id, paper_no)]
+            if isinstance(result, Exception):
+                solutions.setdefault(test_id, {})[paper_no] = SolutionResult(record, paper_no, None, result)
+            else:
+                solutions.setdefault(test_id, {})[paper_no] = SolutionResult(record, paper_no, result, None)
+
+        return solutions
+
+    async def fetch_json(self, url_path: str, http_method: str = 'POST', headers: dict = None,
+                         query_params: dict = None, post_data: dict = None) -> dict:
+        """
+        Fetch some JSON from Allen's API.
+
+        :param url_path: The url to fetch the JSON from.
+        :param http_method: The http method that will be used with the request.
+        :param headers: The headers to pass through the request.
+        :param query_params: The url parameters to include with the request.
+        :param post_data: The post data to send with the request.
+
+        :return: A dict containing the parsed JSON response. The dict is shared with the callers of the same request
+            in flight, so it must not be modified.
+        :meta private:
+        """
+        if headers is None:
+            headers = {}
+        if query_params is None:
+            query_params = {}
+        if post_data is None:
+            post_data = {}
+
+        if url_path[0] == '/':
+            url_path = url_path[1:]
+
+        if headers:
+            return await self.__fetch(url_path, http_method, headers, query_params, post_data)
+
+        # Identical requests in flight at once share a single response, the key holds the url of the server as the
+        # coalescer may be shared by clients of other servers.
+        identity = self._username if self._username != "" else self._jwt
+        key = ResponseCache.make_key(url_path, http_method, query_params, post_data, identity, self.base_url + '/api')
+        return await self._single_flight.do(key, lambda: self.__fetch(
+            url_path, http_method, headers, query_params, post_data))
+
+    async def __fetch(self, url_path: str, http_method: str, headers: dict, query_params: dict,
+                      post_data: dict) -> dict:
+        """
+        Send a request to Allen's API and parse its JSON.
+
+        :meta private:
+        """
+        if self._jwt is None:
+            await self.__setup()
+
+        headers['Content-Type'] = 'application/json; charset=utf-8'
+        headers['Accept'] = 'application/json'
+
+        url = self.base_url + '/api/' + url_path
+
+        jwt = self._jwt
+        headers['Authorization'] = f'Bearer {jwt}'
+        response = await self._request(http_method, url, params=query_params, headers=headers, json=post_data)
+
+        # Log in again if the token has expired and the credentials are known.
+        if response.status_code == 401 and self._password != "":
+            await self.__setup(jwt)
+            headers['Authorization'] = f'Bearer {self._jwt}'
+            response = await self._request(http_method, url, params=query_params, headers=headers, json=post_data)
+
+        if response.status_code != 200:
+            raise AllenResponseUnavailable(url, response)
+
+        try:
+            json = loads(response.content)
+        except ValueError:
+            raise AllenInvalidResponse(response)
+
+        if 'data' not in json or json['data'] is None:
+            raise AllenInvalidResponse(response)
+
+        return json['data']
+
+    async def _request(self, http_method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Perform a request on the pooled session, bounded by the concurrency semaphore, retrying connection failures
+        and the retryable status codes of the transport policy.
+
+        :return: The response of the last attempt, read into a :class:`requests.Response` so it can be validated
+            like a sync response.
+        :raises AllenConnectionError: If the last attempt failed to connect or timed out.
+        :meta private:
+        """
+        import aiohttp
+
+        policy = self._policy
+        attempt = 0
+        while True:
+            try:
+                response = await self.__send(http_method, url, **kwargs)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt >= policy.max_retries:
+                    raise AllenConnectionError(url, e) from e
+                await asyncio.sleep(policy.backoff(attempt))
+                attempt += 1
+                continue
+
+            if response.status_code not in policy.retry_statuses or attempt >= policy.max_retries:
+                return response
+
+            delay = Transport.retry_after(response) if policy.respect_retry_after else None
+            if delay is None:
+                delay = policy.backoff(attempt)
+
+            await asyncio.sleep(min(delay, policy.backoff_max))
+            attempt += 1
+
+    async def __send(self, http_method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Perform a single attempt of a request.
+
+        :meta private:
+        """
+        async with self.__get_semaphore():
+            session = self.__get_session()
+            async with session.request(http_method, url, **kwargs) as aio_response:
+                content = await aio_response.read()
+
+                response = requests.Response()
+                response.status_code = aio_response.status
+                response._content = content
+                response.url = str(aio_response.url)
+                response.headers.update(aio_response.headers)
+                response.request = requests.Request(http_method, url).prepare()
+                response.encoding = 'utf-8'
+
+                return response
+
+    def __bind_loop(self):
+        """
+        Create the semaphore and login lock inside the running loop, again if the client moved to another loop.
+
+        :meta private:
+        """
+        loop = asyncio.get_event_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+            self._login_lock = asyncio.Lock()
+
+    def __get_semaphore(self) -> asyncio.Semaphore:
+        """
+        :meta private:
+        """
+        self.__bind_loop()
+        return self._semaphore
+
+    def __get_login_lock(self) -> asyncio.Lock:
+        """
+        :meta private:
+        """
+        self.__bind_loop()
+        return self._login_lock
+
+    def __get_session(self):
+        """
+        Create the pooled ``aiohttp`` session on first use, inside the running event loop.
+
+        :meta private:
+        """
+        if self._session is None:
+            try:
+                import aiohttp
+            except ImportError:
+                raise ImportError('AsyncAllenClient requires aiohttp, install it using '
+                                  'pip install allen-py-client[async]') from None
+
+            connector = aiohttp.TCPConnector(limit=self._pool_maxsize, limit_per_host=self._pool_maxsize)
+            timeout = aiohttp.ClientTimeout(sock_connect=self._policy.connect_timeout,
+                                            sock_read=self._policy.read_timeout)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+        return self._session
+
+    async def __setup(self, stale_jwt: str = None):
+        """
+        Generate a JWT token from the provided username and password, unless another task has already done so.
+
+        :param stale_jwt: The token which was rejected by the server, None if the client has not logged in yet.
+        :meta private:
+        """
+        async with self.__get_login_lock():
+            if self._jwt != stale_jwt:
+                return
+
+            username = self._username
+            password = self._password
+            device_id = random.randint(100000000000, 999999999999)
+
+            response = await self._request('POST', self.base_url + '/oauth2/astoken', json={
+                'DeviceType': 'Web',
+                'Devicetoken': device_id,
+                'Password': password,
+                'UserName': username
+            })
+
+            validate_response(response)
+            otp = require_otp(response)
+            json = loads(response.content)
+
+            if not otp:
+                self._jwt = json['data']['jwt']
+                return
+
+            url = self.base_url + '/oauth2/verifyotp'
+            response = await self._request('POST', url, json={
+                'DeviceType': 'Web',
+                'Devicetoken': device_id,
+                'Password': password,
+                'UserName': username,
+                'g-recaptcha-response': 'otp',
+                'StudentID': json['data']['StudentID']
+            })
+            if response.status_code != 200:
+                raise AllenResponseUnavailable(url, response)
+
+            try:
+                json = loads(response.content)
+            except ValueError:
+                raise AllenInvalidResponse(response)
+
+            if not isinstance(json.get('data'), dict) or 'jwt' not in json['data']:
+                raise AllenInvalidResponse(response)
+
+            self._jwt = json['data']['jwt']
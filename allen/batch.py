@@ -0,0 +1,230 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple, Union
+import requests
+from requests.adapters import HTTPAdapter
+from allen.allenclient import AllenClient
+from allen.cache import ResponseCache
+from allen.disk_cache import DiskCache
+from allen.instrumentation import Instrumentation
+from allen.token_store import TokenStore
+from allen.transport import TokenBucket, TransportPolicy
+from allen.utils import DEFAULT_BASE_URL
+
+__all__ = ['Account', 'AccountResult', 'BatchRunner', 'DEFAULT_TASKS']
+
+DEFAULT_TASKS: Dict[str, Callable[[AllenClient], Any]] = {
+    'recorded_videos': AllenClient.get_recorded_videos,
+    'test_records': AllenClient.get_test_records,
+    'exam_calendar': AllenClient.get_exam_calendar,
+}
+'''The calls made for every account unless specified, keyed by the name their results are stored under'''
+
+
+@dataclass(frozen=True)
+class Account:
+    username: Optional[str] = None
+    '''The form number used to log into Allen's website'''
+
+    password: Optional[str] = field(default=None, repr=False)
+    '''The password used to log into Allen's website'''
+
+    jwt: Optional[str] = field(default=None, repr=False)
+    '''The JWT token, used instead of the username and password if specified'''
+
+    @classmethod
+    def of(cls, value: Union['Account', str, Tuple[str, str]]) -> 'Account':
+        """
+        Create an account from a JWT token or a ``(username, password)`` tuple.
+
+        :param value: The account, JWT token or tuple.
+        :return: The account.
+        """
+        if isinstance(value, Account):
+            return value
+        if isinstance(value, str):
+            return cls(jwt=value)
+
+        username, password = value
+        return cls(str(username), password)
+
+
+@dataclass(frozen=True)
+class AccountResult:
+    account: Account
+    '''The account the results were fetched for'''
+
+    client: Optional[AllenClient]
+    '''The client logged into the account, None if the login failed'''
+
+    results: Dict[str, Any]
+    '''The result of every task which succeeded, keyed by the name of the task'''
+
+    errors: Dict[str, Exception]
+    '''The exception raised by every task which failed, keyed by the name of the task'''
+
+    error: Optional[Exception] = None
+    '''The exception raised while logging in, None if the login succeeded'''
+
+    @property
+    def ok(self) -> bool:
+        """
+        Specify whether the login and every task succeeded.
+        """
+        return self.error is None and not self.errors
+
+
+class _Job:
+    """
+    The login and tasks of an account in progress.
+
+    :meta private:
+    """
+
+    __slots__ = ('account', 'client', 'results', 'errors', 'pending')
+
+    def __init__(self, account: Account):
+        self.account = account
+        self.client = None
+        self.results = {}
+        self.errors = {}
+        self.pending = 0
+
+    def result(self, error: Exception = None) -> AccountResult:
+        return AccountResult(self.account, self.client, self.results, self.errors, error)
+
+
+class BatchRunner:
+    """
+    Fetches the data of many accounts at once on a bounded thread pool.
+
+    Every account logs in on the pool, after which each of its tasks is scheduled on the pool as well, so the logins
+    of some accounts overlap with the calls of others. The clients share one connection pool and one rate limit, and
+    the results of every account are yielded as soon as all of its tasks are done.
+
+    The accounts are read lazily, so only a bounded number of them is in progress at once however many are passed.
+    """
+
+    def __init__(self, tasks: Dict[str, Callable[[AllenClient], Any]] = None, max_workers: int = 16,
+                 rate_limit: float = None, burst: int = 1, transport: TransportPolicy = None,
+                 session: requests.Session = None, token_store: TokenStore = None, cache: ResponseCache = None,
+                 disk_cache: DiskCache = None, instrumentation: Instrumentation = None,
+                 base_url: str = DEFAULT_BASE_URL):
+        """
+        :param tasks: The functions called with the client of every account, keyed by the name their results are
+            stored under, defaults to :data:`DEFAULT_TASKS`.
+        :param max_workers: The maximum number of logins and tasks running at once, also the size of the shared
+            connection pool.
+        :param rate_limit: The maximum number of requests sent per second by all the accounts together, defaults
+            to the rate limit of ``transport``.
+        :param burst: The number of requests which may be sent at once before the rate limit applies.
+        :param transport: The timeouts and retries applied to every request.
+        :param session: An existing session to share between the accounts. The session is not closed by the runner.
+        :param token_store: The store to reuse the JWT tokens of the accounts from between runs.
+        :param cache: The cache to store the responses of every account in.
+        :param disk_cache: The cache to persist video links and test solutions in between runs.
+        :param instrumentation: The hooks notified of the requests of every account.
+        :param base_url: The url Allen's API is served from.
+        """
+        if tasks is None:
+            tasks = DEFAULT_TASKS
+        if rate_limit is None and transport is not None and transport.rate_limit is not None:
+            rate_limit, burst = transport.rate_limit, transport.burst
+
+        self.tasks = dict(tasks)
+        self.max_workers = max_workers
+        self.transport = transport
+        self.rate_limiter = TokenBucket(rate_limit, burst) if rate_limit is not None else None
+        self.token_store = token_store
+        self.cache = cache
+        self.disk_cache = disk_cache
+        self.instrumentation = instrumentation
+        self.base_url = base_url
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            self._owns_session = True
+        else:
+            self._owns_session = False
+        self.session = session
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        Close the shared connections, unless the session was passed to the runner.
+        """
+        if self._owns_session:
+            self.session.close()
+
+    def login(self, account: Account) -> AllenClient:
+        """
+        Create the client of an account, logging in unless a JWT token is known.
+
+        :param account: The account to log into.
+        :return: The client of the account, sharing the session and rate limit of the runner.
+        """
+        return AllenClient(username=account.username, password=account.password, jwt=account.jwt,
+                           session=self.session, pool_maxsize=self.max_workers, token_store=self.token_store,
+                           cache=self.cache, disk_cache=self.disk_cache, transport=self.transport,
+                           rate_limiter=self.rate_limiter, instrumentation=self.instrumentation,
+                           base_url=self.base_url)
+
+    def run(self, accounts: Iterable[Union[Account, str, Tuple[str, str]]]) -> Iterator[AccountResult]:
+        """
+        Log into every account and run the tasks on each of them.
+
+        :param accounts: The accounts, JWT tokens or ``(username, password)`` tuples.
+        :return: An iterator over the class:`AccountResult` class, in the order the accounts finish.
+        """
+        accounts = iter(accounts)
+        futures: Dict[Future, Tuple[_Job, Optional[str]]] = {}
+        exhausted = False
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            try:
+                while True:
+                    # Keep the pool busy without reading every account up front.
+                    while not exhausted and len(futures) < 2 * self.max_workers:
+                        account = next(accounts, None)
+                        if account is None:
+                            exhausted = True
+                            break
+                        job = _Job(Account.of(account))
+                        futures[executor.submit(self.login, job.account)] = (job, None)
+
+                    if not futures:
+                        return
+
+                    done, _ = wait(list(futures), return_when=FIRST_COMPLETED)
+                    for future in done:
+                        job, task = futures.pop(future)
+                        error = future.exception()
+
+                        if task is None:
+                            if error is not None or not self.tasks:
+                                yield job.result(error)
+                                continue
+                            job.client = future.result()
+                            job.pending = len(self.tasks)
+                            for name, func in self.tasks.items():
+                                futures[executor.submit(func, job.client)] = (job, name)
+                            continue
+
+                        if error is None:
+                            job.results[task] = future.result()
+                        else:
+                            job.errors[task] = error
+                        job.pending -= 1
+                        if job.pending == 0:
+                            yield job.result()
+            finally:
+                for future in futures:
+                    future.cancel()
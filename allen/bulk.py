@@ -0,0 +1,71 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, List, Optional
+
+__all__ = ['LinkResult', 'SolutionResult']
+
+
+@dataclass(frozen=True)
+class LinkResult:
+    video: Any
+    '''The video the link was resolved for'''
+
+    link: Optional[str]
+    '''The link of the video, None if the link could not be resolved'''
+
+    error: Optional[Exception]
+    '''The exception raised while resolving the link, None if the link was resolved'''
+
+    @property
+    def ok(self) -> bool:
+        """
+        Specify whether the link was resolved successfully.
+        """
+        return self.error is None
+
+
+@dataclass(frozen=True)
+class SolutionResult:
+    test_record: Any
+    '''The test the solutions were fetched for'''
+
+    paper_no: int
+    '''The number of the paper of the test'''
+
+    solutions: Optional[list]
+    '''The list of the class:`solution.SubjectSolution` class, None if the solutions could not be fetched'''
+
+    error: Optional[Exception]
+    '''The exception raised while fetching the solutions, None if the solutions were fetched'''
+
+    @property
+    def ok(self) -> bool:
+        """
+        Specify whether the solutions were fetched successfully.
+        """
+        return self.error is None
+
+
+def map_ordered(func: Callable, items: Iterable, max_workers: int) -> List[tuple]:
+    """
+    Apply a function to every item on a bounded thread pool.
+
+    :param func: The function to apply to each item.
+    :param items: The items to apply the function to.
+    :param max_workers: The maximum number of threads used at once.
+    :return: A list of ``(result, error)`` tuples in the same order as the items.
+    :meta private:
+    """
+
+    def call(item):
+        try:
+            return func(item), None
+        except Exception as e:
+            return None, e
+
+    items = list(items)
+    if len(items) <= 1 or max_workers <= 1:
+        return [call(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(call, items))
@@ -0,0 +1,136 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+__all__ = ['ResponseCache', 'DEFAULT_TTLS']
+
+DEFAULT_TTLS = {
+    'dc/student/recordinglist': 300,
+    'dc/student/livelist': 60,
+    'studenttestrecord': 3600,
+    'studentexamcalendar': 3600,
+    'discussion/student/list': 3600
+}
+'''The default number of seconds each endpoint's response is cached for'''
+
+
+class ResponseCache:
+    """
+    An in-memory, size-bounded LRU cache for the responses of :meth:`allenclient.AllenClient.fetch_json`.
+
+    Each endpoint is cached for the number of seconds specified in ``ttls``.
+    Endpoints without a TTL are never cached.
+
+    .. note::
+
+        The cached responses are shared between callers and must not be modified.
+    """
+
+    def __init__(self, ttls: Dict[str, float] = None, default_ttl: float = 0, max_entries: int = 256,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        :param ttls: A dict mapping the url path of an endpoint to the number of seconds it is cached for.
+        :param default_ttl: The number of seconds endpoints missing from ``ttls`` are cached for.
+        :param max_entries: The maximum number of responses kept, the least recently used are evicted first.
+        :param clock: The function returning the current time in seconds.
+        """
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def ttl_for(self, url_path: str) -> float:
+        """
+        :param url_path: The url path of the endpoint.
+        :return: The number of seconds the endpoint's response is cached for.
+        """
+        return self.ttls.get(url_path.strip('/'), self.default_ttl)
+
+    @staticmethod
+    def make_key(url_path: str, http_method: str, query_params: Optional[dict], post_data: Optional[dict],
+                 identity: str, base_url: str) -> tuple:
+        """
+        Build the cache key of a request.
+
+        :param url_path: The url path of the endpoint.
+        :param http_method: The http method of the request.
+        :param query_params: The url parameters of the request.
+        :param post_data: The post data of the request.
+        :param identity: A string identifying the account the request is sent for.
+        :param base_url: The url the request is sent to including its scheme, so that the responses of other
+            servers, such as a :class:`mock_server.MockAllenServer`, are kept apart.
+        :return: A hashable key.
+        """
+        return (
+            url_path.strip('/'),
+            http_method.upper(),
+            json.dumps(query_params or {}, sort_keys=True, default=str),
+            json.dumps(post_data or {}, sort_keys=True, default=str),
+            identity,
+            base_url.rstrip('/')
+        )
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        :param key: The key of the response.
+        :return: The cached response, or None if it is missing or expired.
+        """
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: float):
+        """
+        Cache a response, evicting the least recently used responses if the cache is full.
+
+        :param key: The key of the response.
+        :param value: The response to cache.
+        :param ttl: The number of seconds to cache the response for.
+        """
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (self._clock() + ttl, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, url_path: str = None, identity: str = None):
+        """
+        Remove cached responses.
+
+        :param url_path: Only remove the responses of this endpoint.
+        :param identity: Only remove the responses of this account.
+        """
+        with self._lock:
+            if url_path is None and identity is None:
+                self._entries.clear()
+                return
+
+            if url_path is not None:
+                url_path = url_path.strip('/')
+
+            for key in list(self._entries):
+                if (url_path is None or key[0] == url_path) and (identity is None or key[4] == identity):
+                    del self._entries[key]
@@ -1,16 +1,25 @@
 from typing import Optional
 
-from allen import AllenClient
-from allen.exceptions import AllenInvalidUsernamePassword, AllenInvalidResponse
 import pathlib
 import sys
 import json
 from termcolor import colored
 from platform import system
 import os
-import stdiomask
+from itertools import islice
+
+# The client and its dependencies are imported by the commands using them, so that ``allen help`` starts quickly.
 
 credentials_file = pathlib.Path.home() / '.allen_login_details'
+token_store_file = pathlib.Path.home() / '.allen_session'
+
+
+def get_token_store():
+    """
+    :return: The store of the JWT token reused between runs.
+    """
+    from allen.token_store import TokenStore
+    return TokenStore(token_store_file)
 
 
 def print_help():
@@ -41,8 +50,11 @@ def get_details(reset: bool = False) -> Optional[dict]:
     credentials: dict = {}
 
     if reset:
+        import stdiomask
+
         credentials['username'] = input('Please enter your Allen username (form number): ')
         credentials['password'] = stdiomask.getpass('Please enter your Allen password: ', mask='*')
+        get_token_store().clear()
 
         try:
             json.dump(credentials, open(credentials_file, 'w'))
@@ -91,8 +103,16 @@ def main():
     if credentials is None:
         return
 
+    from allen.allenclient import AllenClient
+    from allen.disk_cache import DiskCache
+    from allen.exceptions import AllenInvalidUsernamePassword, AllenInvalidResponse
+    from allen.utils import DEFAULT_BASE_URL
+
     try:
-        client = AllenClient(username=credentials['username'], password=credentials['password'])
+        # The links are kept in the disk cache, so that runs from cron jobs only fetch the links of new recordings.
+        client = AllenClient(username=credentials['username'], password=credentials['password'],
+                             token_store=get_token_store(), disk_cache=DiskCache(),
+                             base_url=os.environ.get('ALLEN_BASE_URL', DEFAULT_BASE_URL))
     except AllenInvalidUsernamePassword:
         print('The username and password combination entered is incorrect. Please reset your password using ' +
               colored('allen reset', 'yellow'))
@@ -104,6 +124,14 @@ def main():
         return
 
     if case == 'videos':
-        videos = client.get_recorded_videos()
-        for video in videos:
-            print(f'{video.subject_name} ({video.get_recording_date()}) - {video.get_link()}')
+        # Resolve the links in small batches so the first links are printed while the list is still received.
+        videos = client.iter_recorded_videos()
+        while True:
+            batch = list(islice(videos, 16))
+            if not batch:
+                break
+
+            for result in client.resolve_links(batch):
+                video = result.video
+                link = result.link if result.ok else colored('Failed to retrieve the link', 'red')
+                print(f'{video.subject_name} ({video.get_recording_date()}) - {link}', flush=True)
@@ -0,0 +1,77 @@
+import importlib
+import json
+from typing import Any, Callable, Union
+
+__all__ = ['BACKENDS', 'loads', 'get_decoder', 'set_decoder']
+
+BACKENDS = ('orjson', 'ujson', 'simdjson', 'json')
+'''The JSON libraries supported, in the order they are preferred'''
+
+_decoder = None
+_decoder_name = None
+
+
+def _load_backend(name: str) -> Callable[[bytes], Any]:
+    """
+    Import a JSON library and return its function decoding bytes.
+
+    :param name: The name of the library.
+    :return: The decoding function.
+    :raises ImportError: If the library is not installed.
+    """
+    if name == 'json':
+        return json.loads
+
+    module = importlib.import_module(name)
+    return module.loads
+
+
+def set_decoder(backend: Union[str, Callable[[bytes], Any], None] = None):
+    """
+    Set the JSON decoder used for every response.
+
+    :param backend: The name of a library in :data:`BACKENDS`, a function decoding bytes, or None to pick the
+        fastest library installed.
+    :raises ValueError: If the library is unknown.
+    :raises ImportError: If the library is not installed.
+    """
+    global _decoder, _decoder_name
+
+    if callable(backend):
+        _decoder, _decoder_name = backend, getattr(backend, '__module__', None) or repr(backend)
+        return
+
+    if backend is not None:
+        if backend not in BACKENDS:
+            raise ValueError(f'Unknown JSON backend {backend}, expected one of {", ".join(BACKENDS)}')
+        _decoder, _decoder_name = _load_backend(backend), backend
+        return
+
+    for name in BACKENDS:
+        try:
+            _decoder, _decoder_name = _load_backend(name), name
+            return
+        except ImportError:
+            continue
+
+
+def get_decoder() -> str:
+    """
+    :return: The name of the JSON library in use.
+    """
+    if _decoder is None:
+        set_decoder()
+    return _decoder_name
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Decode a JSON document straight from the bytes of a response.
+
+    :param data: The JSON document.
+    :return: The decoded object.
+    :raises ValueError: If the document is not valid JSON.
+    """
+    if _decoder is None:
+        set_decoder()
+    return _decoder(data)
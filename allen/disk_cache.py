@@ -0,0 +1,182 @@
+import json
+import os
+import pathlib
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Hashable, Optional, Union
+
+__all__ = ['DiskCache', 'default_cache_dir']
+
+
+def default_cache_dir() -> pathlib.Path:
+    """
+    :return: The directory the library stores its cache in for the current user.
+    """
+    if os.name == 'nt' and 'LOCALAPPDATA' in os.environ:
+        base = pathlib.Path(os.environ['LOCALAPPDATA'])
+    elif 'XDG_CACHE_HOME' in os.environ:
+        base = pathlib.Path(os.environ['XDG_CACHE_HOME'])
+    else:
+        base = pathlib.Path.home() / '.cache'
+
+    return base / 'allen-py-client'
+
+
+class DiskCache:
+    """
+    A persistent cache for responses which do not change between runs, such as video links and test solutions.
+
+    The responses are stored in a SQLite database which may be shared by several processes at once.
+    Expired responses are never returned and the least recently used responses are evicted once the cache
+    holds more than ``max_entries`` responses.
+
+    Every thread keeps its own connection to the database open. Reads only record the time a response was used in
+    memory, the times are written to the database by the next :meth:`set`, before responses are evicted.
+    """
+
+    MAX_PENDING_ACCESSES = 1024
+    '''The number of access times recorded in memory after which the next read writes them to the database'''
+
+    def __init__(self, path: Union[str, pathlib.Path] = None, ttl: float = 86400, max_entries: int = 10000,
+                 clock: Callable[[], float] = time.time):
+        """
+        :param path: The path of the database, defaults to ``cache.sqlite3`` in :func:`default_cache_dir`.
+        :param ttl: The number of seconds a response is kept for.
+        :param max_entries: The maximum number of responses kept.
+        :param clock: The function returning the current time in seconds.
+        """
+        if path is None:
+            path = default_cache_dir() / 'cache.sqlite3'
+
+        self.path = pathlib.Path(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+        self._accessed = {}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = self.__connection()
+        with connection:
+            # The journal mode is stored in the database, so it only needs to be set once.
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('CREATE TABLE IF NOT EXISTS entries ('
+                               'key TEXT PRIMARY KEY, value TEXT NOT NULL, '
+                               'expires_at REAL NOT NULL, accessed_at REAL NOT NULL)')
+            connection.execute('CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)')
+
+    def __len__(self):
+        return self.__connection().execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+    def __connection(self) -> sqlite3.Connection:
+        """
+        Get the connection of the current thread, opening it on first use. The connection waits for other processes
+        to release their locks.
+
+        :meta private:
+        """
+        local = self._local
+        connection = getattr(local, 'connection', None)
+        # Connections inherited from the parent of a forked process cannot be used.
+        if connection is None or local.pid != os.getpid():
+            connection = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            local.connection, local.pid = connection, os.getpid()
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def close(self):
+        """
+        Write the pending access times and close the connections of every thread.
+        The connections are opened again if the cache is used afterwards.
+        """
+        connection = self.__connection()
+        with connection:
+            self.__flush_accesses(connection)
+
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
+
+    @staticmethod
+    def _encode_key(key: Hashable) -> str:
+        """
+        :meta private:
+        """
+        return json.dumps(key, default=str)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        :param key: The key of the response.
+        :return: The cached response, or None if it is missing or expired.
+        """
+        key = self._encode_key(key)
+        now = self._clock()
+
+        connection = self.__connection()
+        row = connection.execute('SELECT value FROM entries WHERE key = ? AND expires_at > ?', (key, now)).fetchone()
+        if row is None:
+            return None
+
+        with self._lock:
+            self._accessed[key] = now
+            flush = len(self._accessed) >= self.MAX_PENDING_ACCESSES
+        if flush:
+            with connection:
+                self.__flush_accesses(connection)
+
+        return json.loads(row[0])
+
+    def set(self, key: Hashable, value: Any):
+        """
+        Store a response, evicting expired and least recently used responses if the cache is full.
+
+        :param key: The key of the response.
+        :param value: The JSON serializable response to store.
+        """
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return
+
+        key = self._encode_key(key)
+        now = self._clock()
+
+        connection = self.__connection()
+        with connection:
+            self.__flush_accesses(connection)
+            connection.execute('INSERT OR REPLACE INTO entries (key, value, expires_at, accessed_at) '
+                               'VALUES (?, ?, ?, ?)', (key, json.dumps(value), now + self.ttl, now))
+
+            count = connection.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+            if count > self.max_entries:
+                connection.execute('DELETE FROM entries WHERE expires_at <= ?', (now,))
+                connection.execute('DELETE FROM entries WHERE key IN '
+                                   '(SELECT key FROM entries ORDER BY accessed_at LIMIT '
+                                   'MAX(0, (SELECT COUNT(*) FROM entries) - ?))', (self.max_entries,))
+
+    def clear(self):
+        """
+        Remove every stored response.
+        """
+        with self._lock:
+            self._accessed.clear()
+
+        connection = self.__connection()
+        with connection:
+            connection.execute('DELETE FROM entries')
+
+    def __flush_accesses(self, connection: sqlite3.Connection):
+        """
+        Write the access times recorded by :meth:`get` inside the transaction of a connection.
+
+        :meta private:
+        """
+        with self._lock:
+            accessed, self._accessed = self._accessed, {}
+        if accessed:
+            connection.executemany('UPDATE entries SET accessed_at = MAX(accessed_at, ?) WHERE key = ?',
+                                   [(now, key) for key, now in accessed.items()])
@@ -0,0 +1,281 @@
+import json
+import os
+import pathlib
+import posixpath
+import re
+import threading
+from dataclasses import dataclass
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+from allen.bulk import map_ordered
+from allen.exceptions import AllenResponseUnavailable
+from allen.solution import SubjectSolution
+from allen.test_record import TestRecord
+from allen.utils import file_lock, write_json_atomic
+
+__all__ = ['DownloadResult', 'SolutionDownloader']
+
+
+_UNSAFE_CHARACTERS = re.compile(r'[/\\\x00-\x1f:<>"|?*]')
+
+
+def _path_component(value) -> str:
+    """
+    Turn a value received from the server into a single path component, which cannot name a parent directory or
+    contain separators or characters Windows does not allow in file names.
+
+    :meta private:
+    """
+    component = _UNSAFE_CHARACTERS.sub('_', str(value)).strip()
+    if component.strip('.') == '':
+        component = '_' * max(1, len(component))
+    return component
+
+
+@dataclass(frozen=True)
+class DownloadResult:
+    url: str
+    '''The url of the file, empty if the solutions of the test could not be fetched'''
+
+    path: pathlib.Path
+    '''The path the file is stored at, the directory of the test if its solutions could not be fetched'''
+
+    size: int
+    '''The number of bytes received, 0 if the file was skipped'''
+
+    skipped: bool
+    '''True if the file was already present and was not downloaded again'''
+
+    resumed: bool
+    '''True if the download continued a previously interrupted one'''
+
+    error: Optional[Exception]
+    '''The error raised while downloading the file, None if it was downloaded'''
+
+    @property
+    def ok(self) -> bool:
+        """
+        :return: True if the file is present on disk.
+        """
+        return self.error is None
+
+
+class SolutionDownloader:
+    """
+    Downloads the solution images of tests into a directory, at a bounded concurrency over the client's pooled
+    session. The downloads go through the client's transport, so its timeouts, retries and rate limit apply.
+
+    Every image is streamed to a ``.part`` file and only renamed to its final name once complete, so the files
+    present are always whole. An interrupted download is resumed with a ``Range`` request the next time, as long as
+    the image did not change in between. Files already present are skipped without a request, or revalidated
+    against their ``ETag`` if ``revalidate`` is True.
+
+    The images of a test are stored as ``<test id>/<subject>/<question number>.<extension>``, with separators,
+    characters Windows does not allow and names made only of dots replaced in each of those parts, so the server
+    cannot place files outside the directory.
+    """
+
+    MANIFEST = '.manifest.json'
+    '''The name of the file in the directory recording the size and ETag of every downloaded image'''
+
+    def __init__(self, client, directory: Union[str, pathlib.Path], max_workers: int = None,
+                 chunk_size: int = 65536, revalidate: bool = False):
+        """
+        :param client: The :class:`allenclient.AllenClient` to download through.
+        :param directory: The directory to store the images in.
+        :param max_workers: The maximum number of downloads at once, defaults to the connection pool size of the
+            client.
+        :param chunk_size: The number of bytes read from a response before being written to disk.
+        :param revalidate: Specify whether files already present are checked for changes with a conditional request.
+        """
+        if max_workers is None:
+            max_workers = client.pool_maxsize
+
+        self.client = client
+        self.directory = pathlib.Path(directory)
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.revalidate = revalidate
+        self._lock = threading.Lock()
+        self._manifest = None
+
+    def download(self, records: Iterable[TestRecord]) -> List[DownloadResult]:
+        """
+        Download the solution images of many tests.
+        The solutions of the tests are fetched concurrently, a test whose solutions cannot be fetched is reported by
+        a single failed result holding the error, in place of the results of its images.
+
+        :param records: The tests to download the images of.
+        :return: A list of the class:`DownloadResult` class, ordered by test, subject and question.
+        """
+        records = list(records)
+        solutions = map_ordered(lambda record: record.get_subject_solutions(), records, self.max_workers)
+
+        files, counts = [], []
+        for record, (subjects, error) in zip(records, solutions):
+            if error is None:
+                test_files = self.files_of(record._test_id, subjects)
+                files.extend(test_files)
+                counts.append(len(test_files))
+            else:
+                counts.append(None)
+
+        downloaded = iter(self.download_files(files))
+        results = []
+        for record, count, (subjects, error) in zip(records, counts, solutions):
+            if count is None:
+                results.append(DownloadResult('', self.directory / _path_component(record._test_id), 0, False, False,
+                                              error))
+            else:
+                results.extend(islice(downloaded, count))
+
+        return results
+
+    def download_test(self, record: TestRecord) -> List[DownloadResult]:
+        """
+        Download the solution images of a test.
+
+        :param record: The test to download the images of.
+        :return: A list of the class:`DownloadResult` class, ordered by subject and question.
+        """
+        return self.download_files(self.files_of(record._test_id, record.get_subject_solutions()))
+
+    def files_of(self, test_id: str, subjects: List[SubjectSolution]) -> List[Tuple[str, pathlib.Path]]:
+        """
+        :param test_id: The ID of the test.
+        :param subjects: The solutions of the test.
+        :return: The url and path of every image of the solutions.
+        :raises ValueError: If the path of an image is outside of the directory.
+        """
+        directory = self.directory.resolve()
+        files = []
+        for subject in subjects:
+            for solution in subject.solutions:
+                if not solution.image:
+                    continue
+                extension = posixpath.splitext(urlsplit(solution.image).path)[1] or '.png'
+                path = self.directory.joinpath(_path_component(test_id), _path_component(subject.subject_name),
+                                               _path_component(f'{solution.question_no}{extension}'))
+                if directory not in path.resolve().parents:
+                    raise ValueError(f'{path} is outside of {self.directory}')
+                files.append((solution.image, path))
+        return files
+
+    def download_files(self, files: Iterable[Tuple[str, pathlib.Path]]) -> List[DownloadResult]:
+        """
+        Download many files at once.
+
+        :param files: The url and path of every file.
+        :return: A list of the class:`DownloadResult` class in the same order as the files.
+        """
+        files = list(files)
+        try:
+            results = map_ordered(lambda file: self.__download(*file), files, self.max_workers)
+        finally:
+            self.__save_manifest()
+
+        return [result if error is None else DownloadResult(url, pathlib.Path(path), 0, False, False, error)
+                for (url, path), (result, error) in zip(files, results)]
+
+    def __download(self, url: str, path: pathlib.Path) -> DownloadResult:
+        """
+        Download a single file, resuming or skipping it where possible.
+
+        :meta private:
+        """
+        path = pathlib.Path(path)
+        try:
+            key = path.relative_to(self.directory).as_posix()
+        except ValueError:
+            key = str(path)
+        entry = self.__manifest().get(key)
+
+        headers = {}
+        if path.exists():
+            if entry is not None and entry.get('size') != path.stat().st_size:
+                path.unlink()
+            elif not self.revalidate or entry is None or not entry.get('etag'):
+                return DownloadResult(url, path, 0, True, False, None)
+            else:
+                headers['If-None-Match'] = entry['etag']
+
+        part_path = path.with_name(path.name + '.part')
+        etag_path = path.with_name(path.name + '.part.etag')
+        offset = part_path.stat().st_size if part_path.exists() else 0
+        if offset and 'If-None-Match' not in headers:
+            headers['Range'] = f'bytes={offset}-'
+            if etag_path.exists():
+                headers['If-Range'] = etag_path.read_text()
+
+        response = self.client.transport.request('GET', url, headers=headers, stream=True)
+        try:
+            if response.status_code == 304:
+                return DownloadResult(url, path, 0, True, False, None)
+
+            if response.status_code == 416:
+                # The partial file is not a prefix of the image anymore, start over.
+                part_path.unlink()
+                return self.__download(url, path)
+
+            if response.status_code not in (200, 206):
+                raise AllenResponseUnavailable(url, response)
+
+            resumed = response.status_code == 206
+            etag = response.headers.get('ETag')
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if etag:
+                etag_path.write_text(etag)
+
+            size = 0
+            with open(part_path, 'ab' if resumed else 'wb') as file:
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    file.write(chunk)
+                    size += len(chunk)
+        finally:
+            response.close()
+
+        os.replace(part_path, path)
+        if etag_path.exists():
+            etag_path.unlink()
+
+        with self._lock:
+            self._manifest[key] = {'size': path.stat().st_size, 'etag': etag}
+
+        return DownloadResult(url, path, size, False, resumed, None)
+
+    def __manifest(self) -> Dict[str, dict]:
+        """
+        Read the manifest on first use.
+
+        :meta private:
+        """
+        with self._lock:
+            if self._manifest is None:
+                try:
+                    with open(self.directory / self.MANIFEST, 'r') as file:
+                        self._manifest = json.load(file)
+                except (FileNotFoundError, json.JSONDecodeError):
+                    self._manifest = {}
+            return self._manifest
+
+    def __save_manifest(self):
+        """
+        Replace the manifest atomically, keeping the entries saved by other downloaders of the directory since it
+        was read.
+
+        :meta private:
+        """
+        with self._lock:
+            if self._manifest is None:
+                return
+
+            manifest_path = self.directory / self.MANIFEST
+            with file_lock(manifest_path):
+                try:
+                    with open(manifest_path, 'r') as file:
+                        manifest = json.load(file)
+                except (FileNotFoundError, json.JSONDecodeError):
+                    manifest = {}
+                manifest.update(self._manifest)
+                write_json_atomic(manifest_path, manifest)
@@ -1,12 +1,18 @@
 from dataclasses import dataclass
-from typing import Optional
+from allen.model import SlotsModel, DatedModel
+from typing import List, Optional
 from datetime import datetime
 
 __all__ = ['Examination']
 
 
 @dataclass(frozen=True, order=True)
-class Examination:
+class Examination(SlotsModel, DatedModel):
+    __slots__ = ('marking_scheme', 'syllabus', 'test_centre', 'test_day', 'test_name', 'time_detail',
+                 '_test_date', '_parsed_date', '_formatted_date')
+
+    _date_slot = '_test_date'
+
     marking_scheme: str
     '''The marking scheme of the examination, for example ``JEE MAIN. PATTERN``'''
 
@@ -46,13 +52,27 @@ class Examination:
 
         return Examination(marking_scheme, syllabus, test_centre, test_day, test_name, time_detail, test_date)
 
+    @classmethod
+    def from_json_many(cls, json_list: List[dict]) -> List['Examination']:
+        """
+        Deserialize a list of exam json dicts with :meth:`from_json`.
+
+        :param json_list: The json dictionaries to deserialize.
+        :meta private:
+        """
+        return [Examination.from_json(json_obj) for json_obj in json_list]
+
+    @property
+    def test_date(self) -> Optional[datetime]:
+        """
+        The date the examination was or will be held, None if the date is invalid. The date is only parsed once.
+        """
+        return self._get_parsed_date()
+
     def get_test_date(self) -> Optional[str]:
         """
         Returns the date of the test in ``Thursday : 01 January 1970`` format.
 
         :return: The date if a valid date is present, else None.
         """
-        try:
-            return datetime.fromisoformat(self._test_date).strftime('%A : %d %B %Y')
-        except ValueError:
-            return None
+        return self._get_formatted_date()
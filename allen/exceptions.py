@@ -1,6 +1,7 @@
 import requests
 
-__all__ = ['AllenInvalidUsernamePassword', 'AllenInvalidResponse', 'AllenResponseUnavailable']
+__all__ = ['AllenInvalidUsernamePassword', 'AllenInvalidResponse', 'AllenResponseUnavailable', 'AllenConnectionError',
+           'AllenClientNotBound']
 
 
 class AllenInvalidUsernamePassword(Exception):
@@ -9,7 +10,7 @@ class AllenInvalidUsernamePassword(Exception):
     """
 
     def __init__(self):
-        super().__init__(self)
+        super().__init__()
 
     def __str__(self):
         return 'Invalid username or password entered'
@@ -21,7 +22,7 @@ class AllenResponseUnavailable(Exception):
     """
 
     def __init__(self, url: str, response: requests.Response):
-        super().__init__(self)
+        super().__init__()
         self._url = url
         self._response = response
 
@@ -36,10 +37,40 @@ class AllenInvalidResponse(Exception):
     """
 
     def __init__(self, response: requests.Response):
-        super().__init__(self)
+        super().__init__()
         self._response = response
 
     def __str__(self):
         status_code = self._response.status_code
         url = self._response.request.url
         return f'{url} (Status Code : {status_code})'
+
+
+class AllenConnectionError(Exception):
+    """
+    Exception representing a request which could not be completed because of a connection failure or timeout.
+    """
+
+    def __init__(self, url: str, error: Exception):
+        super().__init__()
+        self._url = url
+        self._error = error
+
+    def __str__(self):
+        return f'{self._url} : ({type(self._error).__name__}: {self._error})'
+
+
+class AllenClientNotBound(Exception):
+    """
+    Exception representing an object fetching more data without a synchronous client to fetch it through, such as
+    an object received from an :class:`asyncclient.AsyncAllenClient`.
+    """
+
+    def __init__(self, model: str, async_method: str):
+        super().__init__()
+        self._model = model
+        self._async_method = async_method
+
+    def __str__(self):
+        return (f'{self._model} is not bound to an AllenClient, fetch it through the AsyncAllenClient it was '
+                f'received from with: await client.{self._async_method}(...)')
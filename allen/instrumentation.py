@@ -0,0 +1,349 @@
+import bisect
+import threading
+import time
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+__all__ = ['RequestTrace', 'Instrumentation', 'Histogram', 'Metrics', 'PrometheusInstrumentation',
+           'OpenTelemetryInstrumentation', 'DEFAULT_BUCKETS', 'PHASES']
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+'''The upper bounds in seconds of the latency histogram buckets'''
+
+PHASES = ('ttfb', 'download', 'decode', 'total')
+'''The phases of a request whose latency is recorded'''
+
+
+class RequestTrace:
+    """
+    The timings and outcome of a request to Allen's API, filled in as the request progresses and passed to the
+    hooks of an :class:`Instrumentation`.
+
+    The timings are in seconds and None for the phases the request did not reach. The time to first byte includes
+    resolving the host and connecting to it whenever the request could not reuse a pooled connection.
+    """
+
+    __slots__ = ('endpoint', 'method', 'status', 'attempts', 'bytes', 'ttfb', 'download', 'decode', 'total',
+                 'error', 'started')
+
+    def __init__(self, endpoint: str, method: str):
+        """
+        :param endpoint: The path of the endpoint, for example ``dc/student/recordinglist``.
+        :param method: The http method of the request.
+        """
+        self.endpoint = endpoint
+        self.method = method
+        self.status: Optional[int] = None
+        self.attempts = 0
+        self.bytes = 0
+        self.ttfb: Optional[float] = None
+        self.download: Optional[float] = None
+        self.decode: Optional[float] = None
+        self.total: Optional[float] = None
+        self.error: Optional[BaseException] = None
+        self.started = time.perf_counter()
+
+    def finish(self, error: BaseException = None):
+        """
+        Record the total duration and the error the request failed with.
+
+        :meta private:
+        """
+        self.total = time.perf_counter() - self.started
+        if error is not None:
+            self.error = error
+
+    def phases(self) -> Iterable[Tuple[str, float]]:
+        """
+        :return: The name and duration of every phase the request reached.
+        """
+        for phase in PHASES:
+            value = getattr(self, phase)
+            if value is not None:
+                yield phase, value
+
+    def __repr__(self):
+        return (f'RequestTrace(endpoint={self.endpoint!r}, method={self.method!r}, status={self.status!r}, '
+                f'attempts={self.attempts!r}, bytes={self.bytes!r}, total={self.total!r}, error={self.error!r})')
+
+
+class Instrumentation:
+    """
+    Receives the events of a client's requests, for example to export metrics.
+    Subclass it and override the hooks of interest, every hook does nothing by default.
+
+    The hooks are called from the threads sending the requests and must therefore be thread-safe. A client without
+    instrumentation does not create traces or call any hook.
+    """
+
+    def request_started(self, trace: RequestTrace):
+        """
+        Called before a request is sent, including the requests logging in.
+
+        :param trace: The trace of the request, only its endpoint and method are known.
+        """
+
+    def request_finished(self, trace: RequestTrace):
+        """
+        Called once a request succeeded or failed.
+
+        :param trace: The trace of the request, its ``error`` is set if it failed.
+        """
+
+    def retried(self, trace: RequestTrace, reason: str):
+        """
+        Called before an attempt of a request is retried.
+
+        :param trace: The trace of the request.
+        :param reason: The status code or the name of the exception of the failed attempt.
+        """
+
+    def cache_lookup(self, endpoint: str, layer: str, hit: bool):
+        """
+        Called after a response was looked up in a cache.
+
+        :param endpoint: The path of the endpoint.
+        :param layer: The cache looked up, ``memory`` or ``disk``.
+        :param hit: True if the response was found.
+        """
+
+
+class Histogram:
+    """
+    A histogram of durations with fixed buckets.
+    """
+
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        :param buckets: The upper bounds of the buckets in ascending order.
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        """
+        Record a duration.
+
+        :param value: The duration in seconds.
+        """
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile by interpolating inside the bucket holding it.
+
+        :param q: The quantile, between 0 and 1.
+        :return: The estimated duration, None if nothing was recorded. Durations past the last bucket are
+            estimated as its upper bound.
+        """
+        if self.count == 0:
+            return None
+
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                return lower + (self.buckets[index] - lower) * (rank - cumulative) / count
+            cumulative += count
+
+        return self.buckets[-1]
+
+
+class Metrics(Instrumentation):
+    """
+    Collects per endpoint latency histograms and counters in memory, the simplest way to see where the time of a
+    client goes without a monitoring system.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        :param buckets: The upper bounds in seconds of the histogram buckets.
+        """
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self.latencies: Dict[Tuple[str, str], Histogram] = {}
+        '''The histogram of every endpoint and phase'''
+        self.counters: Dict[Tuple[str, str], int] = {}
+        '''The requests, bytes, retries, errors, cache hits and cache misses of every endpoint'''
+
+    def request_finished(self, trace: RequestTrace):
+        with self._lock:
+            for phase, value in trace.phases():
+                histogram = self.latencies.get((trace.endpoint, phase))
+                if histogram is None:
+                    histogram = self.latencies[(trace.endpoint, phase)] = Histogram(self.buckets)
+                histogram.observe(value)
+
+            self.__add(trace.endpoint, 'requests', 1)
+            self.__add(trace.endpoint, 'bytes', trace.bytes)
+            if trace.error is not None:
+                self.__add(trace.endpoint, 'errors', 1)
+
+    def retried(self, trace: RequestTrace, reason: str):
+        with self._lock:
+            self.__add(trace.endpoint, 'retries', 1)
+
+    def cache_lookup(self, endpoint: str, layer: str, hit: bool):
+        with self._lock:
+            self.__add(endpoint, 'cache_hits' if hit else 'cache_misses', 1)
+
+    def counter(self, endpoint: str, name: str) -> int:
+        """
+        :param endpoint: The path of the endpoint.
+        :param name: The name of the counter.
+        :return: The value of the counter of an endpoint.
+        """
+        with self._lock:
+            return self.counters.get((endpoint, name), 0)
+
+    def summary(self) -> Dict[str, dict]:
+        """
+        :return: A dict mapping every endpoint to its counters and the median and 99th percentile of every phase.
+        """
+        summary = {}
+        with self._lock:
+            for (endpoint, name), value in self.counters.items():
+                summary.setdefault(endpoint, {})[name] = value
+            for (endpoint, phase), histogram in self.latencies.items():
+                summary.setdefault(endpoint, {})[phase] = {'p50': histogram.quantile(0.5),
+                                                           'p99': histogram.quantile(0.99),
+                                                           'count': histogram.count, 'sum': histogram.sum}
+        return summary
+
+    def reset(self):
+        """
+        Forget everything recorded.
+        """
+        with self._lock:
+            self.latencies.clear()
+            self.counters.clear()
+
+    def __add(self, endpoint: str, name: str, value: int):
+        """
+        :meta private:
+        """
+        self.counters[(endpoint, name)] = self.counters.get((endpoint, name), 0) + value
+
+
+class PrometheusInstrumentation(Instrumentation):
+    """
+    Exports the requests of a client as Prometheus metrics:
+
+    - ``<namespace>_request_duration_seconds``, a histogram labelled by ``endpoint`` and ``phase``
+    - ``<namespace>_requests_total``, labelled by ``endpoint`` and ``status``
+    - ``<namespace>_response_bytes_total``, ``<namespace>_retries_total`` and ``<namespace>_errors_total``
+    - ``<namespace>_cache_lookups_total``, labelled by ``endpoint``, ``layer`` and ``result``
+
+    .. note::
+
+        Requires the ``prometheus_client`` package, install it using ``pip install allen-py-client[prometheus]``.
+    """
+
+    def __init__(self, registry=None, namespace: str = 'allen', buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        :param registry: The ``CollectorRegistry`` to register the metrics in, defaults to the global registry.
+        :param namespace: The prefix of the metric names.
+        :param buckets: The upper bounds in seconds of the histogram buckets.
+        """
+        try:
+            import prometheus_client
+        except ImportError:
+            raise ImportError('PrometheusInstrumentation requires prometheus_client, install it using '
+                              'pip install allen-py-client[prometheus]') from None
+
+        if registry is None:
+            registry = prometheus_client.REGISTRY
+
+        self._duration = prometheus_client.Histogram(
+            'request_duration_seconds', 'The duration of every phase of the requests to Allen\'s API',
+            ['endpoint', 'phase'], namespace=namespace, buckets=buckets, registry=registry)
+        self._requests = prometheus_client.Counter(
+            'requests', 'The requests sent to Allen\'s API', ['endpoint', 'status'], namespace=namespace,
+            registry=registry)
+        self._bytes = prometheus_client.Counter(
+            'response_bytes', 'The bytes received from Allen\'s API', ['endpoint'], namespace=namespace,
+            registry=registry)
+        self._retries = prometheus_client.Counter(
+            'retries', 'The attempts retried', ['endpoint', 'reason'], namespace=namespace, registry=registry)
+        self._errors = prometheus_client.Counter(
+            'errors', 'The requests which failed', ['endpoint', 'error'], namespace=namespace, registry=registry)
+        self._cache = prometheus_client.Counter(
+            'cache_lookups', 'The responses looked up in a cache', ['endpoint', 'layer', 'result'],
+            namespace=namespace, registry=registry)
+
+    def request_finished(self, trace: RequestTrace):
+        for phase, value in trace.phases():
+            self._duration.labels(trace.endpoint, phase).observe(value)
+
+        self._requests.labels(trace.endpoint, str(trace.status)).inc()
+        if trace.bytes:
+            self._bytes.labels(trace.endpoint).inc(trace.bytes)
+        if trace.error is not None:
+            self._errors.labels(trace.endpoint, type(trace.error).__name__).inc()
+
+    def retried(self, trace: RequestTrace, reason: str):
+        self._retries.labels(trace.endpoint, reason).inc()
+
+    def cache_lookup(self, endpoint: str, layer: str, hit: bool):
+        self._cache.labels(endpoint, layer, 'hit' if hit else 'miss').inc()
+
+
+class OpenTelemetryInstrumentation(Instrumentation):
+    """
+    Records the requests of a client with OpenTelemetry metric instruments:
+
+    - ``allen.request.duration``, a histogram in seconds with the ``endpoint`` and ``phase`` attributes
+    - ``allen.requests``, with the ``endpoint`` and ``status`` attributes
+    - ``allen.response.bytes``, ``allen.retries`` and ``allen.errors``
+    - ``allen.cache.lookups``, with the ``endpoint``, ``layer`` and ``result`` attributes
+
+    .. note::
+
+        Requires the ``opentelemetry-api`` package unless a meter is passed, install it using
+        ``pip install allen-py-client[opentelemetry]``.
+    """
+
+    def __init__(self, meter=None):
+        """
+        :param meter: The ``Meter`` to create the instruments with, defaults to the meter named ``allen`` of the
+            global meter provider.
+        """
+        if meter is None:
+            try:
+                from opentelemetry import metrics
+            except ImportError:
+                raise ImportError('OpenTelemetryInstrumentation requires opentelemetry-api, install it using '
+                                  'pip install allen-py-client[opentelemetry]') from None
+            meter = metrics.get_meter('allen')
+
+        self._duration = meter.create_histogram('allen.request.duration', unit='s',
+                                                description='The duration of every phase of the requests')
+        self._requests = meter.create_counter('allen.requests', description='The requests sent')
+        self._bytes = meter.create_counter('allen.response.bytes', unit='By', description='The bytes received')
+        self._retries = meter.create_counter('allen.retries', description='The attempts retried')
+        self._errors = meter.create_counter('allen.errors', description='The requests which failed')
+        self._cache = meter.create_counter('allen.cache.lookups', description='The responses looked up in a cache')
+
+    def request_finished(self, trace: RequestTrace):
+        for phase, value in trace.phases():
+            self._duration.record(value, {'endpoint': trace.endpoint, 'phase': phase})
+
+        self._requests.add(1, {'endpoint': trace.endpoint, 'status': str(trace.status)})
+        if trace.bytes:
+            self._bytes.add(trace.bytes, {'endpoint': trace.endpoint})
+        if trace.error is not None:
+            self._errors.add(1, {'endpoint': trace.endpoint, 'error': type(trace.error).__name__})
+
+    def retried(self, trace: RequestTrace, reason: str):
+        self._retries.add(1, {'endpoint': trace.endpoint, 'reason': reason})
+
+    def cache_lookup(self, endpoint: str, layer: str, hit: bool):
+        self._cache.add(1, {'endpoint': endpoint, 'layer': layer, 'result': 'hit' if hit else 'miss'})
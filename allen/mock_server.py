@@ -0,0 +1,449 @@
+"""
+A local stand-in for Allen's API serving generated fixtures, used to test and benchmark the client without a network.
+
+Run it from a command line::
+
+    $ python -m allen.mock_server --port 8080 --latency 0.05 --error-rate 0.01
+
+and point a client at it::
+
+    client = AllenClient(username='1234', password='password', base_url='http://127.0.0.1:8080')
+"""
+import argparse
+import base64
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+__all__ = ['MockAllenServer', 'generate_fixtures', 'make_recordings', 'make_live_classes', 'make_test_records',
+           'make_solution', 'make_exams', 'make_addons']
+
+SUBJECTS = ['Physics', 'Chemistry', 'Maths', 'Biology']
+RESPONSES = ['A', 'B', 'C', 'D', '']
+START_DATE = datetime(2021, 4, 1)
+
+
+def _code(rng: random.Random) -> str:
+    return '%032x' % rng.getrandbits(128)
+
+
+def make_recordings(days: int, per_day: int = 4, seed: int = 0) -> list:
+    """
+    :return: The ``data`` of ``dc/student/recordinglist`` holding ``days * per_day`` recordings.
+    """
+    rng = random.Random(seed)
+    return [{
+        'ClassDate': (START_DATE + timedelta(days=day)).isoformat(),
+        'listClass': [{'UniqueCode': _code(rng), 'SubjectName': rng.choice(SUBJECTS)} for _ in range(per_day)]
+    } for day in range(days)]
+
+
+def make_live_classes(days: int = 3, per_day: int = 3, seed: int = 0) -> list:
+    """
+    :return: The ``data`` of ``dc/student/livelist``.
+    """
+    rng = random.Random(seed)
+    live_days = []
+    for day in range(days):
+        date = START_DATE + timedelta(days=day)
+        live_days.append({
+            'ClassDay': date.strftime('%A'),
+            'ClassDate': date.isoformat(),
+            'listClass': [{
+                'ClassStart': f'{9 + slot * 2:02d}:00AM',
+                'ClassEnd': f'{10 + slot * 2:02d}:30AM',
+                'UniqueCode': _code(rng),
+                'SubjectName': rng.choice(SUBJECTS),
+                'RemainingTime': (day * 24 + slot * 2) * 3600
+            } for slot in range(per_day)]
+        })
+    return live_days
+
+
+def make_test_records(tests: int, seed: int = 0) -> dict:
+    """
+    :return: The ``data`` of ``studenttestrecord`` holding ``tests`` tests. Tests without biology marks use ``-``.
+    """
+    rng = random.Random(seed)
+    test_list = []
+    for test in range(tests):
+        marks = {subject: rng.randint(0, 100) for subject in SUBJECTS}
+        medical = test % 2 == 1
+        bio = marks['Biology'] if medical else '-'
+        maths = '-' if medical else marks['Maths']
+        total = sum(mark for mark in (bio, marks['Physics'], marks['Chemistry'], maths) if mark != '-')
+
+        test_list.append({
+            'Bio': str(bio),
+            'Phy': str(marks['Physics']),
+            'Chem': str(marks['Chemistry']),
+            'Math': str(maths),
+            'Total': str(total),
+            'Per': f'{total / 3:.2f}',
+            'Rank': str(rng.randint(1, 5000)),
+            'TestName': f'JEE ENTHUSE INTERNAL TEST-{test + 1:02d}-PAPER 1',
+            'TestDate': (START_DATE + timedelta(days=7 * test)).isoformat(),
+            'TestID': str(1000 + test)
+        })
+    return {'testList': test_list}
+
+
+def make_solution(test_id: str, paper_no: int = 1, questions: int = 30, image_url: str = '/images',
+                  seed: int = 0) -> dict:
+    """
+    :return: The ``data`` of ``GetTestSolution`` for a test, with ``questions`` questions per subject.
+    """
+    rng = random.Random(f'{seed}-{test_id}-{paper_no}')
+    subjects = []
+    for subject in SUBJECTS[:3]:
+        subjects.append({
+            'SubjectName': subject.upper(),
+            'QTo': questions,
+            'listQuestion': [{
+                'QuestionNo': number,
+                'Response': rng.choice(RESPONSES),
+                'SolutionImage': f'{image_url}/{test_id}/{paper_no}/{subject.lower()}-{number}.png'
+            } for number in range(1, questions + 1)]
+        })
+    return {'listPaper': [{'PaperNo': paper_no, 'listSubject': subjects}]}
+
+
+def make_exams(exams: int = 5) -> list:
+    """
+    :return: The ``data`` of ``studentexamcalendar``.
+    """
+    return [{
+        'MarkingScheme': 'JEE MAIN. PATTERN',
+        'Syllabus': f'Unit {exam + 1}',
+        'TestCentre': 'Kota',
+        'TestDay': (START_DATE + timedelta(days=7 * exam)).strftime('%A'),
+        'TestName': f'JEE ENTHUSE INTERNAL TEST-{exam + 1:02d}',
+        'TimeDetail': '09:00AM - 12:00PM',
+        'TestDate': (START_DATE + timedelta(days=7 * exam)).isoformat()
+    } for exam in range(exams)]
+
+
+def make_addons(chapters: int = 3, per_chapter: int = 4, seed: int = 0) -> list:
+    """
+    :return: The ``data`` of ``discussion/student/list``.
+    """
+    rng = random.Random(seed)
+    return [{
+        'SubjectName': subject,
+        'listChapter': [{
+            'ChapterName': f'{subject} Chapter {chapter + 1}',
+            'listClass': [{'UniqueCode': _code(rng), 'ModuleNo': str(module + 1)} for module in range(per_chapter)]
+        } for chapter in range(chapters)]
+    } for subject in SUBJECTS[:3]]
+
+
+def generate_fixtures(recording_days: int = 30, tests: int = 10, seed: int = 0) -> Dict[str, object]:
+    """
+    Generate the ``data`` of every listing endpoint.
+
+    :param recording_days: The number of days of recordings, four recordings are generated per day.
+    :param tests: The number of tests attempted.
+    :param seed: The seed of the generated values.
+    :return: A dict mapping the url path of each endpoint to its ``data``.
+    """
+    return {
+        'dc/student/recordinglist': make_recordings(recording_days, seed=seed),
+        'dc/student/livelist': make_live_classes(seed=seed),
+        'studenttestrecord': make_test_records(tests, seed=seed),
+        'studentexamcalendar': make_exams(),
+        'discussion/student/list': make_addons(seed=seed)
+    }
+
+
+def make_jwt(subject: str, lifetime: float = 3600) -> str:
+    """
+    :return: An unsigned JWT token with an expiry time, as issued by the mock server.
+    """
+    def encode(part: dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(part).encode('utf-8')).decode('ascii').rstrip('=')
+
+    payload = {'sub': subject, 'exp': int(time.time() + lifetime), 'jti': _code(random.Random())}
+    return f'{encode({"alg": "none", "typ": "JWT"})}.{encode(payload)}.'
+
+
+class MockAllenServer:
+    """
+    A threaded HTTP server imitating Allen's API, including login, OTP verification and error responses.
+
+    Example::
+
+        with MockAllenServer(latency=0.01) as server:
+            client = AllenClient(username='1234', password='password', base_url=server.base_url)
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, fixtures: Dict[str, object] = None,
+                 latency: float = 0, jitter: float = 0, error_rate: float = 0, throttle_rate: float = 0,
+                 require_otp: bool = False, token_lifetime: float = 3600, accounts: Dict[str, str] = None,
+                 seed: int = 0):
+        """
+        :param host: The host to listen on.
+        :param port: The port to listen on, a free port is picked if 0.
+        :param fixtures: The ``data`` of each listing endpoint, defaults to :func:`generate_fixtures`.
+        :param latency: The number of seconds every response is delayed by.
+        :param jitter: The maximum number of seconds randomly added to the latency.
+        :param error_rate: The fraction of API requests answered with ``HTTP 500``.
+        :param throttle_rate: The fraction of API requests answered with ``HTTP 429`` and a ``Retry-After`` header.
+        :param require_otp: Specify whether logging in requires the OTP verification step.
+        :param token_lifetime: The number of seconds the issued JWT tokens are valid for.
+        :param accounts: A dict mapping usernames to passwords, any non empty credentials are accepted if not
+            specified.
+        :param seed: The seed of the generated fixtures and injected errors.
+        """
+        self.fixtures = generate_fixtures(seed=seed) if fixtures is None else fixtures
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.require_otp = require_otp
+        self.token_lifetime = token_lifetime
+        self.accounts = accounts
+        self.seed = seed
+
+        self.tokens = set()
+        self.request_counts = {}
+        self.logins = 0
+        self.images = {}
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._server = ThreadingHTTPServer((host, port), self.__make_handler())
+        self._server.daemon_threads = True
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    @property
+    def base_url(self) -> str:
+        """
+        The url to pass to the client as ``base_url``.
+        """
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        """
+        Serve requests on a background thread.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop serving requests and close the socket.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def serve_forever(self):
+        """
+        Serve requests on the current thread until interrupted.
+        """
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def issue_token(self, username: str = 'mock') -> str:
+        """
+        :return: A new JWT token accepted by the server.
+        """
+        jwt = make_jwt(username, self.token_lifetime)
+        with self._lock:
+            self.tokens.add(jwt)
+        return jwt
+
+    def revoke_tokens(self):
+        """
+        Reject every token issued so far, so the clients have to log in again.
+        """
+        with self._lock:
+            self.tokens.clear()
+
+    def image(self, path: str) -> bytes:
+        """
+        :return: The deterministic content of the solution image at a path.
+        """
+        content = self.images.get(path)
+        if content is None:
+            digest = hashlib.sha256(path.encode('utf-8')).digest()
+            content = b'\x89PNG\r\n\x1a\n' + digest * 256
+            self.images[path] = content
+        return content
+
+    def handle(self, method: str, path: str, headers: dict, body: Optional[dict]) -> tuple:
+        """
+        Answer a request.
+
+        :return: A tuple of the status code, the response headers and the response body.
+        """
+        with self._lock:
+            self.request_counts[path] = self.request_counts.get(path, 0) + 1
+            roll = self._rng.random()
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0)
+
+        if delay > 0:
+            time.sleep(delay)
+
+        if path.startswith('/images/'):
+            return self.__image_response(path, headers)
+
+        if path == '/oauth2/astoken':
+            return self.__login(body)
+        if path == '/oauth2/verifyotp':
+            return self.__verify_otp(body)
+
+        if not path.startswith('/api/'):
+            return 404, {}, {'data': None}
+
+        if roll < self.throttle_rate:
+            return 429, {'Retry-After': '1'}, {'data': None, 'error': 'True'}
+        if roll < self.throttle_rate + self.error_rate:
+            return 500, {}, {'data': None, 'error': 'True'}
+
+        authorization = headers.get('Authorization', '')
+        if authorization[len('Bearer '):] not in self.tokens:
+            return 401, {}, {'data': None, 'error': 'True'}
+
+        return 200, {}, {'data': self.__data(path[len('/api/'):], body or {}), 'error': 'False'}
+
+    def __image_response(self, path: str, headers: dict) -> tuple:
+        """
+        Answer a request for a solution image, honouring the ``If-None-Match``, ``Range`` and ``If-Range`` headers.
+        """
+        content = self.image(path)
+        etag = '"' + hashlib.sha256(content).hexdigest()[:32] + '"'
+        response_headers = {'Content-Type': 'image/png', 'ETag': etag, 'Accept-Ranges': 'bytes'}
+
+        if headers.get('If-None-Match') == etag:
+            return 304, response_headers, b''
+
+        match = re.fullmatch(r'bytes=(\d+)-', headers.get('Range', ''))
+        if match is None or headers.get('If-Range', etag) != etag:
+            return 200, response_headers, content
+
+        start = int(match.group(1))
+        if start >= len(content):
+            return 416, {'Content-Range': f'bytes */{len(content)}'}, b''
+
+        response_headers['Content-Range'] = f'bytes {start}-{len(content) - 1}/{len(content)}'
+        return 206, response_headers, content[start:]
+
+    def __data(self, endpoint: str, body: dict):
+        """
+        :return: The ``data`` of an API endpoint.
+        """
+        if endpoint in ('dc/student/recordingplayer', 'discussion/student/player'):
+            kind = 'recording' if endpoint.startswith('dc/') else 'addon'
+            return {'ClassURL': f'https://videos.example.com/{kind}/{body.get("UniqueCode")}/index.m3u8'}
+
+        if endpoint == 'GetTestSolution':
+            return make_solution(str(body.get('TestID')), int(body.get('PaperNo', 1)),
+                                 image_url=self.base_url + '/images', seed=self.seed)
+
+        return self.fixtures.get(endpoint)
+
+    def __login(self, body: Optional[dict]) -> tuple:
+        body = body or {}
+        username, password = str(body.get('UserName') or ''), body.get('Password')
+        valid = password == self.accounts.get(username) if self.accounts is not None else username and password
+        if not valid:
+            return 200, {}, {'data': {'StudentID': 0, 'UserID': 0, 'OTP': None}, 'error': 'True'}
+
+        with self._lock:
+            self.logins += 1
+
+        data = {'StudentID': 4242, 'UserID': 4242, 'OTP': None}
+        if self.require_otp:
+            data['OTP'] = 123456
+            return 200, {}, {'data': data, 'error': 'True'}
+
+        data['jwt'] = self.issue_token(str(body['UserName']))
+        return 200, {}, {'data': data, 'error': 'False'}
+
+    def __verify_otp(self, body: Optional[dict]) -> tuple:
+        body = body or {}
+        if body.get('StudentID') != 4242:
+            return 200, {}, {'data': {}, 'error': 'True'}
+
+        return 200, {}, {'data': {'jwt': self.issue_token(str(body.get('UserName')))}, 'error': 'False'}
+
+    def __make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body are written separately, which stalls keep-alive connections unless Nagle is off.
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                self.__respond()
+
+            def do_POST(self):
+                self.__respond()
+
+            def log_message(self, format, *args):
+                pass
+
+            def __respond(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                raw_body = self.rfile.read(length) if length else b''
+                try:
+                    body = json.loads(raw_body) if raw_body else None
+                except ValueError:
+                    body = None
+
+                path = self.path.split('?')[0]
+                status, headers, payload = server.handle(self.command, path, dict(self.headers), body)
+                content = payload if isinstance(payload, bytes) else json.dumps(payload).encode('utf-8')
+
+                self.send_response(status)
+                self.send_header('Content-Type', headers.pop('Content-Type', 'application/json; charset=utf-8'))
+                self.send_header('Content-Length', str(len(content)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(content)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a local stand-in for Allen\'s API.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0, help='seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0, help='maximum random seconds added to the latency')
+    parser.add_argument('--error-rate', type=float, default=0, help='fraction of requests failing with HTTP 500')
+    parser.add_argument('--throttle-rate', type=float, default=0, help='fraction of requests failing with HTTP 429')
+    parser.add_argument('--recording-days', type=int, default=30)
+    parser.add_argument('--tests', type=int, default=10)
+    parser.add_argument('--otp', action='store_true', help='require the OTP verification step to log in')
+    args = parser.parse_args()
+
+    server = MockAllenServer(args.host, args.port, generate_fixtures(args.recording_days, args.tests),
+                             latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                             throttle_rate=args.throttle_rate, require_otp=args.otp)
+    print(f'Serving a mock Allen API on {server.base_url}')
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
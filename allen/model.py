@@ -0,0 +1,141 @@
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional
+from allen.exceptions import AllenClientNotBound
+
+__all__ = ['SlotsModel', 'ClientBoundModel', 'DatedModel', 'DATE_FORMAT', 'parse_date']
+
+DATE_FORMAT = '%A : %d %B %Y'
+'''The format of the dates returned by ``get_test_date`` and the other date getters'''
+
+
+@lru_cache(maxsize=4096)
+def parse_date(value: Optional[str]) -> Optional[datetime]:
+    """
+    Parse an ISO date of Allen's API. The dates parsed are remembered, as the items of a listing share few dates.
+
+    :param value: The date, for example ``2021-06-01T00:00:00``.
+    :return: The date, None if it is missing or invalid.
+    """
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class SlotsModel:
+    """
+    Base class of the data models. The models store their attributes in ``__slots__`` instead of a
+    per-instance ``__dict__``, which makes large listings considerably smaller.
+
+    Frozen slotted classes cannot be restored by the default pickle protocol, so the state is restored here
+    without going through the frozen ``__setattr__``.
+
+    :meta private:
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def _slot_names(cls) -> tuple:
+        """
+        :return: The names of every slot declared by the class and its bases.
+        """
+        names = cls.__dict__.get('_all_slot_names')
+        if names is None:
+            names = tuple(name for klass in reversed(cls.__mro__)
+                          for name in klass.__dict__.get('__slots__', ()))
+            type.__setattr__(cls, '_all_slot_names', names)
+        return names
+
+    def __getstate__(self) -> dict:
+        state = {}
+        for name in self._slot_names():
+            try:
+                state[name] = object.__getattribute__(self, name)
+            except AttributeError:
+                pass
+        return state
+
+    def __setstate__(self, state: dict):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+
+class ClientBoundModel(SlotsModel):
+    """
+    Base class of the data models which fetch more data through the client they were received from.
+    The client is stored on each instance, so objects received from different clients never share one.
+
+    :meta private:
+    """
+
+    __slots__ = ('_client',)
+
+    @property
+    def client(self):
+        """
+        The client the object was received from, None if the object was created directly.
+        """
+        try:
+            return self._client
+        except AttributeError:
+            return None
+
+    def _bind(self, client):
+        """
+        Set the client the object was received from.
+
+        :param client: The allen client.
+        :return: The object itself.
+        """
+        object.__setattr__(self, '_client', client)
+        return self
+
+    def _require_client(self, async_method: str):
+        """
+        :param async_method: The method of :class:`asyncclient.AsyncAllenClient` making the same request.
+        :return: The client the object was received from.
+        :raises AllenClientNotBound: If the object is not bound to a client.
+        """
+        client = self.client
+        if client is None:
+            raise AllenClientNotBound(type(self).__name__, async_method)
+        return client
+
+    def __getstate__(self) -> dict:
+        # Clients hold sessions and locks which cannot be pickled.
+        state = super().__getstate__()
+        state.pop('_client', None)
+        return state
+
+
+class DatedModel:
+    """
+    Mixin of the models holding the ISO date of Allen's API, which parse it the first time it is used and keep
+    the parsed and formatted date in the ``_parsed_date`` and ``_formatted_date`` slots of the model.
+
+    :meta private:
+    """
+
+    __slots__ = ()
+
+    _date_slot = '_date'
+    '''The name of the slot holding the date as received'''
+
+    def _get_parsed_date(self) -> Optional[datetime]:
+        try:
+            return object.__getattribute__(self, '_parsed_date')
+        except AttributeError:
+            parsed = parse_date(getattr(self, self._date_slot))
+            object.__setattr__(self, '_parsed_date', parsed)
+            return parsed
+
+    def _get_formatted_date(self) -> Optional[str]:
+        try:
+            return object.__getattribute__(self, '_formatted_date')
+        except AttributeError:
+            parsed = self._get_parsed_date()
+            formatted = parsed.strftime(DATE_FORMAT) if parsed is not None else None
+            object.__setattr__(self, '_formatted_date', formatted)
+            return formatted
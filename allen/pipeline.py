@@ -0,0 +1,230 @@
+import json
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List, Mapping, Optional
+from allen.analytics import SolutionTable
+from allen.decoder import loads
+from allen.model import DATE_FORMAT, parse_date
+from allen.test_record import TestRecord
+
+__all__ = ['ProcessPipeline', 'VIDEO_ROW', 'TEST_RECORD_ROW']
+
+VIDEO_ROW = ('unique_code', 'subject_name', 'date', 'recording_date')
+'''The values of the rows of :meth:`ProcessPipeline.recorded_video_rows`, in order'''
+
+TEST_RECORD_ROW = ('biology', 'physics', 'chemistry', 'maths', 'total', 'percentage', 'rank', 'test_name',
+                   'test_date', 'test_id', 'formatted_test_date')
+'''The values of the rows of :meth:`ProcessPipeline.test_record_rows`, in order'''
+
+
+def _encode(items: list) -> bytes:
+    """
+    Serialize a chunk of json items into the compact bytes sent to a worker, with ``orjson`` if it is installed.
+
+    :meta private:
+    """
+    try:
+        import orjson
+    except ImportError:
+        return json.dumps(items, separators=(',', ':')).encode('utf-8')
+    return orjson.dumps(items)
+
+
+def _chunks(items: Iterable, size: int) -> Iterator[bytes]:
+    """
+    Split items into chunks of json items, encoded one at a time as they are read.
+
+    :meta private:
+    """
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield _encode(chunk)
+
+
+def _date_formatter() -> Callable[[Optional[str]], Optional[str]]:
+    """
+    :return: A function formatting dates like ``get_test_date``, remembering the dates already formatted as the
+        items of a listing share few distinct dates.
+    :meta private:
+    """
+    formatted = {}
+
+    def format_date(date: Optional[str]) -> Optional[str]:
+        value = formatted.get(date, formatted)
+        if value is formatted:
+            parsed = parse_date(date)
+            value = formatted[date] = parsed.strftime(DATE_FORMAT) if parsed is not None else None
+        return value
+
+    return format_date
+
+
+def _format_dates(data: bytes) -> List[Optional[str]]:
+    """
+    :meta private:
+    """
+    return list(map(_date_formatter(), loads(data)))
+
+
+def _video_rows(data: bytes) -> List[tuple]:
+    """
+    :meta private:
+    """
+    format_date = _date_formatter()
+    rows = []
+    for video_day in loads(data):
+        date = video_day['ClassDate']
+        recording_date = format_date(date)
+        rows.extend((video.get('UniqueCode'), video.get('SubjectName'), date, recording_date)
+                    for video in video_day['listClass'])
+    return rows
+
+
+def _test_record_rows(data: bytes) -> List[tuple]:
+    """
+    :meta private:
+    """
+    format_date = _date_formatter()
+    return [(record.biology, record.physics, record.chemistry, record.maths, record.total, record.percentage,
+             record.rank, record.test_name, record._test_date, record._test_id, format_date(record._test_date))
+            for record in TestRecord.from_json_many(loads(data), None)]
+
+
+def _solution_table(data: bytes) -> SolutionTable:
+    """
+    :meta private:
+    """
+    return SolutionTable.from_json(dict(loads(data)))
+
+
+class ProcessPipeline:
+    """
+    Runs the CPU bound post-processing of large result sets, such as parsing and formatting dates or packing
+    solutions, on a pool of processes so that it scales past the one core the GIL allows a thread.
+
+    The items are split into chunks sent to the workers as compact JSON bytes, and the workers send back flat rows
+    of plain values or packed tables instead of graphs of model objects, so little time goes into pickling.
+    Inputs smaller than a chunk are processed in the calling process, where a pool would only add overhead.
+
+    Every chunk is submitted as soon as it is encoded, so the workers start while the next chunks are encoded, and
+    only a bounded number of chunks is in flight at once so the encoded input is never held whole in memory.
+    """
+
+    def __init__(self, max_workers: int = None, chunk_size: int = 2000, executor: Executor = None):
+        """
+        :param max_workers: The number of worker processes, defaults to the number of CPUs.
+        :param chunk_size: The number of items sent to a worker at once.
+        :param executor: An existing executor to run the chunks on. The executor is not shut down by the pipeline.
+        """
+        self.max_workers = max_workers if max_workers is not None else os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._executor = executor
+        self._owns_executor = executor is None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        Shut down the worker processes started by the pipeline.
+        """
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def map(self, func: Callable[[bytes], List[Any]], items: Iterable) -> List[Any]:
+        """
+        Apply a function to chunks of json items on the pool.
+
+        :param func: A module level function receiving a chunk encoded as a JSON array and returning a list.
+        :param items: The json items to split into chunks.
+        :return: The lists returned for every chunk concatenated, in the order of the items.
+        """
+        return [value for result in self.__map_chunks(func, items) for value in result]
+
+    def format_dates(self, dates: Iterable[Optional[str]]) -> List[Optional[str]]:
+        """
+        Format many ISO dates in ``Thursday : 01 January 1970`` format, like ``get_test_date`` does.
+
+        :param dates: The dates to format.
+        :return: The formatted dates, None for every invalid date.
+        """
+        return self.map(_format_dates, dates)
+
+    def recorded_video_rows(self, video_days: Iterable[dict]) -> List[tuple]:
+        """
+        Flatten the days of the ``dc/student/recordinglist`` response into rows of :data:`VIDEO_ROW`.
+
+        :param video_days: The json dicts of the days of recordings.
+        :return: A row for every recorded video, in order.
+        """
+        return self.map(_video_rows, video_days)
+
+    def test_record_rows(self, tests: Iterable[dict]) -> List[tuple]:
+        """
+        Convert the tests of the ``studenttestrecord`` response into rows of :data:`TEST_RECORD_ROW`, converting
+        the marks like :class:`test_record.TestRecord` does.
+
+        :param tests: The json dicts of the tests.
+        :return: A row for every test, in order.
+        :raises ValueError: If the marks of a test are not numbers.
+        """
+        return self.map(_test_record_rows, tests)
+
+    def solution_table(self, subjects_by_test: Mapping[str, List[dict]]) -> SolutionTable:
+        """
+        Pack the solutions of many tests into a :class:`analytics.SolutionTable`, the tables of every chunk of tests
+        being packed by the workers and concatenated.
+
+        :param subjects_by_test: The subject json dicts of every test, keyed by the ID of the test.
+        :return: The table of the questions of every test.
+        """
+        return SolutionTable.concat(self.__map_chunks(_solution_table, subjects_by_test.items()))
+
+    def __map_chunks(self, func: Callable[[bytes], Any], items: Iterable) -> Iterator[Any]:
+        """
+        Run a function on every chunk of the items, on the pool unless there is a single chunk.
+
+        :return: An iterator over the results of the chunks, in order.
+        :meta private:
+        """
+        chunks = _chunks(items, self.chunk_size)
+        first, second = next(chunks, None), next(chunks, None)
+        if second is None or self.max_workers <= 1:
+            for chunk in (first, second):
+                if chunk is not None:
+                    yield func(chunk)
+            yield from map(func, chunks)
+            return
+
+        # Keep the workers busy without encoding every chunk up front, like the runner of :mod:`batch`.
+        executor = self.__get_executor()
+        pending = deque((executor.submit(func, first), executor.submit(func, second)))
+        try:
+            for chunk in chunks:
+                if len(pending) >= 2 * self.max_workers:
+                    yield pending.popleft().result()
+                pending.append(executor.submit(func, chunk))
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def __get_executor(self) -> Executor:
+        """
+        Start the worker processes on first use.
+
+        :meta private:
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
@@ -0,0 +1,115 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+__all__ = ['SingleFlight', 'AsyncSingleFlight']
+
+
+class _Call:
+    """
+    A call in flight, shared by every caller of the same key.
+
+    :meta private:
+    """
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces identical calls made from several threads at once, so that only the first caller runs the call and
+    every concurrent caller of the same key receives its result or exception.
+
+    A call is only shared while it is in flight, the next call of a key after it completed runs again.
+    The callers share the same result object, which must therefore not be modified.
+    A single instance may be shared by several clients to coalesce their calls as well.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """
+        Run a function, or wait for the identical call in flight to complete.
+
+        :param key: The key identifying identical calls.
+        :param func: The function to run.
+        :return: The result of the function.
+        :raises Exception: The exception raised by the function.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result
+
+    def in_flight(self) -> int:
+        """
+        :return: The number of distinct calls in flight.
+        """
+        with self._lock:
+            return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """
+    Coalesces identical coroutine calls awaited at once, the asyncio counterpart of :class:`SingleFlight`.
+
+    The call runs in its own task, so cancelling one of the callers does not cancel the call for the others.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, coroutine_function: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await a coroutine, or the identical call in flight.
+
+        :param key: The key identifying identical calls.
+        :param coroutine_function: The function returning the coroutine to await.
+        :return: The result of the coroutine.
+        :raises Exception: The exception raised by the coroutine.
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._tasks[key] = asyncio.ensure_future(coroutine_function())
+            task.add_done_callback(lambda done: self.__forget(key, done))
+
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        """
+        :return: The number of distinct calls in flight.
+        """
+        return len(self._tasks)
+
+    def __forget(self, key: Hashable, task: asyncio.Future):
+        """
+        :meta private:
+        """
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
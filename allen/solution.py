@@ -1,11 +1,14 @@
 from dataclasses import dataclass
+from allen.model import SlotsModel
 from typing import List
 
 __all__ = ['Solution', 'SubjectSolution']
 
 
 @dataclass(frozen=True, order=True)
-class Solution:
+class Solution(SlotsModel):
+    __slots__ = ('question_no', 'response', 'image')
+
     question_no: int
     '''The number of the question'''
 
@@ -29,9 +32,21 @@ class Solution:
 
         return Solution(question_no, response, image)
 
+    @classmethod
+    def from_json_many(cls, json_list: List[dict]) -> List['Solution']:
+        """
+        Deserialize a list of solution json dicts with :meth:`from_json`.
+
+        :param json_list: The json dictionaries to deserialize.
+        :meta private:
+        """
+        return [Solution.from_json(json_obj) for json_obj in json_list]
+
 
 @dataclass(frozen=True, order=True)
-class SubjectSolution:
+class SubjectSolution(SlotsModel):
+    __slots__ = ('subject_name', 'total_questions', 'solutions')
+
     subject_name: str
     '''The name of the subject'''
 
@@ -57,6 +72,16 @@ class SubjectSolution:
 
         return SubjectSolution(subject_name, total_questions, solutions)
 
+    @classmethod
+    def from_json_many(cls, json_list: List[dict]) -> List['SubjectSolution']:
+        """
+        Deserialize a list of subject solution json dicts with :meth:`from_json`.
+
+        :param json_list: The json dictionaries to deserialize.
+        :meta private:
+        """
+        return [SubjectSolution.from_json(json_obj) for json_obj in json_list]
+
     def get_solutions(self):
         """
         Get the list of Solution for the subject.
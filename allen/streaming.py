@@ -0,0 +1,140 @@
+import codecs
+import json
+import re
+from typing import Any, Iterable, Iterator, Tuple
+
+__all__ = ['iter_json_items', 'JSONPathNotFound']
+
+_STRUCTURAL = re.compile(r'["{}\[\]:,]')
+_STRING_END = re.compile(r'(?:[^"\\]|\\.)*"', re.DOTALL)
+_NON_WHITESPACE = re.compile(r'\S')
+_DECODER = json.JSONDecoder()
+
+
+class JSONPathNotFound(ValueError):
+    """
+    Exception representing a JSON document which does not contain an array at the requested path.
+    """
+
+    def __init__(self, path: Tuple[str, ...]):
+        super().__init__(path)
+        self.path = path
+
+    def __str__(self):
+        return f'No array found at {"/".join(self.path)}'
+
+
+def iter_json_items(chunks: Iterable[bytes], path: Tuple[str, ...]) -> Iterator[Any]:
+    """
+    Incrementally parse a JSON document and yield the items of the array at a path as soon as each is complete.
+    Only one item is held in memory at a time, the rest of the document is skipped without being decoded.
+
+    Example::
+
+        # Yields 1 and then 2
+        iter_json_items([b'{"data": {"list": [1', b', 2]}}'], ('data', 'list'))
+
+    :param chunks: The UTF-8 encoded chunks of the document.
+    :param path: The keys of the objects leading to the array.
+    :return: An iterator over the decoded items.
+    :raises JSONPathNotFound: If the document does not contain an array at the path.
+    """
+    path = tuple(path)
+    decoder = codecs.getincrementaldecoder('utf-8')()
+
+    # Each frame is [container, key]. The key of an object frame is the last key read in it, None while a
+    # key is expected. Array frames store None.
+    frames = []
+    target_depth = None
+    item_start = None
+    found = False
+    buffer = ''
+    pos = 0
+
+    def chunks_with_end():
+        for chunk in chunks:
+            yield decoder.decode(chunk), False
+        yield decoder.decode(b'', final=True), True
+
+    for text, final in chunks_with_end():
+        buffer += text
+
+        while True:
+            # Inside the target array the start of every item has to be located. Objects, arrays and strings are
+            # decoded in one go once they are complete, only scalars are delimited by scanning for the next token.
+            if target_depth is not None and len(frames) == target_depth and item_start is None:
+                match = _NON_WHITESPACE.search(buffer, pos)
+                if match is None:
+                    break
+
+                char = match.group()
+                if char == ']':
+                    frames.pop()
+                    target_depth = None
+                    pos = match.end()
+                    continue
+                if char == ',':
+                    pos = match.end()
+                    continue
+                if char in '{["':
+                    try:
+                        item, pos = _DECODER.raw_decode(buffer, match.start())
+                    except ValueError:
+                        if final:
+                            raise
+                        break
+                    yield item
+                    continue
+
+                item_start = match.start()
+
+            match = _STRUCTURAL.search(buffer, pos)
+            if match is None:
+                break
+
+            char = match.group()
+            if char == '"':
+                end = _STRING_END.match(buffer, match.end())
+                if end is None:
+                    break
+                pos = end.end()
+
+                frame = frames[-1] if frames else None
+                if target_depth is None and frame is not None and frame[0] == '{' and frame[1] is None:
+                    frame[1] = json.loads(buffer[match.start():pos])
+                continue
+
+            pos = match.end()
+            if char == '{' or char == '[':
+                if (char == '[' and target_depth is None and not found and len(frames) == len(path)
+                        and all(frame[0] == '{' and frame[1] == key for frame, key in zip(frames, path))):
+                    target_depth = len(frames) + 1
+                    found = True
+                frames.append([char, None])
+            elif char == '}' or char == ']':
+                if target_depth is not None and len(frames) == target_depth:
+                    yield json.loads(buffer[item_start:match.start()])
+                    item_start = None
+                    target_depth = None
+                frames.pop()
+            elif char == ',':
+                if target_depth is not None and len(frames) == target_depth:
+                    yield json.loads(buffer[item_start:match.start()])
+                    item_start = None
+                elif frames and frames[-1][0] == '{':
+                    frames[-1][1] = None
+
+        # Discard everything which has been consumed, keeping a partial item and any partial token.
+        keep = item_start if item_start is not None else pos
+        buffer = buffer[keep:]
+        pos -= keep
+        if item_start is not None:
+            item_start = 0
+
+        if final:
+            break
+
+    if not found:
+        raise JSONPathNotFound(path)
+    if target_depth is not None:
+        raise ValueError('The JSON document ended before the array was closed')
@@ -0,0 +1,231 @@
+import hashlib
+import json
+import pathlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Union
+from allen.bulk import LinkResult, map_ordered
+from allen.disk_cache import default_cache_dir
+from allen.solution import SubjectSolution
+from allen.test_record import TestRecord
+from allen.utils import file_lock, write_json_atomic
+from allen.video import RecordedVideo
+
+__all__ = ['SyncStore', 'SyncResult', 'SyncEngine']
+
+
+class SyncStore:
+    """
+    Stores the recordings and tests already seen by each account in a JSON file, so that every sync only reports
+    what was added since the previous one.
+
+    Every store of the same file in the process shares a lock, so engines syncing different accounts at once do not
+    lose each other's state.
+    """
+
+    def __init__(self, path: Union[str, pathlib.Path] = None):
+        """
+        :param path: The path of the file, defaults to ``sync.json`` in :func:`disk_cache.default_cache_dir`.
+        """
+        if path is None:
+            path = default_cache_dir() / 'sync.json'
+
+        self.path = pathlib.Path(path)
+        self._lock = file_lock(self.path)
+
+    def load(self, identity: str) -> dict:
+        """
+        :param identity: The identity of the account, see :attr:`allenclient.AllenClient.identity`.
+        :return: The state of the account, an empty dict if nothing is stored.
+        """
+        state = self.__read().get(identity)
+        return state if isinstance(state, dict) else {}
+
+    def save(self, identity: str, state: dict):
+        """
+        Store the state of an account.
+
+        :param identity: The identity of the account.
+        :param state: The state to store.
+        """
+        with self._lock:
+            states = self.__read()
+            states[identity] = state
+            write_json_atomic(self.path, states)
+
+    def clear(self, identity: str = None):
+        """
+        Forget the state of an account, so that the next sync reports everything as new.
+
+        :param identity: The identity of the account, every account if not specified.
+        """
+        with self._lock:
+            states = self.__read() if identity is not None else {}
+            states.pop(identity, None)
+            write_json_atomic(self.path, states)
+
+    def __read(self) -> dict:
+        """
+        :meta private:
+        """
+        try:
+            with open(self.path, 'r') as file:
+                states = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+        return states if isinstance(states, dict) else {}
+
+
+@dataclass(frozen=True)
+class SyncResult:
+    new_videos: List[RecordedVideo] = field(default_factory=list)
+    '''The recorded videos which were not seen by the previous syncs'''
+
+    links: List[LinkResult] = field(default_factory=list)
+    '''The links of the new videos, empty unless links are resolved'''
+
+    new_tests: List[TestRecord] = field(default_factory=list)
+    '''The tests which were not seen by the previous syncs'''
+
+    changed_tests: List[TestRecord] = field(default_factory=list)
+    '''The tests seen before whose marks, rank or details have changed since'''
+
+    solutions: Dict[str, List[SubjectSolution]] = field(default_factory=dict)
+    '''The solutions of the new tests keyed by the ID of the test, empty unless solutions are fetched'''
+
+    @property
+    def empty(self) -> bool:
+        """
+        :return: True if nothing was added or changed since the previous sync.
+        """
+        return not (self.new_videos or self.new_tests or self.changed_tests)
+
+
+def _fingerprint(json_obj: dict) -> str:
+    """
+    :return: A short digest of a json dict which changes whenever one of its values does.
+    """
+    return hashlib.sha1(json.dumps(json_obj, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+
+class SyncEngine:
+    """
+    Fetches the recorded videos and tests of an account and returns only those added or changed since the
+    previous sync, remembering what was seen in a :class:`SyncStore`.
+
+    The days of recordings before the latest day seen are skipped as they are streamed, without being deserialized,
+    so a sync only builds objects for the most recent day and the days after it. Links and solutions are only
+    fetched for new items, and an item whose link or solutions failed to be fetched is reported again by the next
+    sync.
+    """
+
+    def __init__(self, client, store: SyncStore = None, resolve_links: bool = False, fetch_solutions: bool = False,
+                 max_workers: int = None):
+        """
+        :param client: The :class:`allenclient.AllenClient` of the account to sync.
+        :param store: The store of the state, defaults to :class:`SyncStore`.
+        :param resolve_links: Specify whether the links of the new videos are resolved.
+        :param fetch_solutions: Specify whether the solutions of the new tests are fetched.
+        :param max_workers: The maximum number of links or solutions fetched at once, defaults to the connection
+            pool size of the client.
+        """
+        if store is None:
+            store = SyncStore()
+
+        self.client = client
+        self.store = store
+        self.resolve_links = resolve_links
+        self.fetch_solutions = fetch_solutions
+        self.max_workers = max_workers
+
+    def sync(self) -> SyncResult:
+        """
+        Fetch what was added or changed since the previous sync and remember it as seen.
+
+        :return: The new and changed items.
+        """
+        identity = self.client.identity
+        state = self.store.load(identity)
+
+        new_videos, links = self.__sync_videos(state)
+        new_tests, changed_tests, solutions = self.__sync_tests(state)
+
+        self.store.save(identity, state)
+        return SyncResult(new_videos, links, new_tests, changed_tests, solutions)
+
+    def reset(self):
+        """
+        Forget what was seen, so that the next sync reports everything as new.
+        """
+        self.store.clear(self.client.identity)
+
+    def __sync_videos(self, state: dict) -> tuple:
+        """
+        :meta private:
+        """
+        known = set(state.get('videos', ()))
+        last_date = state.get('last_class_date')
+
+        new_videos = []
+        scanned_days = []
+        for video_day in self.client.iter_json('dc/student/recordinglist', ()):
+            date = video_day['ClassDate']
+            if last_date is not None and date is not None and date < last_date:
+                continue
+
+            codes = [video.get('UniqueCode') for video in video_day['listClass']]
+            scanned_days.append((date, codes))
+
+            new_json = [video for video, code in zip(video_day['listClass'], codes) if code not in known]
+            if new_json:
+                new_videos.extend(RecordedVideo.from_json_many(new_json, date, self.client))
+
+        links = []
+        failed = set()
+        if self.resolve_links and new_videos:
+            links = self.client.resolve_links(new_videos, max_workers=self.max_workers)
+            failed = {link.video.unique_code for link in links if not link.ok}
+
+        # Rescan from the oldest day holding a failed link, otherwise from the newest day as it may still grow.
+        dates = [date for date, codes in scanned_days if date is not None]
+        failed_dates = [date for date, codes in scanned_days if date is not None and failed.intersection(codes)]
+        next_date = min(failed_dates) if failed_dates else max(dates, default=last_date)
+
+        # Only the days which will be scanned again need their codes remembered.
+        state['videos'] = sorted({code for date, codes in scanned_days for code in codes
+                                  if code not in failed and (date is None or next_date is None or date >= next_date)})
+        state['last_class_date'] = next_date
+        return new_videos, links
+
+    def __sync_tests(self, state: dict) -> tuple:
+        """
+        :meta private:
+        """
+        known = state.get('tests', {})
+
+        new_json, changed_json, fingerprints = [], [], {}
+        for test in self.client.iter_json('studenttestrecord', ('testList',)):
+            test_id = str(test.get('TestID'))
+            fingerprint = fingerprints[test_id] = _fingerprint(test)
+            if test_id not in known:
+                new_json.append(test)
+            elif known[test_id] != fingerprint:
+                changed_json.append(test)
+
+        new_tests = TestRecord.from_json_many(new_json, self.client)
+        changed_tests = TestRecord.from_json_many(changed_json, self.client)
+
+        solutions = {}
+        if self.fetch_solutions and new_tests:
+            max_workers = self.max_workers if self.max_workers is not None else self.client.pool_maxsize
+            results = map_ordered(lambda record: record.get_subject_solutions(), new_tests, max_workers)
+            for record, (result, error) in zip(new_tests, results):
+                if error is None:
+                    solutions[record._test_id] = result
+                else:
+                    del fingerprints[str(record._test_id)]
+
+        for test_id, fingerprint in fingerprints.items():
+            known[test_id] = fingerprint
+        state['tests'] = known
+        return new_tests, changed_tests, solutions
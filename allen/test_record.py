@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from allen.model import ClientBoundModel, DatedModel
 from allen.solution import SubjectSolution
 from datetime import datetime
 from typing import List, Optional
@@ -6,8 +7,27 @@ from typing import List, Optional
 __all__ = ['TestRecord']
 
 
+def _optional_marks(value) -> int:
+    """
+    :return: The marks as an int, -1 if the subject was not attempted. The ``-`` written for such subjects is checked
+        first, as raising and catching the ValueError of ``int('-')`` costs ten times as much as the conversion.
+    """
+    if value == '-':
+        return -1
+
+    try:
+        return int(value)
+    except ValueError:
+        return -1
+
+
 @dataclass(frozen=True, order=True)
-class TestRecord:
+class TestRecord(ClientBoundModel, DatedModel):
+    __slots__ = ('biology', 'physics', 'chemistry', 'maths', 'total', 'percentage', 'rank', 'test_name',
+                 '_test_date', '_test_id', '_parsed_date', '_formatted_date')
+
+    _date_slot = '_test_date'
+
     biology: int
     '''The marks received in biology'''
 
@@ -53,18 +73,10 @@ class TestRecord:
         :param client: The allen client.
         :meta private:
         """
-        try:
-            bio = int(json_obj.get('Bio'))
-        except ValueError:
-            bio = -1
-
+        bio = _optional_marks(json_obj.get('Bio'))
         phy = int(json_obj.get('Phy'))
         chem = int(json_obj.get('Chem'))
-
-        try:
-            math = int(json_obj.get('Math'))
-        except ValueError:
-            math = -1
+        math = _optional_marks(json_obj.get('Math'))
 
         total = int(json_obj.get('Total'))
         percentage = float(json_obj.get('Per'))
@@ -72,33 +84,49 @@ class TestRecord:
         name = json_obj.get('TestName')
         date = json_obj.get('TestDate')
         test_id = json_obj.get('TestID')
-        cls.client = client
 
-        return TestRecord(bio, phy, chem, math, total, percentage, rank, name, date, test_id)
+        return TestRecord(bio, phy, chem, math, total, percentage, rank, name, date, test_id)._bind(client)
 
-    def get_subject_solutions(self) -> List[SubjectSolution]:
+    @classmethod
+    def from_json_many(cls, json_list: List[dict], client) -> List['TestRecord']:
+        """
+        Deserialize a list of test json dicts with :meth:`from_json`.
+
+        :param json_list: The json dictionaries to deserialize.
+        :param client: The allen client.
+        :meta private:
+        """
+        return [TestRecord.from_json(json_obj, client) for json_obj in json_list]
+
+    def get_subject_solutions(self, paper_no: int = 1) -> List[SubjectSolution]:
         """
         Get the solutions of the test.
 
+        :param paper_no: The number of the paper of the test to get the solutions of.
         :return: A list of SubjectSolution objects.
         """
-        solution = self.client.fetch_json('GetTestSolution', post_data={
-            'PaperNo': 1,
+        client = self._require_client('get_subject_solutions')
+        solution = client.fetch_json('GetTestSolution', post_data={
+            'PaperNo': paper_no,
             'TestID': self._test_id
-        })
+        }, persist=True)
 
         subjects = solution['listPaper'][0]['listSubject']
-        solutions = [SubjectSolution.from_json(subject) for subject in subjects]
+        solutions = SubjectSolution.from_json_many(subjects)
 
         return solutions
 
+    @property
+    def test_date(self) -> Optional[datetime]:
+        """
+        The date the test was conducted, None if the date is invalid. The date is only parsed once.
+        """
+        return self._get_parsed_date()
+
     def get_test_date(self) -> Optional[str]:
         """
         Returns the date of the test in ``Thursday : 01 January 1970`` format.
 
         :return: The date if a valid date is present, else None.
         """
-        try:
-            return datetime.fromisoformat(self._test_date).strftime('%A : %d %B %Y')
-        except ValueError:
-            return None
+        return self._get_formatted_date()
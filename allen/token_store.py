@@ -0,0 +1,169 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+import pathlib
+import time
+from dataclasses import dataclass
+from typing import Optional, Union
+from allen.utils import file_lock, write_json_atomic
+
+__all__ = ['StoredToken', 'TokenStore', 'jwt_expiry', 'hash_password']
+
+PASSWORD_HASH_ITERATIONS = 100000
+'''The number of PBKDF2 iterations the stored passwords are hashed with'''
+
+
+def jwt_expiry(jwt: str) -> Optional[float]:
+    """
+    Read the expiry time from the payload of a JWT token without verifying it.
+
+    :param jwt: The JWT token.
+    :return: The expiry time as a unix timestamp, or None if the token does not specify one.
+    """
+    try:
+        payload = jwt.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload.encode('ascii'))).get('exp')
+        return float(exp) if exp is not None else None
+    except (IndexError, ValueError, TypeError, AttributeError):
+        return None
+
+
+def hash_password(password: str, salt: bytes = None, iterations: int = PASSWORD_HASH_ITERATIONS) -> str:
+    """
+    Hash a password with PBKDF2-SHA256 and a random salt, so that it can be stored and checked later.
+
+    :param password: The password to hash.
+    :param salt: The salt, 16 random bytes if not specified.
+    :param iterations: The number of iterations of PBKDF2.
+    :return: The hash, in ``pbkdf2_sha256$<iterations>$<salt>$<digest>`` format.
+    """
+    if salt is None:
+        salt = os.urandom(16)
+
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, iterations)
+    return f'pbkdf2_sha256${iterations}${salt.hex()}${digest.hex()}'
+
+
+def _check_password(password: str, password_hash: str) -> bool:
+    """
+    :return: True if the password matches the hash made by :func:`hash_password`, else False.
+    :meta private:
+    """
+    try:
+        algorithm, iterations, salt, _ = password_hash.split('$')
+        if algorithm != 'pbkdf2_sha256':
+            return False
+        expected = hash_password(password, bytes.fromhex(salt), int(iterations))
+    except (AttributeError, ValueError):
+        return False
+
+    return hmac.compare_digest(expected, password_hash)
+
+
+@dataclass(frozen=True)
+class StoredToken:
+    jwt: Optional[str]
+    '''The JWT token of the account, None if the token was discarded'''
+
+    device_id: int
+    '''The device id the token was generated for'''
+
+    password_hash: Optional[str] = None
+    '''The salted hash of the password the token was generated with, see :func:`hash_password`'''
+
+    def is_valid(self, leeway: float = 60) -> bool:
+        """
+        Check whether the token can still be used.
+        Tokens which do not specify an expiry time are assumed to be valid.
+
+        :param leeway: The number of seconds before the expiry time the token is treated as expired.
+        :return: True if the token can be used, else False.
+        """
+        if self.jwt is None:
+            return False
+
+        expiry = jwt_expiry(self.jwt)
+        return expiry is None or expiry - leeway > time.time()
+
+    def matches(self, password: str) -> bool:
+        """
+        Check whether a password is the one the token was generated with, so that it is never reused for a wrong one.
+        Tokens stored without the hash of their password never match.
+
+        :param password: The password to check.
+        :return: True if the password is the one the token was generated with, else False.
+        """
+        return self.password_hash is not None and _check_password(password, self.password_hash)
+
+
+class TokenStore:
+    """
+    Stores the JWT token and device id of each account in a JSON file, so that logins can be reused between runs.
+    The passwords are not stored, only a salted hash of each to check that a token is reused with the password it
+    was generated with.
+
+    Every store of the same file in the process shares a lock, so concurrent updates of different accounts are not
+    lost.
+    """
+
+    def __init__(self, path: Union[str, pathlib.Path] = None):
+        """
+        :param path: The path of the file, defaults to ``~/.allen_session``.
+        """
+        if path is None:
+            path = pathlib.Path.home() / '.allen_session'
+
+        self.path = pathlib.Path(path)
+        self._lock = file_lock(self.path)
+
+    def load(self, username: str) -> Optional[StoredToken]:
+        """
+        :param username: The form number of the account.
+        :return: The stored token of the account, or None if nothing is stored.
+        """
+        entry = self.__read().get(str(username))
+        if entry is None or 'device_id' not in entry:
+            return None
+
+        return StoredToken(entry.get('jwt'), entry['device_id'], entry.get('password_hash'))
+
+    def save(self, username: str, jwt: Optional[str], device_id: int, password: str = None):
+        """
+        Store the token and device id of an account.
+
+        :param username: The form number of the account.
+        :param jwt: The JWT token, None to only keep the device id.
+        :param device_id: The device id the token was generated for.
+        :param password: The password the token was generated with, only a salted hash of it is stored. The token
+            is never reused by :class:`allenclient.AllenClient` if not specified.
+        """
+        password_hash = hash_password(password) if password is not None else None
+        with self._lock:
+            entries = self.__read()
+            entries[str(username)] = {'jwt': jwt, 'device_id': device_id, 'password_hash': password_hash}
+            write_json_atomic(self.path, entries)
+
+    def clear(self):
+        """
+        Remove every stored token.
+        """
+        with self._lock:
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def __read(self) -> dict:
+        """
+        :meta private:
+        """
+        try:
+            with open(self.path, 'r') as file:
+                entries = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+        return entries if isinstance(entries, dict) else {}
@@ -0,0 +1,233 @@
+import random
+import threading
+import time
+import requests
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional, Tuple
+from allen.exceptions import AllenConnectionError
+from allen.instrumentation import Instrumentation, RequestTrace
+
+__all__ = ['TransportPolicy', 'TokenBucket', 'Transport']
+
+
+@dataclass(frozen=True)
+class TransportPolicy:
+    """
+    The timeouts, retries and rate limit applied to every request sent to Allen's API.
+    """
+
+    connect_timeout: float = 5
+    '''The number of seconds to wait for a connection to be established'''
+
+    read_timeout: float = 30
+    '''The number of seconds to wait for the server to send data'''
+
+    max_retries: int = 2
+    '''The number of times a failed request is retried'''
+
+    backoff_factor: float = 0.5
+    '''The base number of seconds to wait before retrying, doubled after every attempt'''
+
+    backoff_max: float = 30
+    '''The maximum number of seconds to wait before retrying'''
+
+    retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)
+    '''The HTTP status codes which are retried'''
+
+    respect_retry_after: bool = True
+    '''Specify whether the ``Retry-After`` header of a response decides the time to wait'''
+
+    rate_limit: Optional[float] = None
+    '''The maximum number of requests sent per second, None for no limit'''
+
+    burst: int = 1
+    '''The number of requests which may be sent at once before the rate limit applies'''
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Compute the time to wait before a retry using exponential backoff with full jitter.
+
+        :param attempt: The number of attempts which have failed, starting from 0.
+        :return: The number of seconds to wait.
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_factor * (2 ** attempt)))
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket limiting how many requests are sent per second.
+    A single bucket may be shared by several clients to apply one limit to all of them.
+    """
+
+    def __init__(self, rate: float, capacity: int = 1, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        :param rate: The number of tokens added per second.
+        :param capacity: The maximum number of tokens stored.
+        :param clock: The function returning the current time in seconds.
+        :param sleep: The function used to wait.
+        """
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Take a token, waiting until one is available.
+
+        :return: The number of seconds waited.
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            # Reserve the token now so concurrent callers queue up behind each other.
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+class Transport:
+    """
+    Sends requests through a session, applying the timeouts, retries and rate limit of a policy.
+
+    .. note::
+
+        Allen's API performs reads through POST requests, so POST requests are retried as well.
+    """
+
+    def __init__(self, session: requests.Session, policy: TransportPolicy = None, rate_limiter: TokenBucket = None,
+                 sleep: Callable[[float], None] = time.sleep, instrumentation: Instrumentation = None):
+        """
+        :param session: The session to send the requests through.
+        :param policy: The policy to apply, defaults to :class:`TransportPolicy`.
+        :param rate_limiter: The bucket to take a token from before every request, created from the policy's
+            ``rate_limit`` if not specified.
+        :param sleep: The function used to wait before a retry.
+        :param instrumentation: The instrumentation notified of the retries of traced requests.
+        """
+        if policy is None:
+            policy = TransportPolicy()
+        if rate_limiter is None and policy.rate_limit is not None:
+            rate_limiter = TokenBucket(policy.rate_limit, policy.burst)
+
+        self.session = session
+        self.policy = policy
+        self.rate_limiter = rate_limiter
+        self.instrumentation = instrumentation
+        self._sleep = sleep
+
+    def request(self, http_method: str, url: str, trace: RequestTrace = None, **kwargs) -> requests.Response:
+        """
+        Send a request, retrying connection failures and the retryable status codes of the policy.
+
+        :param http_method: The http method of the request.
+        :param url: The url of the request.
+        :param trace: The trace to record the attempts, time to first byte and download of the request in.
+        :param kwargs: The arguments passed to :meth:`requests.Session.request`.
+        :return: The response of the last attempt.
+        :raises AllenConnectionError: If the last attempt failed to connect or timed out.
+        """
+        policy = self.policy
+        kwargs.setdefault('timeout', (policy.connect_timeout, policy.read_timeout))
+
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+
+            if trace is not None:
+                trace.attempts += 1
+                sent = time.perf_counter()
+
+            try:
+                response = self.session.request(http_method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= policy.max_retries:
+                    raise AllenConnectionError(url, e) from e
+                if trace is not None:
+                    self.__retried(trace, type(e).__name__)
+                self._sleep(policy.backoff(attempt))
+                attempt += 1
+                continue
+
+            if trace is not None:
+                self.__record(trace, response, sent, kwargs.get('stream', False))
+
+            if response.status_code not in policy.retry_statuses or attempt >= policy.max_retries:
+                return response
+
+            if trace is not None:
+                self.__retried(trace, str(response.status_code))
+
+            delay = self.retry_after(response) if policy.respect_retry_after else None
+            if delay is None:
+                delay = policy.backoff(attempt)
+
+            response.close()
+            self._sleep(min(delay, policy.backoff_max))
+            attempt += 1
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """
+        Send a POST request, see :meth:`request`.
+        """
+        return self.request('POST', url, **kwargs)
+
+    def __retried(self, trace: RequestTrace, reason: str):
+        """
+        :meta private:
+        """
+        if self.instrumentation is not None:
+            self.instrumentation.retried(trace, reason)
+
+    @staticmethod
+    def __record(trace: RequestTrace, response: requests.Response, sent: float, stream: bool):
+        """
+        Record the time to first byte of an attempt, and its download unless the body is streamed by the caller.
+
+        :meta private:
+        """
+        trace.status = response.status_code
+        trace.ttfb = response.elapsed.total_seconds()
+        if not stream:
+            trace.download = max(0.0, time.perf_counter() - sent - trace.ttfb)
+            trace.bytes += len(response.content)
+
+    @staticmethod
+    def retry_after(response: requests.Response) -> Optional[float]:
+        """
+        Read the number of seconds to wait from the ``Retry-After`` header of a response.
+
+        :param response: The response to read the header from.
+        :return: The number of seconds, or None if the header is missing or invalid.
+        """
+        value = response.headers.get('Retry-After')
+        if value is None:
+            return None
+
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+        try:
+            date = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if date is None:
+            return None
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=timezone.utc)
+
+        return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
@@ -1,9 +1,20 @@
+import json
+import os
+import pathlib
+import tempfile
+import threading
 import requests
-from json import JSONDecodeError
+from allen.decoder import loads
 from allen.exceptions import AllenInvalidResponse, AllenInvalidUsernamePassword
-from typing import Union
+from typing import Any, Dict, Union
 
-__all__ = ['fetch_jwt_from_otp', 'validate_response', 'require_otp']
+__all__ = ['fetch_jwt_from_otp', 'validate_response', 'require_otp', 'DEFAULT_BASE_URL']
+
+DEFAULT_BASE_URL = 'https://ddcapi.allenbpms.in'
+'''The url Allen's API is served from'''
+
+_file_locks: Dict[str, threading.Lock] = {}
+_file_locks_guard = threading.Lock()
 
 
 def validate_response(response: requests.Response):
@@ -16,8 +27,8 @@ def validate_response(response: requests.Response):
     checks = ['StudentID', 'UserID']
 
     try:
-        json = response.json()
-    except (TypeError, JSONDecodeError):
+        json = loads(response.content)
+    except (TypeError, ValueError):
         raise AllenInvalidResponse(response)
 
     if 'data' not in json:
@@ -40,7 +51,7 @@ def require_otp(response: requests.Response) -> Union[int, bool]:
     :return: False if OTP is not required, else the actual otp is returned.
     :meta private:
     """
-    json = response.json()
+    json = loads(response.content)
     checks = ['error', 'data']
 
     for check in checks:
@@ -59,7 +70,8 @@ def require_otp(response: requests.Response) -> Union[int, bool]:
         return False
 
 
-def fetch_jwt_from_otp(username: str, password: str, device_id: int, student_id: int):
+def fetch_jwt_from_otp(username: str, password: str, device_id: int, student_id: int,
+                       session=None, auth_url: str = DEFAULT_BASE_URL + '/oauth2', trace=None):
     """
     Fetch the JWT token based on the OTP generated.
 
@@ -67,18 +79,26 @@ def fetch_jwt_from_otp(username: str, password: str, device_id: int, student_id:
     :param password: The password used to log into Allen's website.
     :param device_id: A random generated id unique to the device.
     :param student_id: The id of the student in Allen's database.
+    :param session: The session or transport to send the request through, a new connection is used if not
+        specified.
+    :param auth_url: The url of the authentication endpoints.
+    :param trace: The :class:`instrumentation.RequestTrace` to record the request in, ``session`` must be a
+        :class:`transport.Transport` if specified.
     :return: The JWT token based on the username and password.
     :meta private:
     """
-    response = requests.post('https://ddcapi.allenbpms.in/oauth2/verifyotp', json={
+    if session is None:
+        session = requests
+
+    response = session.post(auth_url + '/verifyotp', json={
         'DeviceType': 'Web',
         'Devicetoken': device_id,
         'Password': password,
         'UserName': username,
         'g-recaptcha-response': 'otp',
         'StudentID': student_id
-    })
-    json = response.json()
+    }, **({'trace': trace} if trace is not None else {}))
+    json = loads(response.content)
 
     if 'data' not in json:
         raise AllenInvalidResponse(response)
@@ -88,3 +108,43 @@ def fetch_jwt_from_otp(username: str, password: str, device_id: int, student_id:
         raise AllenInvalidResponse(response)
 
     return json['jwt']
+
+
+def file_lock(path: Union[str, pathlib.Path]) -> threading.Lock:
+    """
+    Get the lock guarding the read-modify-write of a file, shared by every object of the process using that file.
+
+    :param path: The path of the file.
+    :return: The lock of the file.
+    :meta private:
+    """
+    key = os.path.abspath(path)
+    with _file_locks_guard:
+        lock = _file_locks.get(key)
+        if lock is None:
+            lock = _file_locks[key] = threading.Lock()
+        return lock
+
+
+def write_json_atomic(path: Union[str, pathlib.Path], obj: Any):
+    """
+    Replace a JSON file atomically, so that concurrent readers never see a partial write.
+    The JSON is written to a uniquely named temporary file next to the file, readable only by the current user.
+
+    :param path: The path of the file.
+    :param obj: The json object to write.
+    :meta private:
+    """
+    path = pathlib.Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix=path.name + '.', suffix='.tmp', dir=path.parent)
+    try:
+        with open(fd, 'w') as file:
+            json.dump(obj, file)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from allen.model import ClientBoundModel, DatedModel, SlotsModel
 from datetime import datetime
 from typing import List, Optional
 
@@ -6,7 +7,9 @@ __all__ = ['RecordedVideo', 'LiveClassDay', 'LiveClass']
 
 
 @dataclass(frozen=True, order=True)
-class RecordedVideo:
+class RecordedVideo(ClientBoundModel, DatedModel):
+    __slots__ = ('unique_code', 'subject_name', '_date', '_parsed_date', '_formatted_date')
+
     unique_code: str
     '''The unique code for the recorded video'''
 
@@ -28,9 +31,20 @@ class RecordedVideo:
         """
         unique_code = json_obj.get('UniqueCode')
         subject_name = json_obj.get('SubjectName')
-        cls.client = client
 
-        return RecordedVideo(unique_code, subject_name, date)
+        return RecordedVideo(unique_code, subject_name, date)._bind(client)
+
+    @classmethod
+    def from_json_many(cls, json_list: List[dict], date: str, client) -> List['RecordedVideo']:
+        """
+        Deserialize a list of video json dicts with :meth:`from_json`.
+
+        :param json_list: The json dictionaries to deserialize.
+        :param date: The date the lectures were recorded at.
+        :param client: The allen client.
+        :meta private:
+        """
+        return [RecordedVideo.from_json(json_obj, date, client) for json_obj in json_list]
 
     def get_link(self) -> str:
         """
@@ -38,23 +52,30 @@ class RecordedVideo:
 
         :return: The link of the video.
         """
-        json = self.client.fetch_json('dc/student/recordingplayer', post_data={'UniqueCode': self.unique_code})
+        client = self._require_client('get_link')
+        json = client.fetch_json('dc/student/recordingplayer', post_data={'UniqueCode': self.unique_code}, persist=True)
         return json['ClassURL']
 
+    @property
+    def date(self) -> Optional[datetime]:
+        """
+        The date the video was recorded, None if the date is invalid. The date is only parsed once.
+        """
+        return self._get_parsed_date()
+
     def get_recording_date(self) -> Optional[str]:
         """
         Returns the date of the recording in ``Thursday : 01 January 1970`` format.
 
         :return: The date if a valid date is present, else None.
         """
-        try:
-            return datetime.fromisoformat(self._date).strftime('%A : %d %B %Y')
-        except ValueError:
-            return None
+        return self._get_formatted_date()
 
 
 @dataclass(frozen=True, order=True)
-class LiveClass:
+class LiveClass(SlotsModel):
+    __slots__ = ('class_start_time', 'class_end_time', 'unique_code', 'subject_name', 'remaining_time')
+
     class_start_time: str
     '''The time the class starts in ``12:00PM`` format'''
 
@@ -86,9 +107,21 @@ class LiveClass:
 
         return LiveClass(class_start_time, class_end_time, unique_code, subject_name, remaining_time)
 
+    @classmethod
+    def from_json_many(cls, json_list: List[dict]) -> List['LiveClass']:
+        """
+        Deserialize a list of live class json dicts with :meth:`from_json`.
+
+        :param json_list: The json dictionaries to deserialize.
+        :meta private:
+        """
+        return [LiveClass.from_json(json_obj) for json_obj in json_list]
+
 
 @dataclass(frozen=True, order=True)
-class LiveClassDay:
+class LiveClassDay(SlotsModel, DatedModel):
+    __slots__ = ('class_day', '_date', 'live_classes', '_parsed_date', '_formatted_date')
+
     class_day: str
     '''The day of the live class, for example ``Wednesday``'''
 
@@ -112,13 +145,27 @@ class LiveClassDay:
 
         return LiveClassDay(class_day, _date, live_classes)
 
+    @classmethod
+    def from_json_many(cls, json_list: List[dict]) -> List['LiveClassDay']:
+        """
+        Deserialize a list of live class day json dicts with :meth:`from_json`.
+
+        :param json_list: The json dictionaries to deserialize.
+        :meta private:
+        """
+        return [LiveClassDay.from_json(json_obj) for json_obj in json_list]
+
+    @property
+    def date(self) -> Optional[datetime]:
+        """
+        The date of the live classes, None if the date is invalid. The date is only parsed once.
+        """
+        return self._get_parsed_date()
+
     def get_live_class_date(self) -> Optional[str]:
         """
         Returns the date of the live classes in ``Thursday : 01 January 1970`` format.
 
         :return: The date if a valid date is present, else None.
         """
-        try:
-            return datetime.fromisoformat(self._date).strftime('%A : %d %B %Y')
-        except ValueError:
-            return None
+        return self._get_formatted_date()
@@ -0,0 +1,101 @@
+"""
+Benchmarks of the columnar analytics against the equivalent loops over model objects.
+The table benchmarks are skipped when numpy is not installed.
+"""
+import importlib.util
+from allen import ProcessPipeline, SubjectSolution, TestRecord
+from allen.mock_server import make_solution, make_test_records
+from benchmarks.harness import benchmark
+
+SIZES = (10, 1000, 100000)
+TEST_COUNTS = (10, 100, 1000)
+
+
+def solutions_json(tests: int) -> dict:
+    return {str(test): make_solution(str(test))['listPaper'][0]['listSubject'] for test in range(tests)}
+
+
+@benchmark('analytics', SIZES)
+def subject_averages_objects(size: int):
+    records = TestRecord.from_json_many(make_test_records(size)['testList'], None)
+
+    def aggregate():
+        averages = {}
+        for name in ('biology', 'physics', 'chemistry', 'maths'):
+            marks = [getattr(record, name) for record in records if getattr(record, name) != -1]
+            averages[name] = sum(marks) / len(marks) if marks else float('nan')
+        return averages
+
+    return aggregate
+
+
+@benchmark('analytics', TEST_COUNTS)
+def attempt_rates_objects(tests: int):
+    solutions = [SubjectSolution.from_json_many(subjects) for subjects in solutions_json(tests).values()]
+
+    def aggregate():
+        totals, attempted = {}, {}
+        for subjects in solutions:
+            for subject in subjects:
+                for solution in subject.solutions:
+                    totals[subject.subject_name] = totals.get(subject.subject_name, 0) + 1
+                    if solution.response:
+                        attempted[subject.subject_name] = attempted.get(subject.subject_name, 0) + 1
+        return {name: attempted.get(name, 0) / total for name, total in totals.items()}
+
+    return aggregate
+
+
+if importlib.util.find_spec('numpy') is not None:
+    from allen.analytics import SolutionTable, TestRecordTable
+
+    @benchmark('analytics', SIZES)
+    def subject_averages_table(size: int):
+        table = TestRecordTable.from_json(make_test_records(size)['testList'])
+
+        def aggregate():
+            return table.subject_averages()
+
+        return aggregate
+
+    @benchmark('analytics', SIZES)
+    def test_record_table_from_json(size: int):
+        tests = make_test_records(size)['testList']
+
+        def load():
+            return TestRecordTable.from_json(tests)
+
+        return load
+
+    @benchmark('analytics', TEST_COUNTS)
+    def attempt_rates_table(tests: int):
+        table = SolutionTable.from_json(solutions_json(tests))
+
+        def aggregate():
+            return table.attempt_rates()
+
+        return aggregate
+
+    @benchmark('analytics', TEST_COUNTS)
+    def solution_table_from_json(tests: int):
+        solutions = solutions_json(tests)
+
+        def load():
+            return SolutionTable.from_json(solutions)
+
+        return load
+
+
+@benchmark('pipeline', (1, 'cpus'), rounds=3)
+def test_record_rows(workers):
+    """
+    Converting and formatting 200000 tests in the calling process, or on a pool of every CPU.
+    """
+    tests = make_test_records(200000)['testList']
+    pipeline = ProcessPipeline(max_workers=None if workers == 'cpus' else workers, chunk_size=20000)
+
+    def convert():
+        return pipeline.test_record_rows(tests)
+
+    convert.cleanup = pipeline.close
+    return convert
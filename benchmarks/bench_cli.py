@@ -0,0 +1,79 @@
+"""
+End to end benchmarks of the ``allen`` command, including interpreter start up.
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Dict
+from allen.mock_server import MockAllenServer, generate_fixtures
+from benchmarks.harness import benchmark
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@benchmark('cli', (30, 300), rounds=3)
+def allen_videos(recording_days: int):
+    server = MockAllenServer(fixtures=generate_fixtures(recording_days=recording_days), latency=0.002)
+    server.start()
+
+    home = tempfile.TemporaryDirectory()
+    with open(os.path.join(home.name, '.allen_login_details'), 'w') as file:
+        json.dump({'username': '1234', 'password': 'password'}, file)
+
+    env = dict(os.environ, HOME=home.name, USERPROFILE=home.name, ALLEN_BASE_URL=server.base_url,
+               PYTHONPATH=ROOT)
+    command = [sys.executable, '-c', 'from allen.command_line import main; main()', 'videos']
+
+    def run():
+        subprocess.run(command, env=env, check=True, stdout=subprocess.DEVNULL)
+
+    run.cleanup = lambda: (server.stop(), home.cleanup())
+    return run
+
+
+def import_times(module: str) -> Dict[str, int]:
+    """
+    Import a module in a fresh interpreter with ``-X importtime``.
+
+    :param module: The module to import.
+    :return: The cumulative import time of every module imported, in microseconds.
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            env=dict(os.environ, PYTHONPATH=ROOT), check=True, capture_output=True, text=True)
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_time, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@benchmark('cli', ('allen', 'allen.command_line'), rounds=5)
+def import_module(module: str):
+    command = [sys.executable, '-c', f'import {module}']
+    env = dict(os.environ, PYTHONPATH=ROOT)
+
+    def run():
+        subprocess.run(command, env=env, check=True)
+
+    return run
+
+
+@benchmark('cli', rounds=5)
+def allen_help():
+    command = [sys.executable, '-c', 'from allen.command_line import main; main()', 'help']
+    env = dict(os.environ, PYTHONPATH=ROOT)
+
+    def run():
+        subprocess.run(command, env=env, check=True, stdout=subprocess.DEVNULL)
+
+    return run
+
+
+if __name__ == '__main__':
+    for name in ('allen', 'allen.command_line', 'allen.allenclient'):
+        print(f'{name:<25}{import_times(name)[name] / 1000:>10.1f} ms')
@@ -0,0 +1,124 @@
+"""
+Benchmarks of the per-call overhead of :meth:`allen.AllenClient.fetch_json` against the local mock server.
+"""
+import pathlib
+import tempfile
+import requests
+from allen import AllenClient, BatchRunner, DEFAULT_TASKS, DiskCache, Instrumentation, Metrics
+from allen.mock_server import MockAllenServer, generate_fixtures
+from benchmarks.harness import benchmark
+
+CALLS = 100
+
+
+def start_server() -> MockAllenServer:
+    # Four recordings are generated per day, so every link resolved is unique.
+    server = MockAllenServer(fixtures=generate_fixtures(recording_days=CALLS // 4, tests=1))
+    server.start()
+    return server
+
+
+@benchmark('fetch', rounds=5)
+def raw_session_request():
+    """
+    The baseline: the same requests sent straight through a pooled session.
+    """
+    server = start_server()
+    session = requests.Session()
+    url = server.base_url + '/api/studentexamcalendar'
+    headers = {'Authorization': f'Bearer {server.issue_token()}'}
+
+    def fetch():
+        for _ in range(CALLS):
+            session.post(url, json={}, headers=headers).json()
+
+    fetch.cleanup = lambda: (session.close(), server.stop())
+    return fetch
+
+
+@benchmark('fetch', rounds=5)
+def fetch_json():
+    server = start_server()
+    client = AllenClient(jwt=server.issue_token(), base_url=server.base_url)
+
+    def fetch():
+        for _ in range(CALLS):
+            client.fetch_json('studentexamcalendar')
+
+    fetch.cleanup = lambda: (client.close(), server.stop())
+    return fetch
+
+
+@benchmark('fetch', ('noop', 'metrics'), rounds=5)
+def fetch_json_instrumented(instrumentation: str):
+    """
+    The overhead of tracing every request, compared to :func:`fetch_json`.
+    """
+    server = start_server()
+    instrumentation = Instrumentation() if instrumentation == 'noop' else Metrics()
+    client = AllenClient(jwt=server.issue_token(), base_url=server.base_url, instrumentation=instrumentation)
+
+    def fetch():
+        for _ in range(CALLS):
+            client.fetch_json('studentexamcalendar')
+
+    fetch.cleanup = lambda: (client.close(), server.stop())
+    return fetch
+
+
+@benchmark('fetch', rounds=5)
+def resolve_links():
+    server = start_server()
+    client = AllenClient(jwt=server.issue_token(), base_url=server.base_url)
+    videos = client.get_recorded_videos()
+
+    def resolve():
+        client.resolve_links(videos)
+
+    resolve.cleanup = lambda: (client.close(), server.stop())
+    return resolve
+
+
+@benchmark('fetch', rounds=5)
+def disk_cache_get():
+    """
+    Reading persisted video links from a warm :class:`allen.DiskCache`, the hot path of ``get_link`` between runs.
+    """
+    directory = tempfile.TemporaryDirectory()
+    cache = DiskCache(pathlib.Path(directory.name) / 'cache.sqlite3')
+    for i in range(CALLS):
+        cache.set(['dc/student/recordingplayer', i], {'ClassURL': f'https://videos.example.com/{i}'})
+
+    def read():
+        for i in range(CALLS):
+            cache.get(['dc/student/recordingplayer', i])
+
+    read.cleanup = lambda: (cache.close(), directory.cleanup())
+    return read
+
+
+@benchmark('fetch', ('serial', 'batch'), rounds=3)
+def many_accounts(mode: str):
+    """
+    Logging into 20 accounts and fetching their recordings, tests and exams one account at a time or with
+    :class:`allen.BatchRunner`.
+    """
+    # Latency stands in for the round trips to Allen's API, which dominate a real run.
+    server = MockAllenServer(fixtures=generate_fixtures(recording_days=5, tests=5), latency=0.01)
+    server.start()
+    accounts = [(str(i), 'password') for i in range(20)]
+
+    def serial():
+        for username, password in accounts:
+            with AllenClient(username=username, password=password, base_url=server.base_url) as client:
+                for task in DEFAULT_TASKS.values():
+                    task(client)
+
+    def batch():
+        with BatchRunner(base_url=server.base_url) as runner:
+            for _ in runner.run(accounts):
+                pass
+
+    run = serial if mode == 'serial' else batch
+    run.cleanup = server.stop
+    return run
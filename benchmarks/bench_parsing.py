@@ -0,0 +1,123 @@
+"""
+Benchmarks of the ``from_json`` deserializers and the JSON decoders over synthetic payloads.
+"""
+import importlib.util
+import json
+from allen import AddonClass, RecordedVideo, SubjectSolution, TestRecord
+from allen.mock_server import make_addons, make_recordings, make_solution, make_test_records
+from allen.decoder import BACKENDS, loads, set_decoder
+from benchmarks.harness import benchmark
+
+SIZES = (10, 1000, 100000)
+
+
+def truncate(lists: list, size: int):
+    """
+    Truncate the lists in place, in order, so that they hold exactly ``size`` items in total.
+    """
+    for items in lists:
+        del items[size:]
+        size -= len(items)
+
+
+def make_recording_days(size: int) -> list:
+    days = make_recordings(-(-size // 4))
+    truncate([day['listClass'] for day in days], size)
+    return days
+
+
+def make_solution_subjects(size: int) -> list:
+    subjects = make_solution('1000', questions=-(-size // 3))['listPaper'][0]['listSubject']
+    truncate([subject['listQuestion'] for subject in subjects], size)
+    for subject in subjects:
+        subject['QTo'] = len(subject['listQuestion'])
+    return subjects
+
+
+def make_addon_classes(size: int) -> list:
+    chapters = -(-size // 30)
+    addons = make_addons(chapters=chapters, per_chapter=-(-size // (3 * chapters)))
+    truncate([chapter['listClass'] for addon in addons for chapter in addon['listChapter']], size)
+    for addon in addons:
+        addon['listChapter'] = [chapter for chapter in addon['listChapter'] if chapter['listClass']]
+    return addons
+
+
+@benchmark('parsing', SIZES)
+def recorded_video_from_json(size: int):
+    days = make_recording_days(size)
+
+    def parse():
+        return [RecordedVideo.from_json(video, day['ClassDate'], None) for day in days for video in day['listClass']]
+
+    return parse
+
+
+@benchmark('parsing', SIZES)
+def test_record_from_json(size: int):
+    tests = make_test_records(size)['testList']
+
+    def parse():
+        return [TestRecord.from_json(test, None) for test in tests]
+
+    return parse
+
+
+@benchmark('parsing', SIZES)
+def subject_solution_from_json(size: int):
+    subjects = make_solution_subjects(size)
+
+    def parse():
+        return [SubjectSolution.from_json(subject) for subject in subjects]
+
+    return parse
+
+
+@benchmark('parsing', SIZES)
+def addon_class_from_json(size: int):
+    addons = make_addon_classes(size)
+
+    def parse():
+        return [AddonClass.from_json(addon, None) for addon in addons]
+
+    return parse
+
+
+@benchmark('parsing', SIZES)
+def recorded_video_dates(size: int):
+    """
+    Grouping freshly parsed recordings by their formatted date, then sorting every group by date twice.
+    """
+    days = make_recording_days(size)
+
+    def group():
+        groups = {}
+        for day in days:
+            for video in RecordedVideo.from_json_many(day['listClass'], day['ClassDate'], None):
+                groups.setdefault(video.get_recording_date(), []).append(video)
+        for videos in groups.values():
+            videos.sort(key=RecordedVideo.get_recording_date)
+            videos.sort(key=RecordedVideo.get_recording_date, reverse=True)
+        return groups
+
+    return group
+
+
+def decoder_factory(backend: str):
+    def factory():
+        body = json.dumps({'data': make_recordings(25000), 'error': 'False'}).encode('utf-8')
+
+        def decode():
+            loads(body)
+
+        set_decoder(backend)
+        decode.cleanup = set_decoder
+        return decode
+
+    factory.__name__ = f'decode_recordinglist_{backend}'
+    return factory
+
+
+for _backend in BACKENDS:
+    if _backend == 'json' or importlib.util.find_spec(_backend) is not None:
+        benchmark('decoding')(decoder_factory(_backend))
@@ -0,0 +1,129 @@
+"""
+A minimal benchmark harness. Benchmarks register themselves with :func:`benchmark` and are timed by
+:func:`run_benchmarks`, which returns machine-readable results.
+"""
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional
+
+REGISTRY = []
+
+
+def benchmark(group: str, params: Iterable = (None,), rounds: int = 5, warmup: int = 1):
+    """
+    Register a benchmark. The decorated function receives a parameter and returns the callable to time,
+    so any setup it performs is not measured.
+
+    :param group: The group the benchmark belongs to.
+    :param params: The parameters the benchmark is run with.
+    :param rounds: The number of timed rounds.
+    :param warmup: The number of untimed rounds run first.
+    """
+
+    def decorator(func: Callable[..., Callable[[], object]]):
+        for param in params:
+            REGISTRY.append({'group': group, 'name': func.__name__, 'param': param, 'factory': func,
+                             'rounds': rounds, 'warmup': warmup})
+        return func
+
+    return decorator
+
+
+def measure(func: Callable[[], object], rounds: int, warmup: int) -> Dict[str, float]:
+    """
+    Time a callable.
+
+    :return: A dict of timing statistics in seconds.
+    """
+    for _ in range(warmup):
+        func()
+
+    timings = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    return {
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'mean': statistics.mean(timings),
+        'stdev': statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        'rounds': rounds
+    }
+
+
+def run_benchmarks(name_filter: Optional[str] = None, max_param: Optional[int] = None,
+                   report: Callable[[dict], None] = None) -> List[dict]:
+    """
+    Run the registered benchmarks.
+
+    :param name_filter: Only run benchmarks whose ``group.name`` contains this string.
+    :param max_param: Skip benchmarks with an integer parameter larger than this.
+    :param report: Called with each result as soon as it is available.
+    :return: A list of results.
+    """
+    results = []
+    for entry in REGISTRY:
+        full_name = f'{entry["group"]}.{entry["name"]}'
+        if name_filter is not None and name_filter not in full_name:
+            continue
+        if max_param is not None and isinstance(entry['param'], int) and entry['param'] > max_param:
+            continue
+
+        func = entry['factory'](entry['param']) if entry['param'] is not None else entry['factory']()
+        try:
+            stats = measure(func, entry['rounds'], entry['warmup'])
+        finally:
+            cleanup = getattr(func, 'cleanup', None)
+            if cleanup is not None:
+                cleanup()
+
+        result = {'group': entry['group'], 'name': entry['name'], 'param': entry['param'], **stats}
+        results.append(result)
+        if report is not None:
+            report(result)
+
+    return results
+
+
+def metadata() -> dict:
+    """
+    :return: A description of the environment the benchmarks ran in.
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': sys.version,
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'commit': commit or None
+    }
+
+
+def result_key(result: dict) -> str:
+    return f'{result["group"]}.{result["name"]}[{result["param"]}]'
+
+
+def load_results(path: str) -> Dict[str, dict]:
+    """
+    :return: The results of a previous run keyed by benchmark.
+    """
+    with open(path, 'r') as file:
+        return {result_key(result): result for result in json.load(file)['results']}
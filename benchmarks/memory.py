@@ -0,0 +1,68 @@
+"""
+Measure the memory used per model object, compared to an equivalent dataclass which stores its attributes
+in a per-instance ``__dict__``.
+
+Usage::
+
+    python -m benchmarks.memory [count]
+"""
+import dataclasses
+import sys
+import tracemalloc
+from allen import AddonVideo, Examination, LiveClass, RecordedVideo, Solution, TestRecord
+
+SAMPLES = {
+    RecordedVideo: ('UNIQUE-CODE-0001', 'Physics', '2021-06-01T00:00:00'),
+    LiveClass: ('10:00AM', '11:30AM', 'UNIQUE-CODE-0001', 'Physics', 3600),
+    Solution: (1, 'A', 'https://example.com/solutions/0001.png'),
+    AddonVideo: ('UNIQUE-CODE-0001', '1'),
+    TestRecord: (-1, 50, 60, 70, 180, 60.0, 12, 'TEST-01', '2021-06-01T00:00:00', '99'),
+    Examination: ('JEE MAIN. PATTERN', 'Full', 'Kota', 'Sunday', 'TEST-01', '09:00AM', '2021-06-06T00:00:00'),
+}
+
+
+def dict_based(cls):
+    """
+    :return: A frozen dataclass with the same fields as the model but without ``__slots__``.
+    """
+    fields = [(field.name, field.type) for field in dataclasses.fields(cls)]
+    return dataclasses.make_dataclass(f'Dict{cls.__name__}', fields, frozen=True, order=True)
+
+
+def bytes_per_object(cls, args: tuple, count: int) -> float:
+    """
+    :return: The average number of bytes allocated per object when creating ``count`` objects.
+    """
+    # Build the arguments first so only the objects themselves are measured.
+    rows = [args] * count
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [cls(*row) for row in rows]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    del objects
+    return (after - before) / count
+
+
+def run(count: int = 100000) -> dict:
+    """
+    :return: A dict mapping each model to its bytes per object with and without ``__slots__``.
+    """
+    results = {}
+    for cls, args in SAMPLES.items():
+        slotted = bytes_per_object(cls, args, count)
+        with_dict = bytes_per_object(dict_based(cls), args, count)
+        results[cls.__name__] = {'slots': slotted, 'dict': with_dict, 'saved': with_dict - slotted}
+    return results
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print(f'{"Model":<15}{"__slots__":>12}{"__dict__":>12}{"Saved":>12}   (bytes per object, {count} objects)')
+    for name, result in run(count).items():
+        print(f'{name:<15}{result["slots"]:>12.1f}{result["dict"]:>12.1f}{result["saved"]:>12.1f}')
+
+
+if __name__ == '__main__':
+    main()
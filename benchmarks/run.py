@@ -0,0 +1,47 @@
+"""
+Run the benchmark suite and write the results to a JSON file.
+
+Usage::
+
+    python -m benchmarks.run [--output results.json] [--compare previous.json] [--filter parsing] [--quick]
+
+Comparing against the results of a previous release prints the change of each benchmark's median,
+so regressions are visible between releases.
+"""
+import argparse
+import importlib
+import json
+from benchmarks.harness import load_results, metadata, result_key, run_benchmarks
+
+MODULES = ['benchmarks.bench_parsing', 'benchmarks.bench_analytics', 'benchmarks.bench_fetch', 'benchmarks.bench_cli']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the AllenPyClient benchmark suite.')
+    parser.add_argument('--output', default='benchmark-results.json', help='the file to write the results to')
+    parser.add_argument('--compare', help='the results of a previous run to compare against')
+    parser.add_argument('--filter', help='only run benchmarks whose name contains this string')
+    parser.add_argument('--quick', action='store_true', help='skip the largest payloads')
+    args = parser.parse_args()
+
+    for module in MODULES:
+        importlib.import_module(module)
+
+    previous = load_results(args.compare) if args.compare else {}
+
+    def report(result: dict):
+        line = f'{result_key(result):<55}{result["median"] * 1000:>12.3f} ms'
+        before = previous.get(result_key(result))
+        if before is not None:
+            line += f'{(result["median"] / before["median"] - 1) * 100:>+10.1f}%'
+        print(line, flush=True)
+
+    results = run_benchmarks(args.filter, 1000 if args.quick else None, report)
+
+    with open(args.output, 'w') as file:
+        json.dump({'meta': metadata(), 'results': results}, file, indent=2)
+    print(f'Results written to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -22,6 +22,13 @@ setup(
         'Programming Language :: Python :: 3.9',
     ],
     install_requires=['requests', 'termcolor', 'stdiomask'],
+    extras_require={
+        'async': ['aiohttp'],
+        'fast': ['orjson'],
+        'analytics': ['numpy'],
+        'prometheus': ['prometheus_client'],
+        'opentelemetry': ['opentelemetry-api']
+    },
     packages=find_packages(),
     include_package_data=True,
     entry_points={
@@ -0,0 +1,110 @@
+import asyncio
+import json
+import threading
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+
+class FakeAdapter(BaseAdapter):
+    """
+    A transport adapter answering requests with canned JSON payloads instead of using the network.
+    """
+
+    def __init__(self, routes: dict = None):
+        """
+        :param routes: A dict mapping url paths to a payload, or to a callable receiving the request.
+        """
+        super().__init__()
+        self.routes = routes if routes is not None else {}
+        self.requests = []
+        self.closed = False
+        self._lock = threading.Lock()
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        with self._lock:
+            self.requests.append(request)
+
+        path = request.path_url.split('?')[0]
+        route = self.routes.get(path)
+        if callable(route):
+            route = route(request)
+
+        status = 200
+        headers = {}
+        if route is None:
+            status, payload = 404, {'data': None}
+        elif isinstance(route, tuple):
+            status, payload = route[0], route[1]
+            if len(route) > 2:
+                headers = route[2]
+        else:
+            payload = {'data': route, 'error': 'False'}
+
+        response = Response()
+        response.status_code = status
+        response._content = payload if isinstance(payload, bytes) else json.dumps(payload).encode('utf-8')
+        response._content_consumed = True
+        response.headers = CaseInsensitiveDict({'Content-Type': 'application/json', **headers})
+        response.url = request.url
+        response.request = request
+        response.encoding = 'utf-8'
+        return response
+
+    def close(self):
+        self.closed = True
+
+    def paths(self) -> list:
+        """
+        :return: The url paths requested so far, in order.
+        """
+        return [request.path_url.split('?')[0] for request in self.requests]
+
+
+def body_of(request: PreparedRequest) -> dict:
+    """
+    :return: The decoded JSON body of a request.
+    """
+    return json.loads(request.body) if request.body else {}
+
+
+class FakeAsyncResponse:
+    """
+    The subset of ``aiohttp.ClientResponse`` used by the async client.
+    """
+
+    def __init__(self, response: Response):
+        self.status = response.status_code
+        self.url = response.url
+        self.headers = response.headers
+        self._content = response.content
+
+    async def read(self) -> bytes:
+        # Yield to the loop like a real read, so that concurrent requests interleave.
+        await asyncio.sleep(0)
+        return self._content
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+class FakeAsyncSession:
+    """
+    The subset of ``aiohttp.ClientSession`` used by the async client, answered by a :class:`FakeAdapter`.
+    """
+
+    def __init__(self, adapter: FakeAdapter):
+        self.adapter = adapter
+        self.closed = False
+
+    def request(self, method: str, url: str, **kwargs) -> FakeAsyncResponse:
+        from requests import Request
+        request = Request(method, url, headers=kwargs.get('headers'), params=kwargs.get('params'),
+                          json=kwargs.get('json')).prepare()
+        return FakeAsyncResponse(self.adapter.send(request))
+
+    async def close(self):
+        self.closed = True
@@ -0,0 +1,158 @@
+import importlib.util
+import unittest
+from collections import Counter
+from allen import AllenClient, SubjectSolution
+from allen.mock_server import make_solution, make_test_records
+from allen.test_record import TestRecord as Record
+from test.test_session import make_session
+
+if importlib.util.find_spec('numpy') is not None:
+    import numpy as np
+    from allen.analytics import SolutionTable, TestRecordTable as Table
+
+TESTS = make_test_records(8)['testList']
+SOLUTIONS = {test['TestID']: make_solution(test['TestID'], questions=5)['listPaper'][0]['listSubject']
+             for test in TESTS}
+
+
+@unittest.skipIf(importlib.util.find_spec('numpy') is None, 'numpy is not installed')
+class TestRecordTableTestCase(unittest.TestCase):
+    """
+    Tests for the columnar table of test records.
+    """
+
+    def test_from_json_matches_records(self):
+        table = Table.from_json(TESTS)
+        records = [Record.from_json(test, None) for test in TESTS]
+
+        self.assertEqual(len(table), len(TESTS))
+        self.assertEqual(table.physics.dtype, np.int64)
+        self.assertEqual(table.percentage.dtype, np.float64)
+        self.assertEqual(table.test_date.dtype, np.dtype('datetime64[s]'))
+
+        from_records = Table.from_records(records)
+        for name in Table.COLUMNS:
+            self.assertEqual(np.ma.getmaskarray(table.to_arrays()[name]).tolist(),
+                             np.ma.getmaskarray(from_records.to_arrays()[name]).tolist(), msg=name)
+            self.assertEqual(np.ma.filled(getattr(table, name), 0).tolist(),
+                             np.ma.filled(getattr(from_records, name), 0).tolist(), msg=name)
+
+    def test_missing_subjects_are_masked(self):
+        table = Table.from_json(TESTS)
+        self.assertEqual(table.biology.mask.tolist(), [test['Bio'] == '-' for test in TESTS])
+        self.assertEqual(table.maths.mask.tolist(), [test['Math'] == '-' for test in TESTS])
+
+        averages = table.subject_averages()
+        bio = [int(test['Bio']) for test in TESTS if test['Bio'] != '-']
+        self.assertAlmostEqual(averages['biology'], sum(bio) / len(bio))
+
+        negative = dict(TESTS[0], Bio='-4')
+        self.assertEqual(Table.from_json([negative]).biology.tolist(), [-4])
+
+        only_maths = [dict(test, Bio='-') for test in TESTS]
+        self.assertTrue(np.isnan(Table.from_json(only_maths).subject_averages()['biology']))
+
+    def test_invalid_marks_raise(self):
+        with self.assertRaises(ValueError):
+            Table.from_json([dict(TESTS[0], Phy='-')])
+
+    def test_moving_average_and_percentiles(self):
+        table = Table.from_json(TESTS[::-1]).sort_by_date()
+        self.assertEqual(table.test_id.tolist(), [test['TestID'] for test in TESTS])
+
+        expected = [sum(float(test['Per']) for test in TESTS[i:i + 3]) / 3 for i in range(len(TESTS) - 2)]
+        np.testing.assert_allclose(table.moving_average('percentage', 3), expected)
+
+        bio = table.moving_average('biology', 1)
+        self.assertEqual(np.isnan(bio).tolist(), [test['Bio'] == '-' for test in TESTS])
+
+        ranks = [int(test['Rank']) for test in TESTS]
+        np.testing.assert_allclose(table.rank_percentiles(50), np.median(ranks))
+        self.assertEqual(len(table[table.rank < np.median(ranks)]), sum(rank < np.median(ranks) for rank in ranks))
+
+    def test_client_fetches_table(self):
+        session, _ = make_session({'/api/studenttestrecord': {'testList': TESTS}})
+        client = AllenClient(jwt='jwt', session=session)
+        self.assertEqual(client.get_test_record_table().test_id.tolist(), [test['TestID'] for test in TESTS])
+
+
+@unittest.skipIf(importlib.util.find_spec('numpy') is None, 'numpy is not installed')
+class SolutionTableTestCase(unittest.TestCase):
+    """
+    Tests for the packed table of the solutions of many tests.
+    """
+
+    def setUp(self):
+        self.solutions = {test_id: SubjectSolution.from_json_many(subjects) for test_id, subjects in SOLUTIONS.items()}
+        self.table = SolutionTable.from_json(SOLUTIONS)
+
+    def questions(self):
+        for test_id, subjects in self.solutions.items():
+            for subject in subjects:
+                for solution in subject.solutions:
+                    yield test_id, subject.subject_name, solution
+
+    def test_packs_every_question(self):
+        table = self.table
+        self.assertEqual(table.test_ids, tuple(SOLUTIONS))
+        self.assertEqual(table.subjects, ('Physics', 'Chemistry', 'Maths'))
+        self.assertEqual(len(table), len(list(self.questions())))
+
+        rows = [(table.test_ids[test], table.subjects[subject], int(number), table.responses[response])
+                for test, subject, number, response in zip(table.test, table.subject, table.question_no,
+                                                           table.response)]
+        self.assertEqual(rows, [(test_id, name, solution.question_no, solution.response)
+                                for test_id, name, solution in self.questions()])
+
+        from_solutions = SolutionTable.from_solutions(self.solutions)
+        self.assertEqual(from_solutions.responses, table.responses)
+        self.assertEqual(from_solutions.response.tolist(), table.response.tolist())
+
+    def test_queries_match_loops(self):
+        questions = list(self.questions())
+
+        for name, rate in self.table.attempt_rates().items():
+            responses = [solution.response for _, subject, solution in questions if subject == name]
+            self.assertAlmostEqual(rate, sum(response != '' for response in responses) / len(responses))
+
+        self.assertEqual(self.table.unattempted_counts(),
+                         dict(Counter(subject for _, subject, solution in questions if solution.response == '')))
+        self.assertEqual({response: count for response, count in self.table.response_histogram('Maths').items()
+                          if count}, dict(Counter(solution.response for _, subject, solution in questions
+                                                  if subject == 'Maths')))
+
+        attempts = self.table.attempts_by_test()
+        self.assertEqual(attempts.shape, (len(SOLUTIONS), 3))
+        self.assertEqual(attempts.sum(), sum(solution.response != '' for _, _, solution in questions))
+
+        numbers, rates = self.table.question_attempt_rates('Physics')
+        self.assertEqual(numbers.tolist(), [1, 2, 3, 4, 5])
+        first = [solution.response != '' for _, subject, solution in questions
+                 if subject == 'Physics' and solution.question_no == 1]
+        self.assertAlmostEqual(rates[0], sum(first) / len(first))
+
+    def test_concat(self):
+        test_ids = list(SOLUTIONS)
+        parts = [SolutionTable.from_json({test_id: SOLUTIONS[test_id]}) for test_id in test_ids[::-1]]
+        table = SolutionTable.concat(parts)
+        expected = SolutionTable.from_json({test_id: SOLUTIONS[test_id] for test_id in test_ids[::-1]})
+
+        self.assertEqual(table.test_ids, expected.test_ids)
+        self.assertEqual(table.responses, expected.responses)
+        for column in ('test', 'subject', 'question_no', 'response'):
+            self.assertEqual(getattr(table, column).tolist(), getattr(expected, column).tolist(), column)
+        self.assertEqual(table.attempt_rates(), expected.attempt_rates())
+        self.assertEqual(len(SolutionTable.concat([])), 0)
+
+    def test_empty_and_unattempted_responses(self):
+        self.assertEqual(len(SolutionTable.from_json({})), 0)
+
+        subjects = [{'SubjectName': 'PHYSICS', 'listQuestion': [{'QuestionNo': 1, 'Response': None},
+                                                                {'QuestionNo': 2, 'Response': 'A'}]}]
+        table = SolutionTable.from_json({'1': subjects})
+        self.assertEqual(table.response_histogram(), {'': 1, 'A': 1})
+        self.assertEqual(table.attempt_rates(), {'Physics': 0.5})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+import asyncio
+import unittest
+from allen import AsyncAllenClient, AllenClientNotBound, AllenResponseUnavailable, RecordedVideo, TransportPolicy
+from allen.test_record import TestRecord as Record
+from test.fake_adapter import FakeAdapter, FakeAsyncSession, body_of
+
+
+def player(request):
+    code = body_of(request)['UniqueCode']
+    if code == 'broken':
+        return 500, {'data': None}
+    return {'ClassURL': f'https://videos.example.com/{code}'}
+
+
+ROUTES = {
+    '/oauth2/astoken': {'StudentID': 10, 'UserID': 20, 'OTP': None, 'jwt': 'token'},
+    '/api/dc/student/recordinglist': [{'ClassDate': '2021-06-01T00:00:00', 'listClass': [
+        {'UniqueCode': 'a', 'SubjectName': 'Physics'},
+        {'UniqueCode': 'broken', 'SubjectName': 'Maths'},
+    ]}],
+    '/api/dc/student/recordingplayer': player,
+    '/api/studenttestrecord': {'testList': [{
+        'Bio': '-', 'Phy': '50', 'Chem': '60', 'Math': '70', 'Total': '180', 'Per': '60.0', 'Rank': '12',
+        'TestName': 'TEST-01', 'TestDate': '2021-06-01T00:00:00', 'TestID': '99'
+    }]},
+    '/api/GetTestSolution': {'listPaper': [{'listSubject': [
+        {'SubjectName': 'PHYSICS', 'QTo': 1,
+         'listQuestion': [{'QuestionNo': 1, 'Response': 'A', 'SolutionImage': 'https://img/1.png'}]}
+    ]}]},
+}
+
+
+class AsyncClientTestCase(unittest.TestCase):
+    """
+    Offline tests for the asyncio client.
+    """
+
+    def setUp(self):
+        self.adapter = FakeAdapter(dict(ROUTES))
+        self.session = FakeAsyncSession(self.adapter)
+
+    def run_client(self, coroutine_function):
+        async def run():
+            async with AsyncAllenClient(username='1234', password='pass', session=self.session) as client:
+                return await coroutine_function(client)
+
+        return asyncio.run(run())
+
+    def test_login_once_then_fetch(self):
+        async def fetch(client):
+            return await asyncio.gather(client.get_recorded_videos(), client.get_test_records())
+
+        videos, records = self.run_client(fetch)
+
+        self.assertEqual(videos[0], RecordedVideo('a', 'Physics', '2021-06-01T00:00:00'))
+        self.assertIsInstance(records[0], Record)
+        self.assertEqual(records[0].biology, -1)
+        self.assertEqual(self.adapter.paths().count('/oauth2/astoken'), 1)
+        self.assertFalse(self.session.closed)
+
+    def test_resolve_links_and_solutions(self):
+        async def fetch(client):
+            videos = await client.get_recorded_videos()
+            records = await client.get_test_records()
+            return await client.resolve_links(videos), await client.get_subject_solutions(records[0])
+
+        links, solutions = self.run_client(fetch)
+
+        self.assertEqual(links[0].link, 'https://videos.example.com/a')
+        self.assertIsInstance(links[1].error, AllenResponseUnavailable)
+        self.assertEqual(solutions[0].subject_name, 'Physics')
+        self.assertEqual(solutions[0].solutions[0].response, 'A')
+
+    def test_solutions_for_many_tests(self):
+        async def fetch(client):
+            records = await client.get_test_records()
+            return await client.get_solutions_for(records * 2, papers=(1, 2))
+
+        solutions = self.run_client(fetch)
+
+        self.assertEqual(list(solutions), ['99'])
+        self.assertEqual([result.paper_no for result in solutions['99'].values()], [1, 2])
+        self.assertEqual(solutions['99'][2].solutions[0].subject_name, 'Physics')
+        self.assertEqual(sorted(body_of(request)['PaperNo'] for request in self.adapter.requests
+                                if request.path_url == '/api/GetTestSolution'), [1, 2])
+
+    def test_results_are_not_bound_to_the_async_client(self):
+        async def fetch(client):
+            return await client.get_recorded_videos(), await client.get_test_records()
+
+        videos, records = self.run_client(fetch)
+
+        self.assertIsNone(videos[0].client)
+        with self.assertRaisesRegex(AllenClientNotBound, r'await client\.get_link\('):
+            videos[0].get_link()
+        with self.assertRaisesRegex(AllenClientNotBound, r'await client\.get_subject_solutions\('):
+            records[0].get_subject_solutions()
+
+    def test_client_created_outside_the_loop(self):
+        client = AsyncAllenClient(username='1234', password='pass', session=self.session, max_concurrency=1)
+
+        async def fetch():
+            return await asyncio.gather(client.get_recorded_videos(), client.get_test_records())
+
+        for _ in range(2):
+            videos, records = asyncio.run(fetch())
+            self.assertEqual(videos[0].unique_code, 'a')
+        self.assertEqual(self.adapter.paths().count('/oauth2/astoken'), 1)
+
+    def test_rejected_token_logs_in_again(self):
+        issued = []
+
+        def login(request):
+            issued.append(f'token-{len(issued)}')
+            return {'StudentID': 10, 'UserID': 20, 'OTP': None, 'jwt': issued[-1]}
+
+        def calendar(request):
+            if request.headers['Authorization'] == 'Bearer token-0':
+                return 401, {'data': None}
+            return []
+
+        self.adapter.routes.update({'/oauth2/astoken': login, '/api/studentexamcalendar': calendar})
+        self.run_client(lambda client: asyncio.gather(client.get_exam_calendar(), client.get_exam_calendar()))
+
+        self.assertEqual(issued, ['token-0', 'token-1'])
+
+    def test_failed_requests_are_retried(self):
+        statuses = [503, 503]
+
+        def calendar(request):
+            return (statuses.pop(), {'data': None}) if statuses else []
+
+        self.adapter.routes['/api/studentexamcalendar'] = calendar
+
+        async def fetch():
+            async with AsyncAllenClient(jwt='token', session=self.session,
+                                        transport=TransportPolicy(max_retries=2, backoff_factor=0)) as client:
+                return await client.get_exam_calendar()
+
+        self.assertEqual(asyncio.run(fetch()), [])
+        self.assertEqual(self.adapter.paths().count('/api/studentexamcalendar'), 3)
+
+    def test_failed_otp_verification_raises(self):
+        self.adapter.routes.update({
+            '/oauth2/astoken': (200, {'data': {'StudentID': 10, 'UserID': 20, 'OTP': 1234}, 'error': 'True'}),
+            '/oauth2/verifyotp': (500, {'data': None}),
+        })
+
+        with self.assertRaises(AllenResponseUnavailable):
+            self.run_client(lambda client: client.get_exam_calendar())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import threading
+import unittest
+from allen import Account, AllenInvalidUsernamePassword, AllenResponseUnavailable, BatchRunner, TransportPolicy
+from test.fake_adapter import body_of
+from test.test_session import make_session
+
+RECORDINGS = [{'ClassDate': '2021-06-01T00:00:00', 'listClass': [{'UniqueCode': 'code-1', 'SubjectName': 'Physics'}]}]
+RECORDS = {'testList': [{
+    'Bio': '-', 'Phy': '50', 'Chem': '60', 'Math': '70', 'Total': '180', 'Per': '60.0', 'Rank': '12',
+    'TestName': 'TEST-01', 'TestDate': '2021-06-01T00:00:00', 'TestID': '99'
+}]}
+
+
+def login(request):
+    username = body_of(request)['UserName']
+    if username == 'wrong':
+        return {'StudentID': 0, 'UserID': 0, 'OTP': None}
+    return {'StudentID': 10, 'UserID': 20, 'OTP': None, 'jwt': f'jwt-{username}'}
+
+
+def calendar(request):
+    if request.headers['Authorization'] == 'Bearer broken':
+        return 503, {'data': None}
+    return []
+
+
+class BatchRunnerTestCase(unittest.TestCase):
+    """
+    Offline tests for fetching the data of many accounts at once.
+    """
+
+    def setUp(self):
+        self.session, self.adapter = make_session({
+            '/oauth2/astoken': login,
+            '/api/dc/student/recordinglist': RECORDINGS,
+            '/api/studenttestrecord': RECORDS,
+            '/api/studentexamcalendar': calendar,
+        })
+
+    def make_runner(self, **kwargs) -> BatchRunner:
+        return BatchRunner(session=self.session, transport=TransportPolicy(max_retries=0), **kwargs)
+
+    def test_runs_every_task_of_every_account(self):
+        accounts = [(str(i), 'pass') for i in range(20)] + ['token']
+        results = list(self.make_runner(max_workers=4).run(accounts))
+
+        self.assertEqual(len(results), 21)
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual({result.account for result in results}, {Account.of(account) for account in accounts})
+        for result in results:
+            self.assertEqual(set(result.results), {'recorded_videos', 'test_records', 'exam_calendar'})
+            self.assertIs(result.results['test_records'][0]._client, result.client)
+
+        self.assertEqual(self.adapter.paths().count('/oauth2/astoken'), 20)
+        self.assertEqual(self.adapter.paths().count('/api/studenttestrecord'), 21)
+
+    def test_failures_are_reported_per_account(self):
+        results = {result.account: result for result in self.make_runner().run([('wrong', 'pass'), 'broken'])}
+
+        wrong = results[Account('wrong', 'pass')]
+        self.assertIsInstance(wrong.error, AllenInvalidUsernamePassword)
+        self.assertIsNone(wrong.client)
+
+        broken = results[Account(jwt='broken')]
+        self.assertFalse(broken.ok)
+        self.assertIsInstance(broken.errors['exam_calendar'], AllenResponseUnavailable)
+        self.assertEqual(set(broken.results), {'recorded_videos', 'test_records'})
+
+    def test_accounts_are_read_lazily_and_share_the_rate_limit(self):
+        read = []
+
+        def accounts():
+            for i in range(10):
+                read.append(i)
+                yield f'token-{i}'
+
+        runner = self.make_runner(max_workers=2, rate_limit=1000, tasks={'calendar': lambda c: c.get_exam_calendar()})
+        results = runner.run(accounts())
+        next(results)
+        self.assertLess(len(read), 10)
+        self.assertEqual(len(list(results)), 9)
+
+        client = runner.login(Account(jwt='token'))
+        self.assertIs(client.session, self.session)
+        self.assertIs(client.transport.rate_limiter, runner.rate_limiter)
+
+    def test_tasks_overlap_across_accounts(self):
+        barrier = threading.Barrier(3, timeout=5)
+
+        def task(client):
+            barrier.wait()
+            return client._jwt
+
+        results = list(self.make_runner(max_workers=3, tasks={'wait': task}).run(['a', 'b', 'c']))
+        self.assertEqual(sorted(result.results['wait'] for result in results), ['a', 'b', 'c'])
+
+    def test_only_the_owned_session_is_closed(self):
+        with self.make_runner():
+            pass
+        self.assertFalse(self.adapter.closed)
+
+        with BatchRunner(max_workers=8) as runner:
+            self.assertEqual(runner.session.get_adapter('https://ddcapi.allenbpms.in')._pool_maxsize, 8)
+            runner.session.mount('https://', self.adapter)
+        self.assertTrue(self.adapter.closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import threading
+import time
+import unittest
+from allen import AllenClient, AllenResponseUnavailable, TransportPolicy
+from allen.mock_server import make_solution, make_test_records
+from test.fake_adapter import FakeAdapter, body_of
+from test.test_session import make_session
+
+RECORDINGS = [
+    {'ClassDate': '2021-06-01T00:00:00', 'listClass': [
+        {'UniqueCode': f'code-{i}', 'SubjectName': 'Physics'} for i in range(20)
+    ]},
+    {'ClassDate': '2021-06-02T00:00:00', 'listClass': [
+        {'UniqueCode': 'code-3', 'SubjectName': 'Physics'},
+        {'UniqueCode': 'broken', 'SubjectName': 'Maths'},
+    ]},
+]
+
+
+class BulkLinkTestCase(unittest.TestCase):
+    """
+    Offline tests for resolving many video links at once.
+    """
+
+    def setUp(self):
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+        def player(request):
+            with self.lock:
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+            time.sleep(0.02)
+            with self.lock:
+                self.active -= 1
+
+            code = body_of(request)['UniqueCode']
+            if code == 'broken':
+                return 500, {'data': None}
+            return {'ClassURL': f'https://videos.example.com/{code}'}
+
+        self.session, self.adapter = make_session({
+            '/api/dc/student/recordinglist': RECORDINGS,
+            '/api/dc/student/recordingplayer': player,
+        })
+        self.client = AllenClient(jwt='token', session=self.session, transport=TransportPolicy(max_retries=0))
+
+    def test_results_follow_input_order(self):
+        videos = self.client.get_recorded_videos()
+        results = self.client.resolve_links(videos, max_workers=4)
+
+        self.assertEqual([result.video for result in results], videos)
+        for result in results[:-1]:
+            self.assertTrue(result.ok)
+            self.assertEqual(result.link, f'https://videos.example.com/{result.video.unique_code}')
+
+    def test_errors_are_reported_per_item(self):
+        results = self.client.resolve_links(self.client.get_recorded_videos(), max_workers=4)
+
+        self.assertFalse(results[-1].ok)
+        self.assertIsNone(results[-1].link)
+        self.assertIsInstance(results[-1].error, AllenResponseUnavailable)
+
+    def test_duplicates_resolved_once_within_bound(self):
+        self.client.resolve_links(self.client.get_recorded_videos(), max_workers=4)
+
+        player_calls = self.adapter.paths().count('/api/dc/student/recordingplayer')
+        self.assertEqual(player_calls, 21)
+        self.assertLessEqual(self.peak, 4)
+
+
+class BulkSolutionTestCase(unittest.TestCase):
+    """
+    Offline tests for fetching the solutions of many tests at once.
+    """
+
+    def setUp(self):
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+        def solution(request):
+            with self.lock:
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+            time.sleep(0.02)
+            with self.lock:
+                self.active -= 1
+
+            body = body_of(request)
+            if body['TestID'] == '1002' and body['PaperNo'] == 2:
+                return 500, {'data': None}
+            return make_solution(body['TestID'], body['PaperNo'], questions=2)
+
+        self.session, self.adapter = make_session({
+            '/api/studenttestrecord': make_test_records(4),
+            '/api/GetTestSolution': solution,
+        })
+        self.client = AllenClient(jwt='token', session=self.session, transport=TransportPolicy(max_retries=0))
+
+    def test_every_paper_of_every_test_is_fetched_once(self):
+        records = self.client.get_test_records()
+        solutions = self.client.get_solutions_for(records + records[:2], papers=(1, 2), max_workers=3)
+
+        self.assertEqual(list(solutions), [record._test_id for record in records])
+        self.assertEqual(self.adapter.paths().count('/api/GetTestSolution'), 8)
+        self.assertLessEqual(self.peak, 3)
+
+        first = solutions[records[0]._test_id]
+        self.assertEqual(list(first), [1, 2])
+        self.assertIs(first[1].test_record, records[0])
+        self.assertEqual(first[2].solutions, records[0].get_subject_solutions(2))
+        self.assertTrue(first[2].solutions[0].solutions[0].image.endswith('/1000/2/physics-1.png'))
+
+        failed = solutions['1002'][2]
+        self.assertFalse(failed.ok)
+        self.assertIsNone(failed.solutions)
+        self.assertIsInstance(failed.error, AllenResponseUnavailable)
+        self.assertTrue(solutions['1002'][1].ok)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+from allen import AllenClient, ResponseCache
+from test.test_session import make_session
+
+CALENDAR = [{'MarkingScheme': 'JEE MAIN. PATTERN', 'Syllabus': 'Full', 'TestCentre': 'Kota', 'TestDay': 'Sunday',
+             'TestName': 'TEST-01', 'TimeDetail': '09:00AM', 'TestDate': '2021-06-06T00:00:00'}]
+
+
+class ResponseCacheTestCase(unittest.TestCase):
+    """
+    Offline tests for the TTL response cache.
+    """
+
+    def setUp(self):
+        self.now = 0.0
+        self.cache = ResponseCache(ttls={'studentexamcalendar': 60}, max_entries=2, clock=lambda: self.now)
+        self.session, self.adapter = make_session({
+            '/api/studentexamcalendar': CALENDAR,
+            '/api/dc/student/livelist': [],
+        })
+        self.client = AllenClient(jwt='token', session=self.session, cache=self.cache)
+
+    def calls(self, path: str) -> int:
+        return self.adapter.paths().count(path)
+
+    def test_repeated_calls_hit_cache_until_expiry(self):
+        first = self.client.get_exam_calendar()
+        second = self.client.get_exam_calendar()
+        self.assertEqual(first, second)
+        self.assertEqual(self.calls('/api/studentexamcalendar'), 1)
+
+        self.now = 61
+        self.client.get_exam_calendar()
+        self.assertEqual(self.calls('/api/studentexamcalendar'), 2)
+
+    def test_endpoints_without_ttl_are_not_cached(self):
+        self.client.get_live_classes()
+        self.client.get_live_classes()
+        self.assertEqual(self.calls('/api/dc/student/livelist'), 2)
+
+    def test_bypass_and_invalidate(self):
+        self.client.get_exam_calendar()
+        self.client.fetch_json('studentexamcalendar', use_cache=False)
+        self.assertEqual(self.calls('/api/studentexamcalendar'), 2)
+
+        self.client.invalidate_cache('studentexamcalendar')
+        self.client.get_exam_calendar()
+        self.assertEqual(self.calls('/api/studentexamcalendar'), 3)
+
+    def test_accounts_and_bodies_are_kept_apart(self):
+        other = AllenClient(jwt='other', session=self.session, cache=self.cache)
+        self.client.get_exam_calendar()
+        other.get_exam_calendar()
+        self.assertEqual(self.calls('/api/studentexamcalendar'), 2)
+
+        self.client.fetch_json('studentexamcalendar', post_data={'Year': 2021})
+        self.assertEqual(self.calls('/api/studentexamcalendar'), 3)
+
+    def test_servers_and_schemes_are_kept_apart(self):
+        mock = AllenClient(jwt='token', session=self.session, cache=self.cache, base_url='https://mock.example')
+        self.client.get_exam_calendar()
+        mock.get_exam_calendar()
+        self.assertEqual(self.calls('/api/studentexamcalendar'), 2)
+
+        self.client.fetch_json('studentexamcalendar', secure=False)
+        self.assertEqual(self.calls('/api/studentexamcalendar'), 3)
+        self.assertTrue(self.adapter.requests[-1].url.startswith('http://'))
+
+    def test_least_recently_used_is_evicted(self):
+        self.cache.set('a', 1, 60)
+        self.cache.set('b', 2, 60)
+        self.cache.get('a')
+        self.cache.set('c', 3, 60)
+
+        self.assertEqual(len(self.cache), 2)
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(self.cache.get('a'), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
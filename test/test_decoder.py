@@ -0,0 +1,57 @@
+import importlib.util
+import unittest
+from allen import AllenClient, AllenInvalidResponse, get_decoder, set_decoder
+from allen.decoder import loads
+from test.test_session import make_session
+
+DOCUMENT = b'{"data": [{"TestName": "TEST-01 \\u20b9", "Per": 60.25, "Rank": 12, "Bio": null}], "error": "False"}'
+
+
+class DecoderTestCase(unittest.TestCase):
+    """
+    Tests for the pluggable JSON decoder.
+    """
+
+    def tearDown(self):
+        set_decoder()
+
+    def test_fastest_installed_backend_is_picked(self):
+        set_decoder()
+        installed = [name for name in ('orjson', 'ujson', 'simdjson') if importlib.util.find_spec(name) is not None]
+        expected = installed[0] if installed else 'json'
+        self.assertEqual(get_decoder(), expected)
+
+    def test_backends_agree(self):
+        set_decoder('json')
+        expected = loads(DOCUMENT)
+
+        for name in ('orjson', 'ujson', 'simdjson'):
+            if importlib.util.find_spec(name) is None:
+                continue
+            set_decoder(name)
+            self.assertEqual(loads(DOCUMENT), expected, msg=name)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            set_decoder('yaml')
+
+    def test_custom_decoder_is_used_by_the_client(self):
+        decoded = []
+
+        def decoder(data: bytes):
+            decoded.append(data)
+            return {'data': []}
+
+        set_decoder(decoder)
+        session, _ = make_session({'/api/studentexamcalendar': []})
+        AllenClient(jwt='token', session=session).get_exam_calendar()
+        self.assertIsInstance(decoded[0], bytes)
+
+    def test_invalid_json_is_an_invalid_response(self):
+        session, _ = make_session({'/api/studentexamcalendar': (200, b'<html>')})
+        with self.assertRaises(AllenInvalidResponse):
+            AllenClient(jwt='token', session=session).get_exam_calendar()
+
+
+if __name__ == '__main__':
+    unittest.main()
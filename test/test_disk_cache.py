@@ -0,0 +1,110 @@
+import multiprocessing
+import pathlib
+import tempfile
+import threading
+import unittest
+from allen import AllenClient, DiskCache
+from test.test_session import make_session
+
+
+def fill(path: str, worker: int):
+    cache = DiskCache(path, max_entries=1000)
+    for i in range(50):
+        cache.set(['worker', worker, i], {'value': i})
+
+
+class DiskCacheTestCase(unittest.TestCase):
+    """
+    Offline tests for the persistent disk cache.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.directory.name) / 'cache.sqlite3'
+        self.now = 1000.0
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def make_cache(self, **kwargs) -> DiskCache:
+        return DiskCache(self.path, clock=lambda: self.now, **kwargs)
+
+    def test_links_survive_a_new_client(self):
+        recordings = [{'ClassDate': '2021-06-01T00:00:00', 'listClass': [{'UniqueCode': 'a', 'SubjectName': 'Maths'}]}]
+        session, adapter = make_session({
+            '/api/dc/student/recordinglist': recordings,
+            '/api/dc/student/recordingplayer': {'ClassURL': 'https://videos.example.com/a'},
+        })
+
+        for _ in range(2):
+            client = AllenClient(jwt='token', session=session, disk_cache=self.make_cache())
+            self.assertEqual(client.get_recorded_videos()[0].get_link(), 'https://videos.example.com/a')
+
+        self.assertEqual(adapter.paths().count('/api/dc/student/recordingplayer'), 1)
+        self.assertEqual(adapter.paths().count('/api/dc/student/recordinglist'), 2)
+
+    def test_servers_are_kept_apart(self):
+        session, adapter = make_session({
+            '/api/dc/student/recordingplayer': lambda request: {'ClassURL': request.url.split('/')[2]},
+        })
+        cache = self.make_cache()
+
+        for host in ('mock.example', 'prod.example'):
+            client = AllenClient(jwt='tok', session=session, disk_cache=cache, base_url=f'https://{host}')
+            self.assertEqual(client.fetch_json('dc/student/recordingplayer', post_data={'UniqueCode': 'a'},
+                                               persist=True)['ClassURL'], host)
+
+    def test_expiry(self):
+        cache = self.make_cache(ttl=10)
+        cache.set('key', [1, 2])
+        self.assertEqual(cache.get('key'), [1, 2])
+
+        self.now += 11
+        self.assertIsNone(cache.get('key'))
+
+    def test_least_recently_used_is_evicted(self):
+        cache = self.make_cache(max_entries=2)
+        cache.set('a', 1)
+        self.now += 1
+        cache.set('b', 2)
+        self.now += 1
+        cache.get('a')
+        self.now += 1
+        cache.set('c', 3)
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+
+    def test_connections_are_kept_per_thread(self):
+        cache = self.make_cache()
+        cache.set('a', 1)
+        [connection] = cache._connections
+        changes = connection.total_changes
+
+        # Reads neither open connections nor write to the database.
+        for _ in range(5):
+            self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache._connections, [connection])
+        self.assertEqual(connection.total_changes, changes)
+
+        thread = threading.Thread(target=cache.get, args=('a',))
+        thread.start()
+        thread.join()
+        self.assertEqual(len(cache._connections), 2)
+
+        cache.close()
+        self.assertEqual(cache._connections, [])
+        self.assertEqual(cache.get('a'), 1)
+
+    def test_concurrent_processes(self):
+        with multiprocessing.get_context('spawn').Pool(4) as pool:
+            pool.starmap(fill, [(str(self.path), worker) for worker in range(4)])
+
+        cache = DiskCache(self.path)
+        self.assertEqual(len(cache), 200)
+        self.assertEqual(cache.get(['worker', 3, 49]), {'value': 49})
+
+
+if __name__ == '__main__':
+    unittest.main()
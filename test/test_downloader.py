@@ -0,0 +1,142 @@
+import dataclasses
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from urllib.parse import urlsplit
+from allen import AllenClient, Solution, SolutionDownloader, SubjectSolution, TransportPolicy
+from allen.exceptions import AllenClientNotBound
+from allen.mock_server import MockAllenServer
+
+
+class DownloaderTestCase(unittest.TestCase):
+    """
+    Tests for downloading solution images against the local mock server.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = MockAllenServer()
+        cls.server.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = Path(self.temp_dir.name)
+        self.server.request_counts.clear()
+
+        self.client = AllenClient(jwt=self.server.issue_token(), base_url=self.server.base_url,
+                                  transport=TransportPolicy(max_retries=0))
+        self.records = self.client.get_test_records()[:2]
+
+    def tearDown(self):
+        self.client.close()
+        self.temp_dir.cleanup()
+
+    def image_requests(self) -> int:
+        return sum(count for path, count in self.server.request_counts.items() if path.startswith('/images/'))
+
+    def assertImagesMatch(self, results):
+        for result in results:
+            self.assertTrue(result.ok, msg=result.error)
+            self.assertEqual(result.path.read_bytes(), self.server.image(urlsplit(result.url).path))
+
+    def test_downloads_every_image_of_every_test(self):
+        results = SolutionDownloader(self.client, self.directory, max_workers=4).download(self.records)
+
+        self.assertEqual(len(results), 2 * 3 * 30)
+        self.assertImagesMatch(results)
+        self.assertEqual(results[0].path, self.directory / self.records[0]._test_id / 'Physics' / '1.png')
+        self.assertEqual(list(self.directory.rglob('*.part*')), [])
+
+    def test_present_files_are_skipped(self):
+        SolutionDownloader(self.client, self.directory).download_test(self.records[0])
+        requests = self.image_requests()
+
+        results = SolutionDownloader(self.client, self.directory).download_test(self.records[0])
+        self.assertTrue(all(result.skipped for result in results))
+        self.assertEqual(self.image_requests(), requests)
+
+        results = SolutionDownloader(self.client, self.directory, revalidate=True).download_test(self.records[0])
+        self.assertTrue(all(result.skipped for result in results))
+        self.assertEqual(self.image_requests(), requests + 90)
+
+    def test_interrupted_downloads_are_resumed(self):
+        downloader = SolutionDownloader(self.client, self.directory)
+        url, path = downloader.files_of(self.records[0]._test_id, self.records[0].get_subject_solutions())[0]
+        content = self.server.image(urlsplit(url).path)
+
+        path.parent.mkdir(parents=True)
+        path.with_name(path.name + '.part').write_bytes(content[:1000])
+        [result] = downloader.download_files([(url, path)])
+
+        self.assertTrue(result.resumed)
+        self.assertEqual(result.size, len(content) - 1000)
+        self.assertEqual(path.read_bytes(), content)
+
+        # A partial file of an image which changed since is downloaded again from the start.
+        path.unlink()
+        path.with_name(path.name + '.part').write_bytes(b'stale')
+        path.with_name(path.name + '.part.etag').write_text('"changed"')
+        [result] = downloader.download_files([(url, path)])
+        self.assertFalse(result.resumed)
+        self.assertEqual(path.read_bytes(), content)
+
+    def test_truncated_files_are_downloaded_again(self):
+        downloader = SolutionDownloader(self.client, self.directory)
+        downloader.download_test(self.records[0])
+        results = downloader.download_test(self.records[0])
+
+        results[0].path.write_bytes(b'truncated')
+        results = SolutionDownloader(self.client, self.directory).download_test(self.records[0])
+        self.assertFalse(results[0].skipped)
+        self.assertTrue(all(result.skipped for result in results[1:]))
+        self.assertImagesMatch(results)
+
+    def test_errors_are_reported_per_file(self):
+        downloader = SolutionDownloader(self.client, self.directory)
+        results = downloader.download_files([(self.server.base_url + '/missing.png', self.directory / 'missing.png')])
+        self.assertFalse(results[0].ok)
+        self.assertFalse((self.directory / 'missing.png').exists())
+
+    def test_tests_without_solutions_are_reported(self):
+        unbound = dataclasses.replace(self.records[0], _test_id='unbound')
+        results = SolutionDownloader(self.client, self.directory).download([unbound, self.records[1]])
+
+        self.assertEqual(len(results), 1 + 3 * 30)
+        self.assertFalse(results[0].ok)
+        self.assertIsInstance(results[0].error, AllenClientNotBound)
+        self.assertEqual((results[0].url, results[0].path), ('', self.directory / 'unbound'))
+        self.assertImagesMatch(results[1:])
+
+    def test_paths_stay_inside_the_directory(self):
+        downloader = SolutionDownloader(self.client, self.directory / 'images')
+        subjects = [SubjectSolution('../../x', 1, [Solution(1, 'A', 'https://img/1.png')]),
+                    SubjectSolution('..', 1, [Solution(2, 'A', 'https://img/../2.png')])]
+        files = downloader.files_of('../..', subjects + [SubjectSolution('a<b>:c"d|e?f*', 1, [Solution(3, 'A', 'x')])])
+
+        self.assertEqual([path.relative_to(self.directory / 'images').as_posix() for url, path in files],
+                         ['.._../.._.._x/1.png', '.._../__/2.png', '.._../a_b__c_d_e_f_/3.png'])
+
+        (self.directory / 'images').mkdir()
+        (self.directory / 'images' / '7').symlink_to(self.directory)
+        with self.assertRaises(ValueError):
+            downloader.files_of('7', subjects)
+
+    def test_downloaders_of_one_directory_keep_each_others_manifest(self):
+        first = SolutionDownloader(self.client, self.directory)
+        second = SolutionDownloader(self.client, self.directory)
+        first.download_test(self.records[0])
+        second.download_test(self.records[1])
+        first.download_test(self.records[0])
+
+        manifest = json.loads((self.directory / SolutionDownloader.MANIFEST).read_text())
+        self.assertEqual(len(manifest), 2 * 3 * 30)
+        self.assertEqual(list(self.directory.glob('*.tmp')), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
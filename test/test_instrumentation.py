@@ -0,0 +1,175 @@
+import json
+import unittest
+from allen import AllenClient, AllenResponseUnavailable, Metrics, ResponseCache, TransportPolicy
+from allen.instrumentation import Histogram, Instrumentation, OpenTelemetryInstrumentation, PrometheusInstrumentation
+from test.test_session import make_session
+
+try:
+    import prometheus_client
+except ImportError:
+    prometheus_client = None
+
+TESTS = {'testList': [{
+    'Bio': '-', 'Phy': '50', 'Chem': '60', 'Math': '70', 'Total': '180', 'Per': '60.0', 'Rank': '12',
+    'TestName': 'Test 1', 'TestDate': '2021-03-01T00:00:00', 'TestID': 'T1'
+}]}
+
+
+class Recorder(Instrumentation):
+    """
+    Records the hooks called, in order.
+    """
+
+    def __init__(self):
+        self.events = []
+
+    def request_started(self, trace):
+        self.events.append(('started', trace.endpoint))
+
+    def request_finished(self, trace):
+        self.events.append(('finished', trace.endpoint, trace.status, trace.attempts, type(trace.error).__name__))
+
+    def retried(self, trace, reason):
+        self.events.append(('retried', trace.endpoint, reason))
+
+    def cache_lookup(self, endpoint, layer, hit):
+        self.events.append(('cache', endpoint, layer, hit))
+
+
+class FakeInstrument:
+    def __init__(self, name: str, records: list):
+        self.name = name
+        self.records = records
+
+    def add(self, value, attributes):
+        self.records.append((self.name, value, attributes))
+
+    record = add
+
+
+class FakeMeter:
+    def __init__(self):
+        self.records = []
+
+    def create_histogram(self, name, **kwargs):
+        return FakeInstrument(name, self.records)
+
+    create_counter = create_histogram
+
+
+class InstrumentationTestCase(unittest.TestCase):
+    """
+    Tests for the hooks, timings and counters of instrumented clients.
+    """
+
+    def setUp(self):
+        self.statuses = []
+
+        def calendar(request):
+            if self.statuses:
+                return self.statuses.pop(0), {'data': None}
+            return []
+
+        self.session, self.adapter = make_session({
+            '/oauth2/astoken': {'StudentID': 10, 'UserID': 20, 'OTP': None, 'jwt': 'token'},
+            '/api/studentexamcalendar': calendar,
+            '/api/studenttestrecord': TESTS,
+        })
+
+    def make_client(self, instrumentation: Instrumentation, **kwargs) -> AllenClient:
+        client = AllenClient(username='1234', password='pass', session=self.session, instrumentation=instrumentation,
+                             transport=TransportPolicy(max_retries=1), **kwargs)
+        client.transport._sleep = lambda seconds: None
+        return client
+
+    def test_hooks(self):
+        recorder = Recorder()
+        client = self.make_client(recorder, cache=ResponseCache())
+        self.statuses = [503]
+        client.get_exam_calendar()
+        client.get_test_records()
+        client.get_test_records()
+        list(client.iter_test_records())
+
+        self.statuses = [500, 500]
+        with self.assertRaises(AllenResponseUnavailable):
+            client.fetch_json('studentexamcalendar', use_cache=False)
+
+        self.assertEqual(recorder.events, [
+            ('started', 'oauth2/astoken'),
+            ('finished', 'oauth2/astoken', 200, 1, 'NoneType'),
+            ('cache', 'studentexamcalendar', 'memory', False),
+            ('started', 'studentexamcalendar'),
+            ('retried', 'studentexamcalendar', '503'),
+            ('finished', 'studentexamcalendar', 200, 2, 'NoneType'),
+            ('cache', 'studenttestrecord', 'memory', False),
+            ('started', 'studenttestrecord'),
+            ('finished', 'studenttestrecord', 200, 1, 'NoneType'),
+            ('cache', 'studenttestrecord', 'memory', True),
+            ('started', 'studenttestrecord'),
+            ('finished', 'studenttestrecord', 200, 1, 'NoneType'),
+            ('started', 'studentexamcalendar'),
+            ('retried', 'studentexamcalendar', '500'),
+            ('finished', 'studentexamcalendar', 500, 2, 'AllenResponseUnavailable'),
+        ])
+
+    def test_metrics(self):
+        metrics = Metrics()
+        client = self.make_client(metrics)
+        client.get_test_records()
+        list(client.iter_test_records())
+
+        self.assertEqual(metrics.counter('studenttestrecord', 'requests'), 2)
+        self.assertEqual(metrics.counter('studenttestrecord', 'bytes'),
+                         2 * len(json.dumps({'data': TESTS, 'error': 'False'}).encode('utf-8')))
+        self.assertEqual(metrics.latencies[('studenttestrecord', 'total')].count, 2)
+        self.assertEqual(metrics.latencies[('studenttestrecord', 'decode')].count, 1)
+        self.assertEqual(metrics.latencies[('studenttestrecord', 'download')].count, 2)
+
+        summary = metrics.summary()
+        self.assertEqual(summary['oauth2/astoken']['requests'], 1)
+        self.assertIsNotNone(summary['studenttestrecord']['ttfb']['p99'])
+
+        metrics.reset()
+        self.assertEqual(metrics.summary(), {})
+
+    def test_uninstrumented_client(self):
+        client = AllenClient(jwt='token', session=self.session)
+        self.assertIsNone(client.instrumentation)
+        self.assertIsNone(client.transport.instrumentation)
+        client.get_test_records()
+
+    def test_histogram(self):
+        histogram = Histogram((0.1, 0.2, 0.4))
+        self.assertIsNone(histogram.quantile(0.5))
+        for value in (0.05, 0.15, 0.15, 0.3, 1.0):
+            histogram.observe(value)
+
+        self.assertEqual(histogram.counts, [1, 2, 1, 1])
+        self.assertEqual(histogram.count, 5)
+        self.assertAlmostEqual(histogram.quantile(0.5), 0.175)
+        self.assertEqual(histogram.quantile(1), 0.4)
+
+    def test_opentelemetry(self):
+        meter = FakeMeter()
+        client = self.make_client(OpenTelemetryInstrumentation(meter))
+        client.get_test_records()
+
+        names = [name for name, value, attributes in meter.records]
+        self.assertIn('allen.request.duration', names)
+        self.assertIn(('allen.requests', 1, {'endpoint': 'studenttestrecord', 'status': '200'}), meter.records)
+
+    @unittest.skipIf(prometheus_client is None, 'prometheus_client is not installed')
+    def test_prometheus(self):
+        registry = prometheus_client.CollectorRegistry()
+        client = self.make_client(PrometheusInstrumentation(registry))
+        client.get_test_records()
+
+        self.assertEqual(registry.get_sample_value('allen_requests_total',
+                                                   {'endpoint': 'studenttestrecord', 'status': '200'}), 1)
+        self.assertEqual(registry.get_sample_value('allen_request_duration_seconds_count',
+                                                   {'endpoint': 'studenttestrecord', 'phase': 'total'}), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import importlib
+import subprocess
+import sys
+import unittest
+import allen
+
+
+def modules_after(statement: str) -> set:
+    """
+    :return: The modules loaded by a fresh interpreter after running a statement.
+    """
+    code = f'import sys; {statement}; print("\\n".join(sys.modules))'
+    return set(subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True).stdout.split())
+
+
+class LazyImportTestCase(unittest.TestCase):
+    """
+    Tests for importing the submodules of the package on first use.
+    """
+
+    def test_exports_match_the_modules(self):
+        for module, names in allen._EXPORTS.items():
+            exported = getattr(importlib.import_module(module), '__all__', names)
+            self.assertEqual(set(names) - set(exported), set(), module)
+            if module != 'allen.decoder':
+                self.assertEqual(set(names), set(exported), module)
+
+        self.assertEqual(len(allen.__all__), len(set(allen.__all__)))
+
+    def test_names_resolve(self):
+        from allen.allenclient import AllenClient
+        self.assertIs(allen.AllenClient, AllenClient)
+        self.assertIn('SolutionTable', dir(allen))
+        with self.assertRaises(AttributeError):
+            allen.NotAName
+
+    def test_submodules_resolve(self):
+        code = 'import allen; print(allen.video.RecordedVideo.__module__, allen.mock_server.__name__)'
+        output = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True).stdout
+        self.assertEqual(output.split(), ['allen.video', 'allen.mock_server'])
+        with self.assertRaises(AttributeError):
+            allen.not_a_module
+
+    def test_import_does_not_load_the_client(self):
+        for statement in ('import allen', 'import allen.command_line'):
+            modules = modules_after(statement)
+            self.assertNotIn('requests', modules, statement)
+            self.assertNotIn('allen.allenclient', modules, statement)
+
+        self.assertIn('requests', modules_after('from allen import AllenClient'))
+
+
+if __name__ == '__main__':
+    unittest.main()
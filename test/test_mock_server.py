@@ -0,0 +1,76 @@
+import unittest
+from allen import AllenClient, AllenInvalidUsernamePassword, TransportPolicy
+from allen.mock_server import MockAllenServer
+
+
+class MockServerTestCase(unittest.TestCase):
+    """
+    End to end tests of the client against the local mock server.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = MockAllenServer()
+        cls.server.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.server.require_otp = False
+        self.server.error_rate = 0
+        self.server.throttle_rate = 0
+
+    def make_client(self, **kwargs) -> AllenClient:
+        return AllenClient(username='1234', password='password', base_url=self.server.base_url, **kwargs)
+
+    def test_every_listing(self):
+        with self.make_client() as client:
+            videos = client.get_recorded_videos()
+            self.assertEqual(len(videos), 120)
+            self.assertEqual(list(client.iter_recorded_videos()), videos)
+            self.assertTrue(videos[0].get_link().startswith('https://videos.example.com/recording/'))
+
+            self.assertEqual(len(client.get_live_classes()), 3)
+            self.assertEqual(len(client.get_exam_calendar()), 5)
+
+            records = client.get_test_records()
+            self.assertEqual(records[0].biology, -1)
+            solutions = records[0].get_subject_solutions()
+            self.assertEqual([subject.subject_name for subject in solutions], ['Physics', 'Chemistry', 'Maths'])
+
+            addon_video = client.get_addon_classes()[0].chapters[0].videos[0]
+            self.assertTrue(addon_video.get_link().startswith('https://videos.example.com/addon/'))
+
+    def test_login_with_otp(self):
+        self.server.require_otp = True
+        with self.make_client() as client:
+            self.assertEqual(len(client.get_exam_calendar()), 5)
+
+    def test_invalid_credentials(self):
+        self.server.accounts = {'1234': 'password'}
+        try:
+            self.make_client().close()
+            with self.assertRaises(AllenInvalidUsernamePassword):
+                AllenClient(username='1234', password='wrong', base_url=self.server.base_url)
+        finally:
+            self.server.accounts = None
+
+    def test_revoked_token_logs_in_again(self):
+        with self.make_client() as client:
+            logins = self.server.logins
+            self.server.revoke_tokens()
+            client.get_exam_calendar()
+            self.assertEqual(self.server.logins, logins + 1)
+
+    def test_injected_errors_are_retried(self):
+        self.server.error_rate = 0.3
+        policy = TransportPolicy(max_retries=10, backoff_factor=0.001)
+        with self.make_client(transport=policy) as client:
+            for _ in range(10):
+                client.get_exam_calendar()
+
+
+if __name__ == '__main__':
+    unittest.main()
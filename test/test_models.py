@@ -0,0 +1,105 @@
+import dataclasses
+import pickle
+import unittest
+from datetime import datetime
+from unittest import mock
+from allen import AddonChapter, AddonVideo, Examination, LiveClass, LiveClassDay, RecordedVideo, Solution, \
+    SubjectSolution
+from allen.mock_server import generate_fixtures, make_solution
+from allen.model import parse_date
+from allen.test_record import TestRecord as Record
+
+MODELS = [
+    RecordedVideo('b', 'Physics', '2021-06-01T00:00:00'),
+    LiveClassDay('Monday', '2021-06-01T00:00:00', [LiveClass('10:00AM', '11:00AM', 'a', 'Physics', 60)]),
+    SubjectSolution('Physics', 1, [Solution(1, 'A', 'https://img/1.png')]),
+    AddonChapter('Kinematics', [AddonVideo('a', '1')]),
+    Record(-1, 50, 60, 70, 180, 60.0, 12, 'TEST-01', '2021-06-01T00:00:00', '99'),
+    Examination('JEE MAIN. PATTERN', 'Full', 'Kota', 'Sunday', 'TEST-01', '09:00AM', '2021-06-06T00:00:00'),
+]
+
+
+class ModelsTestCase(unittest.TestCase):
+    """
+    Tests for the slot based data models.
+    """
+
+    def test_models_have_no_instance_dict(self):
+        for model in MODELS:
+            self.assertFalse(hasattr(model, '__dict__'), msg=type(model).__name__)
+            with self.assertRaises(dataclasses.FrozenInstanceError):
+                setattr(model, dataclasses.fields(model)[0].name, None)
+
+    def test_models_survive_pickling(self):
+        for model in MODELS:
+            self.assertEqual(pickle.loads(pickle.dumps(model)), model)
+
+    def test_field_order_equality_and_ordering(self):
+        self.assertEqual([field.name for field in dataclasses.fields(RecordedVideo)],
+                         ['unique_code', 'subject_name', '_date'])
+        self.assertEqual(RecordedVideo('a', 'Physics', 'x'), RecordedVideo('a', 'Physics', 'x'))
+        self.assertLess(RecordedVideo('a', 'Physics', 'x'), MODELS[0])
+
+    def test_dates_are_parsed_once(self):
+        dated = [(MODELS[0], 'date', 'get_recording_date'), (MODELS[1], 'date', 'get_live_class_date'),
+                 (MODELS[4], 'test_date', 'get_test_date'), (MODELS[5], 'test_date', 'get_test_date')]
+        models = [pickle.loads(pickle.dumps(model)) for model, _, _ in dated]
+        parse_date.cache_clear()
+
+        with mock.patch('allen.model.datetime') as parser:
+            parser.fromisoformat.side_effect = datetime.fromisoformat
+            for model, (_, attribute, getter) in zip(models, dated):
+                parsed = getattr(model, attribute)
+                self.assertIsInstance(parsed, datetime)
+                self.assertIs(getattr(model, attribute), parsed)
+                self.assertEqual(getattr(model, getter)(), parsed.strftime('%A : %d %B %Y'))
+                self.assertEqual(getattr(model, getter)(), getattr(model, getter)())
+
+        self.assertEqual(parser.fromisoformat.call_count, 2)
+        self.assertEqual(models[0], MODELS[0])
+        self.assertEqual(pickle.loads(pickle.dumps(models[0])).date, models[0].date)
+
+    def test_invalid_dates(self):
+        for date in ('not a date', None):
+            video = RecordedVideo('a', 'Physics', date)
+            self.assertIsNone(video.date)
+            self.assertIsNone(video.get_recording_date())
+
+        videos = [RecordedVideo(str(i), 'Physics', f'2021-06-0{9 - i}T00:00:00') for i in range(5)]
+        self.assertEqual([video.unique_code for video in sorted(videos, key=lambda video: video.date)],
+                         ['4', '3', '2', '1', '0'])
+
+    def test_from_json_many_matches_from_json(self):
+        client = object()
+        fixtures = generate_fixtures(recording_days=2, tests=4)
+
+        day = fixtures['dc/student/recordinglist'][0]
+        videos = RecordedVideo.from_json_many(day['listClass'], day['ClassDate'], client)
+        self.assertEqual(videos, [RecordedVideo.from_json(video, day['ClassDate'], client)
+                                  for video in day['listClass']])
+        self.assertTrue(all(video.client is client for video in videos))
+
+        tests = fixtures['studenttestrecord']['testList']
+        self.assertEqual(Record.from_json_many(tests, client), [Record.from_json(test, client) for test in tests])
+
+        live = fixtures['dc/student/livelist']
+        self.assertEqual(LiveClassDay.from_json_many(live), [LiveClassDay.from_json(day) for day in live])
+
+        subjects = make_solution('1000')['listPaper'][0]['listSubject']
+        self.assertEqual(SubjectSolution.from_json_many(subjects),
+                         [SubjectSolution.from_json(subject) for subject in subjects])
+
+    def test_optional_marks(self):
+        test = generate_fixtures(tests=1)['studenttestrecord']['testList'][0]
+
+        record = Record.from_json(dict(test, Bio='-', Math=' 7 '), None)
+        self.assertEqual((record.biology, record.maths), (-1, 7))
+        self.assertEqual(Record.from_json(dict(test, Bio='x'), None).biology, -1)
+        with self.assertRaises(TypeError):
+            Record.from_json(dict(test, Math=None), None)
+        with self.assertRaises(ValueError):
+            Record.from_json(dict(test, Phy='-'), None)
+
+
+if __name__ == '__main__':
+    unittest.main()
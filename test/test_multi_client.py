@@ -0,0 +1,80 @@
+import pickle
+import random
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from allen import AllenClient
+from test.fake_adapter import body_of
+from test.test_session import make_session
+
+RECORDINGS = [{'ClassDate': '2021-06-01T00:00:00', 'listClass': [
+    {'UniqueCode': f'code-{i}', 'SubjectName': 'Physics'} for i in range(25)
+]}]
+ADDONS = [{'SubjectName': 'Physics', 'listChapter': [
+    {'ChapterName': 'Kinematics', 'listClass': [{'UniqueCode': f'addon-{i}', 'ModuleNo': '1'} for i in range(5)]}
+]}]
+RECORDS = {'testList': [{
+    'Bio': '-', 'Phy': '50', 'Chem': '60', 'Math': '70', 'Total': '180', 'Per': '60.0', 'Rank': '12',
+    'TestName': 'TEST-01', 'TestDate': '2021-06-01T00:00:00', 'TestID': '99'
+}]}
+
+
+def player(request):
+    account = request.headers['Authorization'][len('Bearer '):]
+    return {'ClassURL': f'https://videos.example.com/{account}/{body_of(request)["UniqueCode"]}'}
+
+
+def solution(request):
+    account = request.headers['Authorization'][len('Bearer '):]
+    return {'listPaper': [{'listSubject': [{'SubjectName': account, 'QTo': 0, 'listQuestion': []}]}]}
+
+
+class MultiClientTestCase(unittest.TestCase):
+    """
+    Offline tests for running several accounts in one process.
+    """
+
+    def setUp(self):
+        self.session, self.adapter = make_session({
+            '/api/dc/student/recordinglist': RECORDINGS,
+            '/api/dc/student/recordingplayer': player,
+            '/api/discussion/student/list': ADDONS,
+            '/api/discussion/student/player': player,
+            '/api/studenttestrecord': RECORDS,
+            '/api/GetTestSolution': solution,
+        })
+        self.clients = [AllenClient(jwt=f'account-{i}', session=self.session) for i in range(8)]
+
+    def test_links_resolve_under_their_own_account(self):
+        jobs = []
+        for client in self.clients:
+            jobs += [(client, video) for video in client.get_recorded_videos()]
+            jobs += [(client, video) for addon in client.get_addon_classes()
+                     for chapter in addon.chapters for video in chapter.videos]
+        random.Random(0).shuffle(jobs)
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            links = list(executor.map(lambda job: job[1].get_link(), jobs))
+
+        for (client, video), link in zip(jobs, links):
+            self.assertIs(video.client, client)
+            self.assertEqual(link, f'https://videos.example.com/{client._jwt}/{video.unique_code}')
+
+    def test_solutions_resolve_under_their_own_account(self):
+        records = [(client, client.get_test_records()[0]) for client in self.clients]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            solutions = list(executor.map(lambda job: job[1].get_subject_solutions(), records))
+
+        for (client, _), subjects in zip(records, solutions):
+            self.assertEqual(subjects[0].subject_name, client._jwt.title())
+
+    def test_pickled_models_drop_the_client(self):
+        video = self.clients[0].get_recorded_videos()[0]
+        restored = pickle.loads(pickle.dumps(video))
+
+        self.assertEqual(restored, video)
+        self.assertIsNone(restored.client)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import importlib.util
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from allen import ProcessPipeline, RecordedVideo, TEST_RECORD_ROW
+from allen.test_record import TestRecord as Record
+from allen.mock_server import generate_fixtures, make_solution, make_test_records
+
+FIXTURES = generate_fixtures(recording_days=9, tests=7)
+
+
+class ProcessPipelineTestCase(unittest.TestCase):
+    """
+    Tests for post-processing large result sets on a process pool.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pipeline = ProcessPipeline(max_workers=2, chunk_size=3)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pipeline.close()
+
+    def test_recorded_video_rows_match_models(self):
+        days = FIXTURES['dc/student/recordinglist']
+        videos = [video for day in days for video in RecordedVideo.from_json_many(day['listClass'], day['ClassDate'],
+                                                                                     None)]
+
+        self.assertEqual(self.pipeline.recorded_video_rows(days),
+                         [(video.unique_code, video.subject_name, video._date, video.get_recording_date())
+                          for video in videos])
+
+    def test_test_record_rows_match_models(self):
+        tests = make_test_records(7)['testList']
+        rows = self.pipeline.test_record_rows(tests)
+
+        for row, test in zip(rows, tests):
+            record = Record.from_json(test, None)
+            values = dict(zip(TEST_RECORD_ROW, row))
+            self.assertEqual(values['formatted_test_date'], record.get_test_date())
+            self.assertEqual(Record(*row[:-1]), record)
+        self.assertEqual(len(rows), len(tests))
+
+    def test_format_dates(self):
+        dates = ['2021-06-01T00:00:00', None, 'not a date', '2021-06-01T00:00:00'] * 2
+        self.assertEqual(self.pipeline.format_dates(dates),
+                         ['Tuesday : 01 June 2021', None, None, 'Tuesday : 01 June 2021'] * 2)
+        self.assertEqual(self.pipeline.format_dates([]), [])
+
+    @unittest.skipIf(importlib.util.find_spec('numpy') is None, 'numpy is not installed')
+    def test_solution_table_matches_a_single_table(self):
+        from allen.analytics import SolutionTable
+
+        solutions = {f'T{i}': make_solution(f'T{i}', questions=5)['listPaper'][0]['listSubject'] for i in range(8)}
+        table = self.pipeline.solution_table(solutions)
+        expected = SolutionTable.from_json(solutions)
+
+        self.assertEqual(table.test_ids, expected.test_ids)
+        self.assertEqual(table.response_histogram(), expected.response_histogram())
+        self.assertEqual(table.attempts_by_test().tolist(), expected.attempts_by_test().tolist())
+
+    def test_small_inputs_and_borrowed_executors(self):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            with ProcessPipeline(chunk_size=2, executor=executor) as pipeline:
+                self.assertEqual(pipeline.format_dates(['2021-06-01'] * 5), ['Tuesday : 01 June 2021'] * 5)
+            self.assertEqual(executor.submit(lambda: 1).result(), 1)
+
+        pipeline = ProcessPipeline(chunk_size=100)
+        pipeline.format_dates(['2021-06-01'])
+        self.assertIsNone(pipeline._executor)
+
+    def test_chunks_are_submitted_as_they_are_encoded(self):
+        read = []
+        read_when_processed = []
+
+        def items():
+            for i in range(40):
+                read.append(i)
+                yield i
+
+        def process(data: bytes) -> list:
+            read_when_processed.append(len(read))
+            return [len(data)]
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pipeline = ProcessPipeline(max_workers=2, chunk_size=2, executor=executor)
+            results = pipeline.map(process, items())
+
+        self.assertEqual(len(results), 20)
+        # Chunks are processed before the input is read whole, and at most 4 chunks are read ahead.
+        self.assertLess(read_when_processed[0], 40)
+        self.assertTrue(all(count <= 2 * (index + 1 + 4) for index, count in enumerate(read_when_processed)))
+
+
+if __name__ == '__main__':
+    unittest.main()
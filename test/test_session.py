@@ -0,0 +1,51 @@
+import unittest
+import requests
+from allen import AllenClient
+from test.fake_adapter import FakeAdapter
+
+
+def make_session(routes: dict) -> (requests.Session, FakeAdapter):
+    session = requests.Session()
+    adapter = FakeAdapter(routes)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session, adapter
+
+
+class SessionTestCase(unittest.TestCase):
+    """
+    Offline tests for the HTTP session owned or borrowed by the AllenClient.
+    """
+
+    def test_login_and_fetch_share_session(self):
+        session, adapter = make_session({
+            '/oauth2/astoken': {'StudentID': 10, 'UserID': 20, 'OTP': None, 'jwt': 'token'},
+            '/api/studentexamcalendar': [],
+        })
+        client = AllenClient(username='1234', password='pass', session=session)
+        client.get_exam_calendar()
+
+        self.assertEqual(adapter.paths(), ['/oauth2/astoken', '/api/studentexamcalendar'])
+        self.assertEqual(adapter.requests[1].headers['Authorization'], 'Bearer token')
+
+    def test_borrowed_session_is_not_closed(self):
+        session, adapter = make_session({})
+        with AllenClient(jwt='token', session=session) as client:
+            self.assertIs(client.session, session)
+        self.assertFalse(adapter.closed)
+
+    def test_owned_session_is_pooled_and_closed(self):
+        client = AllenClient(jwt='token', pool_connections=2, pool_maxsize=32, keep_alive=False)
+        adapter = client.session.get_adapter('https://ddcapi.allenbpms.in')
+        self.assertEqual(adapter._pool_maxsize, 32)
+        self.assertEqual(client.pool_maxsize, 32)
+        self.assertEqual(client.session.headers['Connection'], 'close')
+
+        closed = []
+        adapter.close = lambda: closed.append(True)
+        client.close()
+        self.assertTrue(closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from allen import AllenClient, AllenResponseUnavailable, AsyncAllenClient, TransportPolicy
+from allen.singleflight import AsyncSingleFlight, SingleFlight
+from test.fake_adapter import FakeAdapter, FakeAsyncSession
+from test.test_session import make_session
+
+ADDONS = [{'SubjectName': 'Physics', 'listChapter': [
+    {'ChapterName': 'Kinematics', 'listClass': [{'UniqueCode': 'a', 'ModuleNo': '1'}]}
+]}]
+
+
+class SingleFlightTestCase(unittest.TestCase):
+    """
+    Tests for coalescing identical requests in flight.
+    """
+
+    def setUp(self):
+        self.release = threading.Event()
+
+        def slow(payload):
+            def route(request):
+                self.release.wait(5)
+                return payload
+            return route
+
+        self.session, self.adapter = make_session({
+            '/api/discussion/student/list': slow(ADDONS),
+            '/api/studentexamcalendar': slow((500, {'data': None})),
+            '/api/host': lambda request: slow({'host': urlsplit(request.url).hostname})(request),
+        })
+        self.client = AllenClient(jwt='token', session=self.session, transport=TransportPolicy(max_retries=0))
+
+    def calls(self, path: str) -> int:
+        return self.adapter.paths().count(path)
+
+    def run_concurrently(self, func, callers: int = 8) -> list:
+        with ThreadPoolExecutor(max_workers=callers) as executor:
+            futures = [executor.submit(func) for _ in range(callers)]
+            while self.client._single_flight.in_flight() == 0:
+                time.sleep(0.001)
+            time.sleep(0.05)
+            self.release.set()
+            return [future.exception() or future.result() for future in futures]
+
+    def test_concurrent_calls_share_one_request(self):
+        results = self.run_concurrently(self.client.get_addon_classes)
+
+        self.assertEqual(self.calls('/api/discussion/student/list'), 1)
+        self.assertTrue(all(result == results[0] for result in results))
+        self.assertEqual(results[0][0].chapters[0].videos[0].unique_code, 'a')
+
+        self.client.get_addon_classes()
+        self.assertEqual(self.calls('/api/discussion/student/list'), 2)
+
+    def test_concurrent_calls_share_the_exception(self):
+        results = self.run_concurrently(self.client.get_exam_calendar)
+
+        self.assertEqual(self.calls('/api/studentexamcalendar'), 1)
+        self.assertTrue(all(isinstance(result, AllenResponseUnavailable) for result in results))
+        self.assertEqual(self.client._single_flight.in_flight(), 0)
+
+    def test_different_requests_are_not_shared(self):
+        self.release.set()
+        flight = SingleFlight()
+        self.assertEqual(flight.do('a', lambda: 1), 1)
+        self.assertEqual(flight.do('b', lambda: 2), 2)
+
+        other = AllenClient(jwt='other', session=self.session)
+        self.client.get_addon_classes()
+        other.get_addon_classes()
+        self.client.fetch_json('discussion/student/list', post_data={'Page': 2})
+        self.assertEqual(self.calls('/api/discussion/student/list'), 3)
+
+    def test_clients_of_different_servers_are_not_shared(self):
+        flight = SingleFlight()
+        clients = [AllenClient(jwt='token', session=self.session, base_url=f'https://{host}.example.com',
+                               single_flight=flight) for host in ('mock', 'production')]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [executor.submit(clients[index % 2].fetch_json, 'host') for index in range(8)]
+            while flight.in_flight() < 2 and not any(future.done() for future in futures):
+                time.sleep(0.001)
+            self.release.set()
+            results = [future.result() for future in futures]
+
+        self.assertEqual([result['host'] for result in results], ['mock.example.com', 'production.example.com'] * 4)
+
+
+class AsyncSingleFlightTestCase(unittest.TestCase):
+    """
+    Tests for coalescing identical coroutines in flight.
+    """
+
+    def test_concurrent_calls_share_one_request(self):
+        adapter = FakeAdapter({
+            '/oauth2/astoken': {'StudentID': 10, 'UserID': 20, 'OTP': None, 'jwt': 'token'},
+            '/api/discussion/student/list': ADDONS,
+        })
+
+        async def fetch():
+            async with AsyncAllenClient(username='1234', password='pass', session=FakeAsyncSession(adapter)) as client:
+                return await asyncio.gather(*[client.get_addon_classes() for _ in range(8)])
+
+        results = asyncio.run(fetch())
+        self.assertEqual(adapter.paths().count('/api/discussion/student/list'), 1)
+        self.assertTrue(all(result == results[0] for result in results))
+
+    def test_cancelling_a_caller_does_not_cancel_the_call(self):
+        flight = AsyncSingleFlight()
+        runs = []
+
+        async def work():
+            runs.append(1)
+            await asyncio.sleep(0.02)
+            return 'done'
+
+        async def run():
+            first = asyncio.ensure_future(flight.do('key', work))
+            second = asyncio.ensure_future(flight.do('key', work))
+            await asyncio.sleep(0)
+            first.cancel()
+            result = await second
+            await asyncio.sleep(0)
+            return first.cancelled(), result, flight.in_flight()
+
+        self.assertEqual(asyncio.run(run()), (True, 'done', 0))
+        self.assertEqual(runs, [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
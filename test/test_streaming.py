@@ -0,0 +1,73 @@
+import json
+import unittest
+from allen import AllenClient, AllenInvalidResponse
+from allen.streaming import iter_json_items, JSONPathNotFound
+from test.test_bulk import RECORDINGS
+from test.test_session import make_session
+
+DOCUMENT = {
+    'error': 'False',
+    'data': {
+        'note': 'a "quoted" [string], with {brackets}',
+        'testList': [
+            {'TestName': 'TEST-01 [PAPER 1]', 'Nested': {'testList': [9]}, 'Bio': 'é€'},
+            3,
+            'text, with comma',
+            [1, [2]],
+            None
+        ],
+        'after': [1, 2]
+    }
+}
+
+
+def split_bytes(data: bytes, size: int) -> list:
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class StreamingTestCase(unittest.TestCase):
+    """
+    Offline tests for incrementally parsing JSON arrays.
+    """
+
+    def test_items_match_full_parse_for_any_chunking(self):
+        data = json.dumps(DOCUMENT, ensure_ascii=False).encode('utf-8')
+        for size in (1, 2, 3, 7, 64, len(data)):
+            items = list(iter_json_items(split_bytes(data, size), ('data', 'testList')))
+            self.assertEqual(items, DOCUMENT['data']['testList'], msg=f'chunk size {size}')
+
+    def test_items_are_yielded_before_the_document_ends(self):
+        chunks = iter([b'{"data": [{"a": 1}, ', b'{"a": 2}'])
+        items = iter_json_items(chunks, ('data',))
+        self.assertEqual(next(items), {'a': 1})
+        self.assertEqual(next(chunks), b'{"a": 2}')
+
+    def test_empty_and_missing_arrays(self):
+        self.assertEqual(list(iter_json_items([b'{"data": [ ]}'], ('data',))), [])
+        with self.assertRaises(JSONPathNotFound):
+            list(iter_json_items([b'{"data": null}'], ('data',)))
+        with self.assertRaises(ValueError):
+            list(iter_json_items([b'{"data": [{"a": 1}, {"a"'], ('data',)))
+        with self.assertRaises(ValueError):
+            list(iter_json_items([b'{"data": [{"a": 1}, '], ('data',)))
+
+    def test_client_iterators(self):
+        records = {'testList': [{
+            'Bio': '-', 'Phy': '50', 'Chem': '60', 'Math': '70', 'Total': '180', 'Per': '60.0', 'Rank': '12',
+            'TestName': 'TEST-01', 'TestDate': '2021-06-01T00:00:00', 'TestID': '99'
+        }]}
+        session, adapter = make_session({
+            '/api/dc/student/recordinglist': RECORDINGS,
+            '/api/studenttestrecord': records,
+            '/api/dc/student/livelist': (200, {'data': None}),
+        })
+        client = AllenClient(jwt='token', session=session)
+
+        self.assertEqual(list(client.iter_recorded_videos()), client.get_recorded_videos())
+        self.assertEqual(list(client.iter_test_records()), client.get_test_records())
+        with self.assertRaises(AllenInvalidResponse):
+            list(client.iter_json('dc/student/livelist', ()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from allen import AllenClient, SyncEngine, SyncStore, TransportPolicy
+from allen.mock_server import make_recordings, make_solution, make_test_records
+from test.fake_adapter import body_of
+from test.test_session import make_session
+
+
+class SyncTestCase(unittest.TestCase):
+    """
+    Offline tests for the incremental sync of recordings and tests.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = SyncStore(Path(self.temp_dir.name) / 'sync.json')
+
+        self.recordings = make_recordings(3, per_day=2)
+        self.tests = make_test_records(3)['testList']
+        self.broken = set()
+
+        def player(request):
+            code = body_of(request)['UniqueCode']
+            if code in self.broken:
+                return 500, {'data': None}
+            return {'ClassURL': f'https://videos.example.com/{code}'}
+
+        def solution(request):
+            test_id = str(body_of(request)['TestID'])
+            if test_id in self.broken:
+                return 500, {'data': None}
+            return make_solution(test_id, questions=2)
+
+        self.session, self.adapter = make_session({
+            '/api/dc/student/recordinglist': lambda request: self.recordings,
+            '/api/studenttestrecord': lambda request: {'testList': self.tests},
+            '/api/dc/student/recordingplayer': player,
+            '/api/GetTestSolution': solution,
+        })
+        self.client = AllenClient(jwt='token', session=self.session, transport=TransportPolicy(max_retries=0))
+        self.engine = SyncEngine(self.client, self.store, resolve_links=True, fetch_solutions=True)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def calls(self, path: str) -> int:
+        return self.adapter.paths().count(path)
+
+    def test_first_sync_reports_everything(self):
+        result = self.engine.sync()
+
+        self.assertEqual(result.new_videos, self.client.get_recorded_videos())
+        self.assertTrue(all(link.ok for link in result.links))
+        self.assertEqual(result.new_tests, self.client.get_test_records())
+        self.assertEqual(sorted(result.solutions), sorted(test['TestID'] for test in self.tests))
+        self.assertEqual(result.changed_tests, [])
+
+        self.assertTrue(self.engine.sync().empty)
+        self.assertEqual(self.calls('/api/dc/student/recordingplayer'), 6)
+        self.assertEqual(self.calls('/api/GetTestSolution'), 3)
+
+    def test_only_new_and_changed_items_are_reported(self):
+        self.engine.sync()
+
+        self.recordings[-1]['listClass'].append({'UniqueCode': 'late', 'SubjectName': 'Maths'})
+        self.recordings.append({'ClassDate': '2021-05-01T00:00:00', 'listClass': [
+            {'UniqueCode': 'next', 'SubjectName': 'Physics'}]})
+        self.tests.append(make_test_records(4)['testList'][3])
+        self.tests[0] = dict(self.tests[0], Rank='1')
+
+        result = self.engine.sync()
+        self.assertEqual([video.unique_code for video in result.new_videos], ['late', 'next'])
+        self.assertEqual([link.link for link in result.links],
+                         ['https://videos.example.com/late', 'https://videos.example.com/next'])
+        self.assertEqual([test._test_id for test in result.new_tests], [self.tests[3]['TestID']])
+        self.assertEqual([(test._test_id, test.rank) for test in result.changed_tests], [(self.tests[0]['TestID'], 1)])
+        self.assertEqual(list(result.solutions), [self.tests[3]['TestID']])
+
+        self.assertEqual(self.calls('/api/dc/student/recordingplayer'), 8)
+        self.assertEqual(self.calls('/api/GetTestSolution'), 4)
+
+    def test_older_days_are_skipped(self):
+        self.engine.sync()
+
+        # A video added to a day before the latest synced day is not looked at again.
+        self.recordings[0]['listClass'].append({'UniqueCode': 'old', 'SubjectName': 'Maths'})
+        self.assertEqual(self.engine.sync().new_videos, [])
+
+        state = self.store.load(self.client.identity)
+        self.assertEqual(state['last_class_date'], self.recordings[-1]['ClassDate'])
+        self.assertEqual(state['videos'], sorted(video['UniqueCode'] for video in self.recordings[-1]['listClass']))
+
+    def test_failures_are_retried_by_the_next_sync(self):
+        failed_video = self.recordings[0]['listClass'][0]['UniqueCode']
+        failed_test = self.tests[1]['TestID']
+        self.broken.update({failed_video, failed_test})
+
+        result = self.engine.sync()
+        self.assertEqual([link.video.unique_code for link in result.links if not link.ok], [failed_video])
+        self.assertNotIn(failed_test, result.solutions)
+
+        self.broken.clear()
+        result = self.engine.sync()
+        self.assertEqual([video.unique_code for video in result.new_videos], [failed_video])
+        self.assertEqual([test._test_id for test in result.new_tests], [failed_test])
+        self.assertEqual(list(result.solutions), [failed_test])
+        self.assertTrue(self.engine.sync().empty)
+
+    def test_state_is_kept_per_account_and_can_be_reset(self):
+        self.engine.sync()
+        other = SyncEngine(AllenClient(jwt='other', session=self.session), self.store)
+        self.assertEqual(len(other.sync().new_tests), 3)
+
+        self.engine.reset()
+        self.assertEqual(len(self.engine.sync().new_tests), 3)
+        self.assertTrue(other.sync().empty)
+
+        self.store.clear()
+        self.assertEqual(self.store.load(self.client.identity), {})
+
+    def test_engines_on_the_same_file_keep_each_others_state(self):
+        engines = [SyncEngine(AllenClient(jwt=f'account-{index}', session=self.session), SyncStore(self.store.path))
+                   for index in range(6)]
+        threads = [threading.Thread(target=engine.sync) for engine in engines]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertTrue(all(engine.sync().empty for engine in engines))
+        self.assertEqual(list(self.store.path.parent.glob('*.tmp')), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
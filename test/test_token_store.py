@@ -0,0 +1,116 @@
+import base64
+import json
+import pathlib
+import tempfile
+import threading
+import time
+import unittest
+from allen import AllenClient, TokenStore
+from allen.exceptions import AllenInvalidUsernamePassword
+from test.fake_adapter import body_of
+from test.test_session import make_session
+
+
+def make_jwt(name: str, exp: float) -> str:
+    payload = base64.urlsafe_b64encode(json.dumps({'sub': name, 'exp': exp}).encode()).decode().rstrip('=')
+    return f'header.{payload}.signature'
+
+
+class TokenStoreTestCase(unittest.TestCase):
+    """
+    Offline tests for reusing logins between runs.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = TokenStore(pathlib.Path(self.directory.name) / 'session.json')
+        self.issued = []
+
+        def login(request):
+            if body_of(request)['Password'] != 'pass':
+                return {'StudentID': 0, 'UserID': 0, 'OTP': None}
+            jwt = make_jwt(f'login-{len(self.issued)}', time.time() + 3600)
+            self.issued.append((jwt, body_of(request)['Devicetoken']))
+            return {'StudentID': 10, 'UserID': 20, 'OTP': None, 'jwt': jwt}
+
+        def calendar(request):
+            if request.headers['Authorization'] == f'Bearer {self.rejected}':
+                return 401, {'data': None}
+            return []
+
+        self.rejected = None
+        self.session, self.adapter = make_session({
+            '/oauth2/astoken': login,
+            '/api/studentexamcalendar': calendar,
+        })
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def make_client(self, password: str = 'pass') -> AllenClient:
+        return AllenClient(username='1234', password=password, session=self.session, token_store=self.store)
+
+    def test_token_is_reused_between_clients(self):
+        self.make_client()
+        self.make_client().get_exam_calendar()
+
+        self.assertEqual(len(self.issued), 1)
+        self.assertEqual(self.store.load('1234').jwt, self.issued[0][0])
+
+    def test_password_is_not_stored(self):
+        self.make_client()
+
+        self.assertNotIn('pass"', self.store.path.read_text())
+        self.assertTrue(self.store.load('1234').matches('pass'))
+        self.assertFalse(self.store.load('1234').matches('wrong'))
+
+    def test_wrong_password_is_rejected_with_stored_token(self):
+        self.make_client()
+
+        with self.assertRaises(AllenInvalidUsernamePassword):
+            self.make_client(password='wrong')
+        self.assertEqual(self.adapter.paths().count('/oauth2/astoken'), 2)
+        self.assertEqual(self.store.load('1234').jwt, self.issued[0][0])
+
+    def test_token_without_password_hash_is_not_reused(self):
+        self.store.save('1234', make_jwt('old', time.time() + 3600), 555)
+        self.make_client()
+
+        self.assertEqual(len(self.issued), 1)
+        self.assertEqual(self.issued[0][1], 555)
+
+    def test_concurrent_stores_keep_every_account(self):
+        stores = [TokenStore(self.store.path) for _ in range(8)]
+
+        def save(index: int):
+            for round_no in range(20):
+                stores[index].save(f'user-{index}', f'jwt-{round_no}', index)
+
+        threads = [threading.Thread(target=save, args=(index,)) for index in range(len(stores))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([self.store.load(f'user-{index}').jwt for index in range(len(stores))], ['jwt-19'] * 8)
+        self.assertEqual(list(self.store.path.parent.glob('*.tmp')), [])
+
+    def test_expired_token_keeps_device_id(self):
+        self.store.save('1234', make_jwt('old', time.time() - 10), 555)
+        self.make_client()
+
+        self.assertEqual(len(self.issued), 1)
+        self.assertEqual(self.issued[0][1], 555)
+
+    def test_rejected_token_logs_in_again(self):
+        client = self.make_client()
+        self.rejected = self.issued[0][0]
+        client.get_exam_calendar()
+
+        self.assertEqual(len(self.issued), 2)
+        self.assertEqual(self.store.load('1234').jwt, self.issued[1][0])
+        self.assertEqual(self.adapter.paths().count('/api/studentexamcalendar'), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import requests
+from allen import AllenClient, AllenConnectionError, AllenResponseUnavailable, TokenBucket, TransportPolicy
+from test.test_session import make_session
+
+
+class TransportTestCase(unittest.TestCase):
+    """
+    Offline tests for the timeouts, retries and rate limit of the transport.
+    """
+
+    def setUp(self):
+        self.statuses = []
+        self.sleeps = []
+
+        def calendar(request):
+            if self.statuses:
+                status, headers = self.statuses.pop(0)
+                if isinstance(status, Exception):
+                    raise status
+                return status, {'data': None}, headers
+            return []
+
+        self.session, self.adapter = make_session({'/api/studentexamcalendar': calendar})
+
+    def make_client(self, **policy) -> AllenClient:
+        client = AllenClient(jwt='token', session=self.session, transport=TransportPolicy(**policy))
+        client.transport._sleep = self.sleeps.append
+        return client
+
+    def test_retries_with_retry_after(self):
+        self.statuses = [(503, {}), (429, {'Retry-After': '7'})]
+        self.make_client(max_retries=2, backoff_factor=1).get_exam_calendar()
+
+        self.assertEqual(len(self.adapter.requests), 3)
+        self.assertLessEqual(self.sleeps[0], 1)
+        self.assertEqual(self.sleeps[1], 7)
+
+    def test_gives_up_after_max_retries(self):
+        self.statuses = [(503, {})] * 3
+        with self.assertRaises(AllenResponseUnavailable):
+            self.make_client(max_retries=1).get_exam_calendar()
+        self.assertEqual(len(self.adapter.requests), 2)
+
+    def test_non_retryable_status_fails_fast(self):
+        self.statuses = [(404, {})]
+        with self.assertRaises(AllenResponseUnavailable):
+            self.make_client(max_retries=5).get_exam_calendar()
+        self.assertEqual(self.sleeps, [])
+
+    def test_connection_errors_are_retried_and_wrapped(self):
+        self.statuses = [(requests.ConnectTimeout('timed out'), {})] * 2
+        with self.assertRaises(AllenConnectionError):
+            self.make_client(max_retries=1).get_exam_calendar()
+
+        self.statuses = [(requests.ConnectionError('reset'), {})]
+        self.make_client(max_retries=1).get_exam_calendar()
+
+    def test_timeouts_are_sent(self):
+        sent = []
+        original = self.adapter.send
+        self.adapter.send = lambda request, **kwargs: sent.append(kwargs['timeout']) or original(request, **kwargs)
+
+        self.make_client(connect_timeout=2, read_timeout=9).get_exam_calendar()
+        self.assertEqual(sent, [(2, 9)])
+
+    def test_token_bucket(self):
+        now = [0.0]
+        waits = []
+        bucket = TokenBucket(rate=2, capacity=2, clock=lambda: now[0], sleep=waits.append)
+
+        self.assertEqual([bucket.acquire() for _ in range(4)], [0, 0, 0.5, 1.0])
+        now[0] = 10
+        self.assertEqual(bucket.acquire(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()